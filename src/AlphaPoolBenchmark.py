@@ -0,0 +1,47 @@
+import sys
+import time
+import multiprocessing
+
+if __name__ == '__main__':
+
+    # usage: python AlphaPoolBenchmark.py [facts [processes ...]]
+    # assert a big batch of facts with the alpha network
+    # evaluated sequentially and in pools of processes.
+    # Without args, 20000 facts and 1..cpu_count processes are used
+
+    nFacts = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    processesList = [int(arg) for arg in sys.argv[2:]] \
+                        or range(1, multiprocessing.cpu_count() + 1)
+
+    import myclips
+    import myclips.parser.Types as types
+    from myclips.facts.TemplateFact import TemplateFact
+
+    rules = ["(deftemplate item (slot kind) (slot color) (slot size) (multislot tags))"]
+    for i in xrange(50):
+        rules.append("(defrule kind-%d (item (kind k%d) (color red|blue) (size ?s) (tags t%d $?)) =>)"%(i, i, i % 7))
+        rules.append("(defrule size-%d (item (kind ~k%d) (size %d) (tags ? ?)) =>)"%(i, i, i))
+
+    colors = [types.Symbol(color) for color in ["red", "blue", "green"]]
+    facts = [TemplateFact("item", {"kind": types.Symbol("k%d"%(i % 60)),
+                                   "color": colors[i % 3],
+                                   "size": types.Integer(i % 50),
+                                   "tags": [types.Symbol("t%d"%(i % 7)), types.Symbol("t%d"%(i % 11))]},
+                          "MAIN")
+                for i in xrange(nFacts)]
+
+    print "%d facts, %d rules"%(nFacts, len(rules) - 1)
+
+    for processes in processesList:
+
+        network = myclips.Network()
+        network.settings.setSetting("network.alpha.processes", processes)
+        for construct in network.getParser().parse("\n".join(rules)):
+            if isinstance(construct, types.DefRuleConstruct):
+                network.addRule(construct)
+
+        start_time = time.time()
+        network.assertFacts(facts)
+        print "  %2d processes: %f seconds, %d activations"%(processes,
+                                                            time.time() - start_time,
+                                                            len(network.agenda.activations()))
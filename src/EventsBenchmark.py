@@ -0,0 +1,30 @@
+import sys
+import os
+import time
+
+if __name__ == '__main__':
+    
+    # usage: python EventsBenchmark.py [file.clp ...]
+    # load the files and run them with and without (watch all)
+    
+    nFiles = sys.argv[1:] or ["../benchmark/miss-manners/manners.clp", 
+                              "../benchmark/miss-manners/manners16.clp"]
+    
+    import myclips
+    from myclips.shell.Interpreter import Interpreter
+    
+    devnull = open(os.devnull, 'w')
+    
+    for watch in [False, True]:
+        
+        network = myclips.Network(resources={"stdout": devnull})
+        interpreter = Interpreter(network, None)
+        for nFile in nFiles:
+            interpreter.evaluate('(load "%s")'%nFile)
+        if watch:
+            interpreter.evaluate('(watch all)')
+        interpreter.evaluate('(reset)')
+        
+        start_time = time.time()
+        network.run()
+        print "%-12s %f seconds"%("watch all" if watch else "no watch", time.time() - start_time)
@@ -0,0 +1,55 @@
+import sys
+import os
+import time
+
+if __name__ == '__main__':
+
+    # usage: python ModifyBenchmark.py [file.clp ...]
+    # load the files and run them with retract+assert modify
+    # and slot-specific modify. Without args, miss-manners
+    # and sudoku (both are modify-heavy) are used
+
+    scenarios = [sys.argv[1:]] if len(sys.argv) > 1 else [
+                    ["../benchmark/miss-manners/manners.clp",
+                     "../benchmark/miss-manners/manners16.clp"],
+                    ["../benchmark/sudoku/sudoku.clp",
+                     "../benchmark/sudoku/solve.clp",
+                     "../benchmark/sudoku/output-none.clp",
+                     "../benchmark/sudoku/puzzles/grid3x3-p1.clp"]
+                ]
+
+    import myclips
+    from myclips.shell.Interpreter import Interpreter
+    from myclips.EventsManager import EventsManager
+    from myclips.Observer import Observer
+    from myclips.Settings import Settings
+
+    class FiredCounter(Observer):
+        def __init__(self):
+            self.fired = 0
+        def notify(self, eventName, *args, **kargs):
+            self.fired += 1
+
+    devnull = open(os.devnull, 'w')
+
+    for nFiles in scenarios:
+
+        print os.path.basename(nFiles[-1])
+
+        for slotSpecific in [False, True]:
+
+            settings = Settings()
+            settings.setSetting("network.modify.slotSpecific", slotSpecific)
+            network = myclips.Network(resources={"stdout": devnull}, settings=settings)
+            interpreter = Interpreter(network, None)
+            for nFile in nFiles:
+                interpreter.evaluate('(load "%s")'%nFile)
+            interpreter.evaluate('(reset)')
+
+            counter = FiredCounter()
+            network.eventsManager.registerObserver(EventsManager.E_RULE_FIRED, counter)
+
+            start_time = time.time()
+            network.run()
+            print "  %-15s %f seconds, %d rules fired"%("slot-specific" if slotSpecific else "retract+assert",
+                                                      time.time() - start_time, counter.fired)
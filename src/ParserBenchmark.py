@@ -1,19 +1,31 @@
 import sys
+import os
 import time
 
 if __name__ == '__main__':
-    
+
     nFile = sys.argv[1]
-    
-    filer = open("../../icse-ie/tests/"+nFile, 'rU')
-    
+
+    if not os.path.exists(nFile):
+        nFile = "../../icse-ie/tests/"+nFile
+
+    filer = open(nFile, 'rU')
+
     s = filer.read()
-    
+
     import myclips
-    
-    network = myclips.Network()
-    parser = network.getParser()
-    
-    start_time = time.time()
-    parser.parse(s, True)
-    print time.time() - start_time, " seconds"
+    from myclips.Settings import Settings
+
+    for backend in ["pyparsing", "fast"]:
+
+        # a new network for each backend: parsing
+        # changes modules/templates definitions
+        settings = Settings()
+        settings.setSetting("parser.backend", backend)
+        network = myclips.Network(settings=settings)
+        parser = network.getParser()
+
+        start_time = time.time()
+        parsed = parser.parse(s, True)
+        elapsed = time.time() - start_time
+        print "%-10s %f seconds, %d constructs, %.1f constructs/sec"%(backend, elapsed, len(parsed), len(parsed) / elapsed)
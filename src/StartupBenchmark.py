@@ -0,0 +1,44 @@
+import sys
+import os
+import time
+import subprocess
+
+if __name__ == '__main__':
+
+    # usage: python StartupBenchmark.py [runs]
+    # start a new interpreter process (network + shell interpreter
+    # + a first command) many times, with system functions
+    # loaded on first use (manifest cache) and all
+    # loaded at startup
+
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+
+    startup = """
+import sys
+import time
+start_time = time.time()
+import myclips
+from myclips.functions import SystemFunctionBroker
+SystemFunctionBroker.useManifestCache = %s
+from myclips.shell.Interpreter import Interpreter
+interpreter = Interpreter(myclips.Network(), None)
+interpreter.evaluate("(+ 1 2)")
+print time.time() - start_time, len([m for m in sys.modules if m.startswith("myclips.functions.")])
+"""
+
+    cwd = os.path.dirname(os.path.abspath(__file__))
+
+    for useManifestCache in [True, False]:
+
+        inProcess = []
+        total = []
+        for _ in xrange(runs):
+            start_time = time.time()
+            output = subprocess.check_output([sys.executable, "-c", startup%useManifestCache], cwd=cwd)
+            total.append(time.time() - start_time)
+            inProcess.append(float(output.split()[0]))
+            modules = int(output.split()[1])
+
+        print "%-15s best %f seconds (%f in myclips), avg %f seconds, %d functions modules"%(
+                        "lazy" if useManifestCache else "eager",
+                        min(total), min(inProcess), sum(total) / runs, modules)
@@ -6,6 +6,8 @@ Created on 24/lug/2012
 from myclips.EventsManager import EventsManager
 import myclips.strategies as strategies
 from myclips.MyClipsException import MyClipsException
+import collections
+import heapq
 
 class Agenda(object):
     '''
@@ -15,13 +17,15 @@ class Agenda(object):
     and manage the focusStack
     '''
 
-    def __init__(self, network):
+    def __init__(self, network, strategy=None):
         '''
         Create a new instance of agenda linked to
         a network instance
         
         @param network: a Network instance for this agenda
         @type network: L{Network}
+        @param strategy: the strategy instance to use (default strategy if None)
+        @type strategy: L{Strategy}
         '''
         self._network = network
         '''the network instance linked to this agenda'''
@@ -38,12 +42,16 @@ class Agenda(object):
         Keep sets of fired activation
         using a per-complete-rule-name based index
         '''
-        self._strategy = strategies.factory.newInstance()
+        self._strategy = strategy if strategy is not None else strategies.factory.newInstance()
         '''Instance of the current strategy used'''
         self._ignored_activations = {}
         '''manage fired but still available activations'''
         self._focusStack = []
         '''the focusStack'''
+        self._deferred = None
+        '''activations waiting for the end of a batch (if any)'''
+        self._batchLevel = 0
+        '''nested batches counter'''
         try:
             self._focusStack.append(network.modulesManager.currentScope.moduleName)
         except:
@@ -68,9 +76,15 @@ class Agenda(object):
         '''
         from myclips.rete.nodes.PNode import PNode
         assert isinstance(pnode, PNode)
+        
+        # while a batch is running, activations
+        # are stored and inserted when the batch ends
+        if self._deferred is not None:
+            self._deferred[(pnode.completeRuleName(), token.factIds)] = (pnode, token)
+            return
 
         # check if the same activation was already fired in the past
-        if self._isInFired(pnode.completeRuleName(), token.hashString):
+        if self._isInFired(pnode.completeRuleName(), token.factIds):
             # store the activation in a structure to allow
             # the refresh method to re-add ignored activation on the need
             #    NB: double dict is necessary to avoid duplications
@@ -82,7 +96,7 @@ class Agenda(object):
                 ruleDict = {}
                 self._ignored_activations[pnode.completeRuleName()] = ruleDict
                 
-            ruleDict[token.hashString] = (pnode, token)
+            ruleDict[token.factIds] = (pnode, token)
             return
 
         salience = pnode.getSalience()
@@ -93,7 +107,7 @@ class Agenda(object):
             # not previous rules of this module
             # got an activation, so the dict have to be
             # created
-            per_module_activations = {}
+            per_module_activations = SaliencesQueue()
             self._activations[pnode.moduleName] = per_module_activations
 
         try:
@@ -112,7 +126,8 @@ class Agenda(object):
         #        its own container)
         self._strategy.insert(same_salience_queue, pnode, token)
         
-        self._network.eventsManager.fire(EventsManager.E_RULE_ACTIVATED, pnode.completeMainRuleName(), pnode.completeRuleName(), token.linearize(False))
+        if self._network.eventsManager.isObserved(EventsManager.E_RULE_ACTIVATED):
+            self._network.eventsManager.fire(EventsManager.E_RULE_ACTIVATED, pnode.completeMainRuleName(), pnode.completeRuleName(), token.linearize(False))
     
     def getActivation(self):
         '''
@@ -143,7 +158,7 @@ class Agenda(object):
             # notify no more activations left for this module
             raise AgendaNoMoreActivationError()
         
-        max_salience = max(module_activations.keys())
+        max_salience = module_activations.maxSalience()
         pnode, token = self._strategy.pop(module_activations[max_salience])
         # check if more activations are available with the same salience
         if len(module_activations[max_salience]) == 0:
@@ -180,11 +195,11 @@ class Agenda(object):
             self._fired_activations[completeRuleName] = fired_per_rule
             
         # archive the activation
-        # using the token.hashString
+        # using the token.factIds
         # NB:
-        #    token's hashString is a token conversion
-        #    to an unique string of the token's wme list
-        fired_per_rule.add(token.hashString)
+        #    token's factIds is a token conversion
+        #    to an unique tuple of the token's wme list
+        fired_per_rule.add(token.factIds)
         
         # add the activation in the ignored_activation:
         # until a retract remove this activation
@@ -196,7 +211,7 @@ class Agenda(object):
             ruleDict = {}
             self._ignored_activations[pnode.completeRuleName()] = ruleDict
             
-        ruleDict[token.hashString] = (pnode, token)
+        ruleDict[token.factIds] = (pnode, token)
         
         # then return the activation        
         return (pnode, token)
@@ -238,6 +253,15 @@ class Agenda(object):
         @type token: L{Token]
         '''
         
+        # if the activation is waiting for the batch end,
+        # it was never insered: just forget it
+        if self._deferred is not None:
+            try:
+                del self._deferred[(pnode.completeRuleName(), token.factIds)]
+                return
+            except KeyError:
+                pass
+        
         salience = pnode.getSalience()
         
         ########################################################
@@ -259,7 +283,8 @@ class Agenda(object):
                 del self._activations[pnode.moduleName]
                 
             # the event is fired only for deactivation of activables!
-            self._network.eventsManager.fire(EventsManager.E_RULE_DEACTIVATED, pnode.completeMainRuleName(), pnode.completeRuleName(), token.linearize(False))
+            if self._network.eventsManager.isObserved(EventsManager.E_RULE_DEACTIVATED):
+                self._network.eventsManager.fire(EventsManager.E_RULE_DEACTIVATED, pnode.completeMainRuleName(), pnode.completeRuleName(), token.linearize(False))
                 
         except (KeyError, ValueError):
             # no per-module activations
@@ -272,20 +297,63 @@ class Agenda(object):
         #######################################################
         
         try:
-            del self._ignored_activations[pnode.completeRuleName()][token.hashString]
+            del self._ignored_activations[pnode.completeRuleName()][token.factIds]
         except KeyError:
-            # no token.hashString in per-rule-ignored
+            # no token.factIds in per-rule-ignored
             # or no per-rule-ignored in ignored
             pass
 
-        try:        
+        try:
             if len(self._ignored_activations[pnode.completeRuleName()]) == 0:
                 del self._ignored_activations[pnode.completeRuleName()]
         except:
             # no per-rule-ignored
             pass
+
+        ###########################################
+        # Remove the activation from the history  #
+        ###########################################
+
+        # the match is gone: if the same fact-ids
+        # will match again (fact-ids are reused by
+        # slot-specific modify), it's a new activation.
+        # Without slot-specific modify, fact-ids are never
+        # reused and refraction is kept as is
+        if self._network.settings.getSetting("network.modify.slotSpecific", False):
+            try:
+                self._fired_activations[pnode.completeRuleName()].discard(token.factIds)
+            except KeyError:
+                # no fired activations for the rule
+                pass
         
         
+    def beginBatch(self):
+        '''
+        Start a batch of network changes: until
+        the batch ends, new activations are not insered
+        in the agenda (and activations insered and removed
+        inside the batch are discarded at all).
+        Batches can be nested
+        '''
+        self._batchLevel += 1
+        if self._deferred is None:
+            self._deferred = collections.OrderedDict()
+            
+    def endBatch(self):
+        '''
+        End a batch of network changes and insert
+        all deferred activations (in the same
+        order they were produced)
+        '''
+        self._batchLevel -= 1
+        if self._batchLevel <= 0:
+            self._batchLevel = 0
+            deferred = self._deferred
+            self._deferred = None
+            if deferred is not None:
+                for (pnode, token) in deferred.itervalues():
+                    self.insert(pnode, token)
+        
     def clear(self):
         '''
         Completly reset agenda status
@@ -350,7 +418,7 @@ class Agenda(object):
         @return: the old strategy id
         @rtype: string
         '''
-        if self._strategy != strategy:
+        if self._strategy.getName() != strategy.getName():
             self._network.eventsManager.fire(EventsManager.E_STRATEGY_CHANGED, self._strategy.getName(), strategy.getName())
             oldStrategy = self._strategy
             self._strategy = strategy
@@ -391,22 +459,61 @@ class Agenda(object):
         except:
             return []
     
-    def _isInFired(self, completeRuleName, tokenHashString):
+    def _isInFired(self, completeRuleName, tokenFactIds):
         '''
         Check if an activation has already been fired 
         @param completeRuleName: the rule name
         @type completeRuleName: string
-        @param tokenHashString: the token hash string
-        @type tokenHashString: string
+        @param tokenFactIds: the token fact-ids tuple
+        @type tokenFactIds: tuple
         @rtype: boolean
         '''
         try:
-            return (tokenHashString in self._fired_activations[completeRuleName])
+            return (tokenFactIds in self._fired_activations[completeRuleName])
         except KeyError:
             # on KeyError caught, no previous
             # activation for this completeRuleName was fired
             return False
     
+class SaliencesQueue(dict):
+    '''
+    Per-module activations container: a dict
+    salience => strategy's container, which keeps
+    saliences in a heap too, so the max salience
+    is found without a scan of all saliences.
+    Removed saliences are discarded from the heap
+    only when they reach the top
+    '''
+    
+    def __init__(self):
+        dict.__init__(self)
+        self._saliences = []
+        '''heap of negated saliences'''
+        self._inHeap = set()
+        
+    def __setitem__(self, salience, container):
+        dict.__setitem__(self, salience, container)
+        if salience not in self._inHeap:
+            self._inHeap.add(salience)
+            heapq.heappush(self._saliences, -salience)
+
+    def __reduce__(self):
+        # the heap is rebuilt while items are restored
+        return (SaliencesQueue, (), None, None, self.iteritems())
+
+    def maxSalience(self):
+        '''
+        Get the max salience with activations
+        @rtype: int
+        '''
+        while True:
+            salience = -self._saliences[0]
+            if dict.__contains__(self, salience):
+                return salience
+            # removed salience, discard it
+            heapq.heappop(self._saliences)
+            self._inHeap.discard(salience)
+    
 class AgendaNoMoreActivationError(MyClipsException):
     '''
     Exception raised when no more activations left
@@ -137,6 +137,32 @@ Per-group manifest: `{4}`
                              )
     
     print "//:~ ", time.asctime()
+    
+    generateCache()
+        
+def generateCache():
+    '''
+    Generate the manifest cache: a map function name => (module, class)
+    for all classes in the manifest. With a valid cache,
+    myclips.functions.SystemFunctionBroker imports function
+    modules only when a function is used
+    '''
+    
+    FUNCS_DIR = myclips.functions.FUNCTIONS_DIR
+    
+    functions = {}
+    for (theModule, theClass) in myclips.functions.SystemFunctionBroker.manifestClasses():
+        try:
+            theClassObject = getattr(importlib.import_module(theModule), theClass)
+        except (ImportError, AttributeError):
+            # if error ignore this class
+            continue
+        else:
+            functions[theClassObject.DEFINITION.name] = [theModule, theClass]
+    
+    fr = open(FUNCS_DIR + "/" + myclips.functions.FUNCTIONS_MANIFEST_CACHE, "w")
+    json.dump({"functions": functions}, fr, indent=4, sort_keys=True)
+    fr.close()
         
 
 if __name__ == '__main__':
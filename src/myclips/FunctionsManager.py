@@ -184,6 +184,14 @@ class FunctionDefinition(RestrictedDefinition):
         '''
         return self._returnTypes
     
+    @property
+    def constraints(self):
+        '''
+        Get the list of constraints for function calls
+        @rtype: list
+        '''
+        return self._constraints
+    
     @property
     def isForward(self):
         '''
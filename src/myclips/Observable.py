@@ -5,6 +5,7 @@ Created on 19/lug/2012
 '''
 from myclips.Observer import Observer
 import myclips
+import logging
 
 class Observable(object):
     '''
@@ -24,6 +25,8 @@ class Observable(object):
         '''store the events'''
         self._observers = dict([(event, []) for event in self._events])
         '''store the observer, using event-name as index'''
+        self._observed = set()
+        '''events with at least one observer'''
         
     def registerObserver(self, eventName, observer):
         '''
@@ -39,6 +42,8 @@ class Observable(object):
             except KeyError:
                 # no observer for the event yet
                 self._observers[eventName] = [observer]
+                
+            self._updateObserved()
 
             myclips.logger.debug("Registering new observer %s\n\tfor event %s.%s",
                                         repr(observer),
@@ -73,6 +78,8 @@ class Observable(object):
                 # the listner is not registered
                 # it's like i've unregistered it 
                 pass
+            
+        self._updateObserved()
 
     @property
     def events(self):
@@ -101,6 +108,22 @@ class Observable(object):
                 eventObs.remove(observer)
             except ValueError:
                 pass
+            
+        self._updateObserved()
+        
+    def isObserved(self, eventName):
+        '''
+        Check if at least one observer is registered
+        for an event. Use it to skip the event args
+        building when nobody is listening
+        @param eventName: the event name
+        @type eventName: string
+        @rtype: boolean
+        '''
+        return eventName in self._observed
+    
+    def _updateObserved(self):
+        self._observed = set([event for (event, observers) in self._observers.items() if len(observers) > 0])
     
     def fire(self, event, *args, **kargs):
         '''
@@ -116,11 +139,12 @@ class Observable(object):
                                             repr(self))
         else:
             if len(observers) > 0:
-                myclips.logger.debug("Firing %s.%s \n\twith %s \n\tto %s observer(s)",
-                                           repr(self),
-                                           repr(event),
-                                           repr(args),
-                                           str(len(observers)))
+                if myclips.logger.isEnabledFor(logging.DEBUG):
+                    myclips.logger.debug("Firing %s.%s \n\twith %s \n\tto %s observer(s)",
+                                               repr(self),
+                                               repr(event),
+                                               repr(args),
+                                               str(len(observers)))
                 for observer in observers:
                     observer.notify(event, *args, **kargs)
             
@@ -9,7 +9,13 @@ class Fact(object):
     '''
     Base class for all facts:
         store info about modules
+        
+    Facts are stored in the working memory by hash:
+    the hash is computed on first request and cached,
+    so a fact must not be changed after the assert
     '''
+    
+    __slots__ = ('_moduleName', '_values', '_hash')
 
 
     def __init__(self, moduleName="MAIN"):
@@ -17,6 +23,7 @@ class Fact(object):
         Constructor
         '''
         self._moduleName = moduleName
+        self._hash = None
         
     @property
     def moduleName(self):
@@ -34,6 +41,19 @@ class Fact(object):
         @type value: string
         '''
         self._moduleName = value
+        self._hash = None
+        
+    def __hash__(self):
+        '''
+        Get the cached hash of the fact
+        (computed by _computeHash on first request)
+        '''
+        if self._hash is None:
+            self._hash = self._computeHash()
+        return self._hash
+    
+    def _computeHash(self):
+        raise NotImplementedError()
 
 
 class FactInvalidIndex(MyClipsException):
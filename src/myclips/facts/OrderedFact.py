@@ -11,6 +11,8 @@ class OrderedFact(Fact):
     are store as a list (array to be more precise) and can be accessed
     using vector-like methods (access by index)
     '''
+    
+    __slots__ = ()
 
 
     def __init__(self, values=None, moduleName="MAIN"):
@@ -35,11 +37,11 @@ class OrderedFact(Fact):
         '''
         return "%s::(%s)"%(self._moduleName, " ".join([str(x) for x in self._values]))
     
-    def __hash__(self):
+    def _computeHash(self):
         '''
         Give a static, numeric hash for this object using moduleName and values as seed
         '''
-        return hash(tuple([self.moduleName] + self._values))
+        return hash((self._moduleName, tuple(self._values)))
         
     def __eq__(self, other):
         '''
@@ -47,9 +49,12 @@ class OrderedFact(Fact):
             OrderedFact are equals if they have same moduleName
             and values
         '''
+        if self is other:
+            return True
         if isinstance(other, OrderedFact) \
-            and self.moduleName == other.moduleName \
-            and self.values == other.values:
+            and self.__hash__() == other.__hash__() \
+            and self._moduleName == other._moduleName \
+            and self._values == other._values:
             return True;
         else:
             return False;
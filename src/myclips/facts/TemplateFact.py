@@ -8,9 +8,12 @@ from myclips.facts.Fact import Fact, FactInvalidSlotName,\
 
 class TemplateFact(Fact):
     '''
-    classdocs
+    Rappresents a fact in template representation. Fact's values
+    are stored as a dict slot name -> value and can be accessed
+    using dict-like methods (access by slot name)
     '''
-
+    
+    __slots__ = ('_templateName',)
 
     def __init__(self, templateName, values=None , moduleName="MAIN"):
         
@@ -35,6 +38,7 @@ class TemplateFact(Fact):
         @type value: string
         '''
         self._templateName = value
+        self._hash = None
         
     @property
     def values(self):
@@ -75,6 +79,7 @@ class TemplateFact(Fact):
         @type value: mixed
         '''
         self._values[item] = value
+        self._hash = None
         
     def __delitem__(self, item):
         '''
@@ -84,6 +89,7 @@ class TemplateFact(Fact):
         @type item: string
         '''
         del self._values[item]
+        self._hash = None
         
     def __str__(self):
         '''
@@ -94,19 +100,22 @@ class TemplateFact(Fact):
                               " ".join(["(%s %s)"%(str(s),str(v) if not isinstance(v, list)
                                                             else " ".join([str(x) for x in v]) ) for (s,v) in self._values.items()]))
     
-    def __hash__(self):
-        prefix = [self.moduleName, self.templateName]
-        toHash = prefix + [(key, value) if not isinstance(value, list)
-                            else (key, tuple(value))
-                                for (key,value) in self._values.items()]
-            
-        return hash(tuple(toHash))
+    def _computeHash(self):
+        # values is a dict: the hash must not depend
+        # on the items order, like the equality
+        return hash((self._moduleName, self._templateName,
+                     frozenset([(key, value) if not isinstance(value, list)
+                                    else (key, tuple(value))
+                                        for (key,value) in self._values.iteritems()])))
         
     def __eq__(self, other):
-        if isinstance(self, TemplateFact) \
-            and self.moduleName == other.moduleName \
-            and self.templateName == other.templateName \
-            and self.values == other.values:
+        if self is other:
+            return True
+        if isinstance(other, TemplateFact) \
+            and self.__hash__() == other.__hash__() \
+            and self._moduleName == other._moduleName \
+            and self._templateName == other._templateName \
+            and self._values == other._values:
             
             return True
         else:
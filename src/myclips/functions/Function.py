@@ -22,17 +22,68 @@ class Function(object):
     @staticmethod
     def doExecute(theFunction, theEnv, triggerEvent=True):
         from myclips.EventsManager import EventsManager
-        try:
-            theEnv.network.eventsManager.fire(EventsManager.E_ACTION_PERFORMED, theFunction.funcDefinition.name, theFunction.funcArgs )
-        except:
-            pass
+        eventsManager = Function._eventsManager(theEnv)
+        if eventsManager is not None and eventsManager.isObserved(EventsManager.E_ACTION_PERFORMED):
+            try:
+                eventsManager.fire(EventsManager.E_ACTION_PERFORMED, theFunction.funcDefinition.name, theFunction.funcArgs )
+            except:
+                pass
         returnValue = theFunction.funcDefinition.linkedType.__class__.execute(theFunction.funcDefinition.linkedType, theEnv, *(theFunction.funcArgs))
-        try:
-            theEnv.network.eventsManager.fire(EventsManager.E_ACTION_RETURNVALUE, returnValue )
-        except:
-            pass
+        if eventsManager is not None and eventsManager.isObserved(EventsManager.E_ACTION_RETURNVALUE):
+            try:
+                eventsManager.fire(EventsManager.E_ACTION_RETURNVALUE, returnValue )
+            except:
+                pass
         return returnValue
 
+    @staticmethod
+    def compileCall(theFunction):
+        """
+        Build a function theEnv -> returnValue equivalent
+        to doExecute(theFunction, theEnv). The function
+        implementation and the args are resolved once
+
+        @param theFunction: the function call
+        @type theFunction: types.FunctionCall
+        @rtype: callable
+        """
+        if not isinstance(theFunction, types.FunctionCall):
+            # not a function call: leave the error at execution time
+            return lambda theEnv: Function.doExecute(theFunction, theEnv)
+
+        from myclips.EventsManager import EventsManager
+
+        funcName = theFunction.funcDefinition.name
+        funcArgs = tuple(theFunction.funcArgs)
+        linkedType = theFunction.funcDefinition.linkedType
+        execute = linkedType.__class__.execute
+
+        def compiledCall(theEnv):
+            eventsManager = Function._eventsManager(theEnv)
+            if eventsManager is not None and eventsManager.isObserved(EventsManager.E_ACTION_PERFORMED):
+                try:
+                    eventsManager.fire(EventsManager.E_ACTION_PERFORMED, funcName, theFunction.funcArgs)
+                except:
+                    pass
+            returnValue = execute(linkedType, theEnv, *funcArgs)
+            if eventsManager is not None and eventsManager.isObserved(EventsManager.E_ACTION_RETURNVALUE):
+                try:
+                    eventsManager.fire(EventsManager.E_ACTION_RETURNVALUE, returnValue)
+                except:
+                    pass
+            return returnValue
+
+        return compiledCall
+
+    @staticmethod
+    def _eventsManager(theEnv):
+        # functions called by network tests
+        # don't have a network in theEnv
+        try:
+            return theEnv.network.eventsManager
+        except AttributeError:
+            return None
+
     @classmethod
     def execute(cls, theFunction, theEnv, *args, **kargs):
         """
@@ -1,11 +1,13 @@
 import sys
 import os
+from UserDict import DictMixin
 import myclips
 from myclips.MyClipsException import MyClipsException
 from myclips.functions.Function import Function
 
 FUNCTIONS_DIR = os.path.dirname(__file__)
 FUNCTIONS_MANIFEST = "manifest.json"
+FUNCTIONS_MANIFEST_CACHE = "manifest.cache.json"
 
 
 class FunctionEnv(object):
@@ -34,10 +36,76 @@ class FunctionEnv(object):
     
     
       
+class LazyDefinitions(DictMixin):
+    '''
+    System functions definitions map (name => FunctionDefinition).
+    Functions could be added as lazy: only the module and
+    the class are stored and the module is imported
+    (and the definition created) on first lookup.
+    Names checks (has_key, keys, in) never import modules
+    '''
+    
+    def __init__(self):
+        self._definitions = {}
+        self._lazy = {}
+        '''name => (module, class) of definitions not loaded yet'''
+        
+    def addLazy(self, funcName, funcModule, funcClass):
+        """
+        Add a definition to be loaded on first lookup
+        """
+        self._lazy[funcName] = (funcModule, funcClass)
+        
+    def __getitem__(self, funcName):
+        try:
+            return self._definitions[funcName]
+        except KeyError:
+            (funcModule, funcClass) = self._lazy.pop(funcName)
+            try:
+                funcInstance = myclips.newInstance(funcClass, None, funcModule)
+            except ImportError, e:
+                myclips.logger.error("Error loading function definition class: %s", e)
+                raise KeyError(funcName)
+            
+            funcDefinition = funcInstance.definition()
+            if funcDefinition.name != funcName:
+                myclips.logger.error("Functions manifest cache is stale: %s.%s defines %s, not %s", 
+                                     funcModule, funcClass, funcDefinition.name, funcName)
+            self._definitions[funcDefinition.name] = funcDefinition
+            return self._definitions[funcName]
+    
+    def __setitem__(self, funcName, funcDefinition):
+        self._lazy.pop(funcName, None)
+        self._definitions[funcName] = funcDefinition
+        
+    def __delitem__(self, funcName):
+        if self._lazy.has_key(funcName):
+            del self._lazy[funcName]
+        else:
+            del self._definitions[funcName]
+        
+    def has_key(self, funcName):
+        return self._definitions.has_key(funcName) or self._lazy.has_key(funcName)
+    
+    __contains__ = has_key
+    
+    def keys(self):
+        return self._definitions.keys() + self._lazy.keys()
+    
+    def __iter__(self):
+        return iter(self.keys())
+    
+    def __len__(self):
+        return len(self._definitions) + len(self._lazy)
+    
+      
 class SystemFunctionBroker(object):
     
-    _functions = {}
+    _functions = LazyDefinitions()
     _ready = False
+    
+    useManifestCache = True
+    '''if the manifest cache is valid, function modules are imported on first lookup'''
         
     @staticmethod
     def register(funcInstance, allowReplace=False):
@@ -86,40 +154,101 @@ class SystemFunctionBroker(object):
         if cls._ready:
             return
         
+        funcClasses = cls.manifestClasses()
+        if funcClasses is None:
+            return
+        
+        cls._ready = True
+        
+        if cls.useManifestCache:
+            # names in the cache are enough,
+            # modules will be imported on lookup
+            funcNames = cls._readManifestCache(funcClasses)
+            if funcNames is not None:
+                for (funcName, (funcModule, funcClass)) in funcNames.items():
+                    if not cls._functions.has_key(funcName):
+                        cls._functions.addLazy(funcName, funcModule, funcClass)
+                return
+        
+        for (funcModule, funcClass) in funcClasses:
+            try:
+                funcInstance = myclips.newInstance(funcClass, None, funcModule)
+            except ImportError, e:
+                myclips.logger.error("Error loading function definition class: %s", e)
+            else:
+                cls.register(funcInstance)
+                
+    @staticmethod
+    def manifestClasses():
+        """
+        Read the functions manifest (and the nested ones)
+        
+        @return: a list of (module, class) or None if the
+            main manifest cannot be loaded
+        @rtype: list|None
+        """
         import json
         
         manifestPath = "/".join([FUNCTIONS_DIR.rstrip("/"), FUNCTIONS_MANIFEST])
         
         try:
             funcList = json.load(open(manifestPath, "rU"))
-            cls._ready = True
         except Exception, e:
             myclips.logger.error("Functions manifest file %s cannot be loaded: %s", manifestPath, repr(e))
-        else:
-            for funcDict in funcList:
+            return None
+        
+        funcClasses = []
+        for funcDict in funcList:
+            try:
+                funcModule = funcDict['module']
+                funcClass = funcDict['class']
+            except KeyError, e:
                 try:
-                    funcModule = funcDict['module']
-                    funcClass = funcDict['class']
+                    importFile = funcDict['import']
+                    importFile = "/".join([FUNCTIONS_DIR.rstrip("/"), importFile])
                 except KeyError, e:
-                    try:
-                        importFile = funcDict['import']
-                        importFile = "/".join([FUNCTIONS_DIR.rstrip("/"), importFile])
-                    except KeyError, e:
-                        myclips.logger.error("Malformed function definition in manifest file %s:\n\tError: %s\n\tDefinition: %s", manifestPath, repr(e), str(funcDict))
-                    else:
-                        try:
-                            funcListInside = json.load(open(importFile, "rU"))
-                        except Exception, e:
-                            myclips.logger.error("Functions manifest file %s cannot be loaded: %s", importFile, repr(e))
-                        else:
-                            funcList.extend(funcListInside)
+                    myclips.logger.error("Malformed function definition in manifest file %s:\n\tError: %s\n\tDefinition: %s", manifestPath, repr(e), str(funcDict))
                 else:
                     try:
-                        funcInstance = myclips.newInstance(funcClass, None, funcModule)
-                    except ImportError, e:
-                        myclips.logger.error("Error loading function definition class: %s", e)
+                        funcListInside = json.load(open(importFile, "rU"))
+                    except Exception, e:
+                        myclips.logger.error("Functions manifest file %s cannot be loaded: %s", importFile, repr(e))
                     else:
-                        cls.register(funcInstance)
+                        funcList.extend(funcListInside)
+            else:
+                funcClasses.append((funcModule, funcClass))
+                
+        return funcClasses
+    
+    @staticmethod
+    def _readManifestCache(funcClasses):
+        """
+        Read the function names from the manifest cache
+        (see FunctionManifestGenerator.generateCache).
+        The cache is valid only if it was generated
+        from the same classes listed in the manifest
+        
+        @return: a dict name => (module, class) or None
+            if the cache is missing or stale
+        @rtype: dict|None
+        """
+        import json
+        
+        cachePath = "/".join([FUNCTIONS_DIR.rstrip("/"), FUNCTIONS_MANIFEST_CACHE])
+        
+        try:
+            cache = json.load(open(cachePath, "rU"))
+        except Exception:
+            return None
+        
+        funcNames = dict([(str(funcName), (str(funcModule), str(funcClass))) 
+                            for (funcName, (funcModule, funcClass)) in cache.get('functions', {}).items()])
+        
+        if sorted(set(funcNames.values())) != sorted(set(funcClasses)):
+            myclips.logger.info("Functions manifest cache %s is stale, all functions will be loaded", cachePath)
+            return None
+        
+        return funcNames
 
                     
 class SystemFunctionRedefinitionError(MyClipsException):
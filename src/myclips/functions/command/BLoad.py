@@ -0,0 +1,50 @@
+'''
+Created on 17/ott/2026
+
+@author: Francesco Capozzo
+'''
+from myclips.FunctionsManager import FunctionDefinition, Constraint_ExactArgsLength,\
+    Constraint_ArgType
+import myclips.parser.Types as types
+from myclips.functions.Function import Function, InvalidArgValueError
+from myclips.rete.NetworkImage import InvalidImageError
+from genericpath import exists
+import os
+
+class BLoad(Function):
+    '''
+    Replace the network contents with a binary
+    image saved by bsave (see Network.loadImage)
+    '''
+    def __init__(self, *args, **kwargs):
+        Function.__init__(self, *args, **kwargs)
+        
+        
+    def do(self, theEnv, aPath, *args, **kargs):
+        """
+        function handler implementation
+        """
+
+        aPath = self.resolve(theEnv, 
+                             self.semplify(theEnv, aPath, types.Lexeme, ('1', 'symbol or string')))
+        
+        aPath = os.path.abspath(aPath)
+        
+        if not exists(aPath):
+            raise InvalidArgValueError("Function bload was unable to open file %s"%aPath)
+        
+        try:
+            theEnv.network.loadImage(aPath)
+        except InvalidImageError, e:
+            print >> theEnv.RESOURCES['werror'], e.message
+            return types.Symbol('FALSE')
+        
+        return types.Symbol('TRUE')
+    
+    
+BLoad.DEFINITION = FunctionDefinition("?SYSTEM?", "bload", BLoad(), types.Symbol, BLoad.do ,
+            [
+                Constraint_ExactArgsLength(1),
+                Constraint_ArgType((types.Symbol, types.String), 0)
+            ],forward=False)
+        
@@ -0,0 +1,45 @@
+'''
+Created on 17/ott/2026
+
+@author: Francesco Capozzo
+'''
+from myclips.FunctionsManager import FunctionDefinition, Constraint_ExactArgsLength,\
+    Constraint_ArgType
+import myclips.parser.Types as types
+from myclips.functions.Function import Function
+import os
+
+class BSave(Function):
+    '''
+    Save the compiled network (constructs only) in a binary image
+    (see Network.saveImage)
+    '''
+    def __init__(self, *args, **kwargs):
+        Function.__init__(self, *args, **kwargs)
+        
+        
+    def do(self, theEnv, aPath, *args, **kargs):
+        """
+        function handler implementation
+        """
+
+        aPath = self.resolve(theEnv, 
+                             self.semplify(theEnv, aPath, types.Lexeme, ('1', 'symbol or string')))
+        
+        aPath = os.path.abspath(aPath)
+        
+        try:
+            theEnv.network.saveImage(aPath)
+        except (IOError, OSError), e:
+            print >> theEnv.RESOURCES['werror'], "Function bsave was unable to write file %s: %s"%(aPath, e)
+            return types.Symbol('FALSE')
+        
+        return types.Symbol('TRUE')
+    
+    
+BSave.DEFINITION = FunctionDefinition("?SYSTEM?", "bsave", BSave(), types.Symbol, BSave.do ,
+            [
+                Constraint_ExactArgsLength(1),
+                Constraint_ArgType((types.Symbol, types.String), 0)
+            ],forward=False)
+        
@@ -10,6 +10,7 @@ from myclips.functions.Function import Function, InvalidArgValueError
 from genericpath import exists
 import os
 import sys
+from myclips.parser.ParseCache import ParseCache
 
 class Batch(Function):
     '''
@@ -36,18 +37,25 @@ class Batch(Function):
         
         os.chdir(os.path.dirname(aPath))
         
-        aFile = open(aPath, 'rU')
-        aString = aFile.read()
+        with open(aPath, 'rU') as aFile:
+            aString = aFile.read()
 
+        cacheDir = theEnv.network.settings.getSetting("parser.cacheDir", None)
+        cache = ParseCache(cacheDir, aString) if cacheDir is not None else None
+
+        # constructs and commands are executed as soon as they are parsed
+        parsed = theEnv.network.getParser().iterParse(aString, extended=True, cache=cache)
+        
         try:
-            parsed = theEnv.network.getParser().parse(aString, extended=True)
-        except Exception, e:
-            print >> theEnv.RESOURCES['werror'], theEnv.network.getParser().ExceptionPPrint(e, aString)
-            os.chdir(oldcwd)
-            return types.Symbol('FALSE')
-        else:
-            cString = ""
-            for p in parsed:
+            while True:
+                try:
+                    p = parsed.next()
+                except StopIteration:
+                    break
+                except Exception, e:
+                    print >> theEnv.RESOURCES['werror'], theEnv.network.getParser().ExceptionPPrint(e, aString)
+                    return types.Symbol('FALSE')
+                
                 if isinstance(p, types.DefRuleConstruct):
                     theEnv.network.addRule(p)
                     
@@ -60,8 +68,12 @@ class Batch(Function):
                     if not isinstance(theResult, types.NullValue):
                         print >> theEnv.RESOURCES['wtrace'], str(theResult)
                                             
-            os.chdir(oldcwd)
             return types.Symbol('TRUE')
+        
+        finally:
+            os.chdir(oldcwd)
+            if cache is not None:
+                cache.save()
     
     
 Batch.DEFINITION = FunctionDefinition("?SYSTEM?", "batch", Batch(), types.Symbol, Batch.do ,
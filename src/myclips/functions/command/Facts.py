@@ -104,19 +104,18 @@ class Facts(Function):
             theEnd = sys.maxint
             theMax = None
 
-        #normalize theModules
-        theModules = [] if theModules == "*" else [theModules]
+        # facts are read from the working memory index:
+        # only facts in the range are scanned
+        # (a negative max drops facts from the end)
+        limit = theMax if theMax is None or theMax >= 0 else None
 
-        theFacts = []
-        if len(theModules) > 0:
-            for theModule in theModules:
-                theFacts += theEnv.network.factsForScope(theModule)
+        if theModules == "*":
+            theFacts = theEnv.network.factsInRange(theStart, theEnd, limit)
         else:
-            theFacts = theEnv.network.facts
-
-
-        # filter and cut the wme list to display
-        theFacts = [wme for wme in theFacts if wme.factId >= theStart and wme.factId <= theEnd][:theMax] 
+            theFacts = theEnv.network.factsForScope(theModules, theStart, theEnd, limit)
+            
+        if limit is None:
+            theFacts = theFacts[:theMax] 
         
         if len(theFacts):
 
@@ -9,6 +9,7 @@ import myclips.parser.Types as types
 from myclips.functions.Function import Function, InvalidArgValueError
 from genericpath import exists
 import os
+from myclips.parser.ParseCache import ParseCache
 
 class Load(Function):
     '''
@@ -31,17 +32,26 @@ class Load(Function):
         if not exists(aPath):
             raise InvalidArgValueError("Function load was unable to open file %s"%aPath)
         
-        aFile = open(aPath, 'rU')
-        aString = aFile.read()
+        with open(aPath, 'rU') as aFile:
+            aString = aFile.read()
 
+        cacheDir = theEnv.network.settings.getSetting("parser.cacheDir", None)
+        cache = ParseCache(cacheDir, aString) if cacheDir is not None else None
+
+        # constructs are compiled as soon as they are parsed
+        parsed = theEnv.network.getParser().iterParse(aString, extended=True, cache=cache)
+        
         try:
-            parsed = theEnv.network.getParser().parse(aString, extended=True)
-        except Exception, e:
-            print >> theEnv.RESOURCES['werror'], theEnv.network.getParser().ExceptionPPrint(e, aString)
-            return types.Symbol('FALSE')
-        else:
             cString = ""
-            for p in parsed:
+            while True:
+                try:
+                    p = parsed.next()
+                except StopIteration:
+                    break
+                except Exception, e:
+                    print >> theEnv.RESOURCES['werror'], theEnv.network.getParser().ExceptionPPrint(e, aString)
+                    return types.Symbol('FALSE')
+                
                 if isinstance(p, types.DefRuleConstruct):
                     cString += "*"
                     theEnv.network.addRule(p)
@@ -58,6 +68,10 @@ class Load(Function):
             print >> theEnv.RESOURCES['wtrace'], cString
                     
             return types.Symbol('TRUE')
+        
+        finally:
+            if cache is not None:
+                cache.save()
     
     
 Load.DEFINITION = FunctionDefinition("?SYSTEM?", "load", Load(), types.Symbol, Load.do ,
@@ -0,0 +1,41 @@
+'''
+Created on 17/ott/2026
+
+@author: Francesco Capozzo
+'''
+from myclips.FunctionsManager import FunctionDefinition,\
+    Constraint_ExactArgsLength, Constraint_ArgType
+import myclips.parser.Types as types
+from myclips.rete.WME import WME
+from myclips.functions.fact._FactSetQuery import _FactSetQuery
+
+class AnyFactp(_FactSetQuery):
+    '''
+    The any-factp function returns TRUE if a fact-set
+    satisfies the query, FALSE otherwise
+
+    (any-factp <fact-set-template> <query>)
+
+    @see: http://www.comp.rgu.ac.uk/staff/smc/teaching/clips/vol1/vol1-12.9.html
+    '''
+    def __init__(self, *args, **kwargs):
+        _FactSetQuery.__init__(self, *args, **kwargs)
+
+
+    def do(self, theEnv, theTemplates, theQuery, *args, **kargs):
+        """
+        Function handler implementation
+        """
+
+        for _ in self.factSets(theEnv, theTemplates, theQuery):
+            return types.Symbol("TRUE")
+
+        return types.Symbol("FALSE")
+
+AnyFactp.DEFINITION = FunctionDefinition("?SYSTEM?", "any-factp", AnyFactp(), types.Symbol,
+                                                AnyFactp.do,
+            [
+                Constraint_ExactArgsLength(2),
+                Constraint_ArgType(list, 0)
+            ],forward=False)
+
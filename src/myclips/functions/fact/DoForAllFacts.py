@@ -0,0 +1,53 @@
+'''
+Created on 17/ott/2026
+
+@author: Francesco Capozzo
+'''
+from myclips.FunctionsManager import FunctionDefinition,\
+    Constraint_MinArgsLength, Constraint_ArgType
+import myclips.parser.Types as types
+from myclips.rete.WME import WME
+from myclips.functions.Function import BreakException
+from myclips.functions.fact._FactSetQuery import _FactSetQuery
+
+class DoForAllFacts(_FactSetQuery):
+    '''
+    The do-for-all-facts function executes the actions for
+    each fact-set that satisfies the query and returns the
+    value of the last action (FALSE if no fact-set satisfies
+    the query)
+
+    (do-for-all-facts <fact-set-template> <query> <action>*)
+
+    @see: http://www.comp.rgu.ac.uk/staff/smc/teaching/clips/vol1/vol1-12.9.html
+    '''
+    def __init__(self, *args, **kwargs):
+        _FactSetQuery.__init__(self, *args, **kwargs)
+
+
+    def do(self, theEnv, theTemplates, theQuery, *args, **kargs):
+        """
+        Function handler implementation
+        """
+
+        returnValue = types.Symbol("FALSE")
+
+        # as for loops, break stops the iteration
+        # and return is caught by the function caller
+        try:
+            for _ in self.factSets(theEnv, theTemplates, theQuery):
+                returnValue = self.executeActions(theEnv, args)
+        except BreakException:
+            pass
+
+        return returnValue
+
+DoForAllFacts.DEFINITION = FunctionDefinition("?SYSTEM?", "do-for-all-facts", DoForAllFacts(), (types.Lexeme, types.Symbol, types.String,
+                                                                                    types.Number, types.Integer, types.Float,
+                                                                                    list, types.NullValue, WME ),
+                                                DoForAllFacts.do,
+            [
+                Constraint_MinArgsLength(2),
+                Constraint_ArgType(list, 0)
+            ],forward=False)
+
@@ -0,0 +1,46 @@
+'''
+Created on 17/ott/2026
+
+@author: Francesco Capozzo
+'''
+from myclips.FunctionsManager import FunctionDefinition,\
+    Constraint_MinArgsLength, Constraint_ArgType
+import myclips.parser.Types as types
+from myclips.rete.WME import WME
+from myclips.functions.fact._FactSetQuery import _FactSetQuery
+
+class DoForFact(_FactSetQuery):
+    '''
+    The do-for-fact function executes the actions for the
+    first fact-set that satisfies the query and returns the
+    value of the last action (FALSE if no fact-set satisfies
+    the query)
+
+    (do-for-fact <fact-set-template> <query> <action>*)
+
+    @see: http://www.comp.rgu.ac.uk/staff/smc/teaching/clips/vol1/vol1-12.9.html
+    '''
+    def __init__(self, *args, **kwargs):
+        _FactSetQuery.__init__(self, *args, **kwargs)
+
+
+    def do(self, theEnv, theTemplates, theQuery, *args, **kargs):
+        """
+        Function handler implementation
+        """
+
+        for _ in self.factSets(theEnv, theTemplates, theQuery):
+            # fact-set variables are still bound here
+            return self.executeActions(theEnv, args)
+
+        return types.Symbol("FALSE")
+
+DoForFact.DEFINITION = FunctionDefinition("?SYSTEM?", "do-for-fact", DoForFact(), (types.Lexeme, types.Symbol, types.String,
+                                                                                    types.Number, types.Integer, types.Float,
+                                                                                    list, types.NullValue, WME ),
+                                                DoForFact.do,
+            [
+                Constraint_MinArgsLength(2),
+                Constraint_ArgType(list, 0)
+            ],forward=False)
+
@@ -0,0 +1,65 @@
+'''
+Created on 17/ott/2026
+
+@author: Francesco Capozzo
+'''
+from myclips.FunctionsManager import FunctionDefinition,\
+    Constraint_ExactArgsLength, Constraint_ArgType
+import myclips.parser.Types as types
+from myclips.rete.WME import WME
+from myclips.functions.Function import Function, InvalidArgValueError
+from myclips.facts.TemplateFact import TemplateFact
+from myclips.facts.Fact import FactInvalidSlotName
+
+class FactSlotValue(Function):
+    '''
+    The fact-slot-value function returns the value of a slot
+    of a fact. The implied slot of an ordered fact returns
+    all fact values
+
+    (fact-slot-value <fact-address-or-index> <slot-name>)
+
+    WARNING: MyClips's version of fact-address is a WME instance
+
+    @see http://www.comp.rgu.ac.uk/staff/smc/teaching/clips/vol1/vol1-12.9.html#Heading306
+    '''
+    def __init__(self, *args, **kwargs):
+        Function.__init__(self, *args, **kwargs)
+
+
+    def do(self, theEnv, theWme, theSlot, *args, **kargs):
+        """
+        Function handler implementation
+        """
+
+        theWme = self.semplify(theEnv, theWme, (WME, types.Integer), ("1", "fact-address or integer"))
+        theSlot = self.resolve(theEnv, self.semplify(theEnv, theSlot, types.Symbol, ("2", "symbol")))
+
+        if isinstance(theWme, types.Integer):
+            theWme = theEnv.network.getWmeFromId(theWme.evaluate())
+
+        theFact = theWme.fact
+
+        if isinstance(theFact, TemplateFact):
+            try:
+                return theFact[theSlot]
+            except FactInvalidSlotName:
+                raise InvalidArgValueError("Invalid slot %s not defined in corresponding deftemplate %s"%(theSlot, theFact.templateName))
+
+        elif theSlot == "implied":
+            return list(theFact.values)
+
+        else:
+            raise InvalidArgValueError("Invalid slot %s for an ordered fact"%theSlot)
+
+
+FactSlotValue.DEFINITION = FunctionDefinition("?SYSTEM?", "fact-slot-value", FactSlotValue(), (types.Lexeme, types.Symbol, types.String,
+                                                                                    types.Number, types.Integer, types.Float,
+                                                                                    list, WME ),
+                                                FactSlotValue.do,
+            [
+                Constraint_ExactArgsLength(2),
+                Constraint_ArgType((WME, types.Integer), 0),
+                Constraint_ArgType(types.Symbol, 1)
+            ],forward=False)
+
@@ -0,0 +1,43 @@
+'''
+Created on 17/ott/2026
+
+@author: Francesco Capozzo
+'''
+from myclips.FunctionsManager import FunctionDefinition,\
+    Constraint_ExactArgsLength, Constraint_ArgType
+import myclips.parser.Types as types
+from myclips.rete.WME import WME
+from myclips.functions.fact._FactSetQuery import _FactSetQuery
+
+class FindAllFacts(_FactSetQuery):
+    '''
+    The find-all-facts function returns a multifield with
+    all fact-sets that satisfy the query (fact-sets are
+    concatenated)
+
+    (find-all-facts <fact-set-template> <query>)
+
+    @see: http://www.comp.rgu.ac.uk/staff/smc/teaching/clips/vol1/vol1-12.9.html
+    '''
+    def __init__(self, *args, **kwargs):
+        _FactSetQuery.__init__(self, *args, **kwargs)
+
+
+    def do(self, theEnv, theTemplates, theQuery, *args, **kargs):
+        """
+        Function handler implementation
+        """
+
+        returnValue = []
+        for factSet in self.factSets(theEnv, theTemplates, theQuery):
+            returnValue += factSet
+
+        return returnValue
+
+FindAllFacts.DEFINITION = FunctionDefinition("?SYSTEM?", "find-all-facts", FindAllFacts(), list,
+                                                FindAllFacts.do,
+            [
+                Constraint_ExactArgsLength(2),
+                Constraint_ArgType(list, 0)
+            ],forward=False)
+
@@ -0,0 +1,42 @@
+'''
+Created on 17/ott/2026
+
+@author: Francesco Capozzo
+'''
+from myclips.FunctionsManager import FunctionDefinition,\
+    Constraint_ExactArgsLength, Constraint_ArgType
+import myclips.parser.Types as types
+from myclips.rete.WME import WME
+from myclips.functions.fact._FactSetQuery import _FactSetQuery
+
+class FindFact(_FactSetQuery):
+    '''
+    The find-fact function returns a multifield with the
+    first fact-set that satisfies the query (an empty
+    multifield if none)
+
+    (find-fact <fact-set-template> <query>)
+
+    @see: http://www.comp.rgu.ac.uk/staff/smc/teaching/clips/vol1/vol1-12.9.html
+    '''
+    def __init__(self, *args, **kwargs):
+        _FactSetQuery.__init__(self, *args, **kwargs)
+
+
+    def do(self, theEnv, theTemplates, theQuery, *args, **kargs):
+        """
+        Function handler implementation
+        """
+
+        for factSet in self.factSets(theEnv, theTemplates, theQuery):
+            return factSet
+
+        return []
+
+FindFact.DEFINITION = FunctionDefinition("?SYSTEM?", "find-fact", FindFact(), list,
+                                                FindFact.do,
+            [
+                Constraint_ExactArgsLength(2),
+                Constraint_ArgType(list, 0)
+            ],forward=False)
+
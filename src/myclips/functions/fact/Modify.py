@@ -49,16 +49,9 @@ class Modify(Function):
         if not isinstance(theFact.fact, TemplateFact):
             raise InvalidArgValueError("")
         
-        # 3) get a copy of the fact inside the wme
-        theBackup = theFact.fact
-        
-        # 4) retract the wme
-        theEnv.network.retractFact(theFact)
-        
-        del theFact
-        
-        # 5) modify the fact with the new values for the slots:
+        # 3) get the new values for the slots:
         
+        theSlots = {}
         for theSlot in args:
             # each arg is a types.OrderedRhsQualcosa: index 0 is the slot name, then values
             assert isinstance(theSlot, types.OrderedRhsPattern)
@@ -72,11 +65,12 @@ class Modify(Function):
                 # it's a single field
                 theSlotValues = self.semplify(theEnv, theSlot.values[1])
                 
-            theBackup[theSlotName] = theSlotValues
+            theSlots[theSlotName] = theSlotValues
             
-        # 6) assert the new fact
+        # 4) modify the fact in the network
+        #    (retract + assert or a slot-specific update)
         
-        theWme, isNew = theEnv.network.assertFact(theBackup)
+        theWme, isNew = theEnv.network.modifyFact(theFact, theSlots)
             
         return theWme if isNew else types.Symbol("FALSE")
             
@@ -0,0 +1,210 @@
+'''
+Created on 17/ott/2026
+
+@author: Francesco Capozzo
+'''
+import myclips.parser.Types as types
+from myclips.functions.Function import Function, InvalidArgValueError
+from myclips.rete import analysis
+from myclips.TemplatesManager import SlotDefinition
+from myclips.rete.Network import FactNotFoundError
+
+class _FactSetQuery(Function):
+    '''
+    Base class for fact-set query functions:
+
+        (<function> (<fact-set-template>+) <query> <action>*)
+        <fact-set-template> := (<fact-variable> <template-name>+)
+
+    Fact-sets are all permutations of facts for
+    each template restriction (last restriction varies fastest),
+    in fact-id order. The query is evaluated for each fact-set
+    with variables bound to fact-addresses.
+
+    Facts for each restriction are read from the working memory
+    template index. Constant slot tests in the query
+    (and (eq (fact-slot-value ?f <slot>) <constant>) ...)
+    are compiled to alpha tests: facts are read from the
+    alpha memory for the tests (if a rule already created it)
+    or filtered by the tests before the query is evaluated
+
+    @see: http://www.comp.rgu.ac.uk/staff/smc/teaching/clips/vol1/vol1-12.9.html
+    '''
+    def __init__(self, *args, **kwargs):
+        Function.__init__(self, *args, **kwargs)
+
+    def factSets(self, theEnv, theTemplates, theQuery):
+        """
+        Iterate over fact-sets that satisfy the query.
+        While a fact-set is used, fact-set variables are
+        bound in theEnv.variables (previous values are
+        restored at the end). Facts retracted after
+        the query started are skipped
+
+        @param theEnv: the function env
+        @type theEnv: FunctionEnv
+        @param theTemplates: the fact-set templates arg
+        @type theTemplates: list
+        @param theQuery: the query arg
+        @return: an iterator of fact-sets (list of WME)
+        @rtype: iterator
+        """
+
+        restrictions = self._restrictions(theEnv, theTemplates)
+
+        candidates = [self._candidates(theEnv, theVarName, theTemplateNames, theQuery)
+                        for (theVarName, theTemplateNames) in restrictions]
+
+        if min([len(wmes) for wmes in candidates]) == 0:
+            return
+
+        network = theEnv.network
+        oldVariables = dict([(theVarName, theEnv.variables[theVarName])
+                                for (theVarName, _) in restrictions
+                                    if theEnv.variables.has_key(theVarName)])
+
+        try:
+            indexes = [0] * len(candidates)
+            while True:
+                factSet = [candidates[i][index] for (i, index) in enumerate(indexes)]
+
+                if len([wme for wme in factSet if not self._isAsserted(network, wme)]) == 0:
+                    for ((theVarName, _), wme) in zip(restrictions, factSet):
+                        theEnv.variables[theVarName] = wme
+
+                    if self._isTrue(self.semplify(theEnv, theQuery)):
+                        yield factSet
+
+                # next permutation: last restriction varies fastest
+                i = len(indexes) - 1
+                while i >= 0:
+                    indexes[i] += 1
+                    if indexes[i] < len(candidates[i]):
+                        break
+                    indexes[i] = 0
+                    i -= 1
+                if i < 0:
+                    break
+
+        finally:
+            for (theVarName, _) in restrictions:
+                if oldVariables.has_key(theVarName):
+                    theEnv.variables[theVarName] = oldVariables[theVarName]
+                else:
+                    theEnv.variables.pop(theVarName, None)
+
+    def executeActions(self, theEnv, theActions):
+        """
+        Execute the actions for a fact-set
+
+        @return: the value of the last action
+        """
+        returnValue = types.Symbol("FALSE")
+        for action in theActions:
+            returnValue = self.semplify(theEnv, action)
+        return returnValue
+
+    def _isAsserted(self, network, wme):
+        try:
+            return network.getWmeFromId(wme.factId) is wme
+        except FactNotFoundError:
+            return False
+
+    def _isTrue(self, theResult):
+        return not (isinstance(theResult, types.Symbol) and theResult.pyEqual("FALSE"))
+
+    def _restrictions(self, theEnv, theTemplates):
+        """
+        Validate the fact-set templates and
+        convert them to a list of (var name, [template names])
+        """
+        if not isinstance(theTemplates, list) or len(theTemplates) == 0:
+            raise InvalidArgValueError("Function %s expected a list of fact-set templates"%self.DEFINITION.name)
+
+        restrictions = []
+        for theTemplate in theTemplates:
+            if not isinstance(theTemplate, list) \
+                    or len(theTemplate) < 2 \
+                    or not isinstance(theTemplate[0], types.SingleFieldVariable) \
+                    or len([x for x in theTemplate[1:] if not isinstance(x, types.Symbol)]) > 0:
+                raise InvalidArgValueError("Function %s expected fact-set templates in the format (?<variable> <template-name>+)"%self.DEFINITION.name)
+
+            theTemplateNames = [theName.evaluate() for theName in theTemplate[1:]]
+            for theName in theTemplateNames:
+                if not theEnv.modulesManager.currentScope.templates.has(theName):
+                    raise InvalidArgValueError("Function %s: unable to find deftemplate %s"%(self.DEFINITION.name, theName))
+
+            restrictions.append((theTemplate[0].evaluate(), theTemplateNames))
+
+        return restrictions
+
+    def _candidates(self, theEnv, theVarName, theTemplateNames, theQuery):
+        """
+        Get facts for a template restriction (fact-id order),
+        prefiltered by constant slot tests in the query
+        """
+        constants = self._constantSlotTests(theVarName, theQuery)
+
+        wmes = []
+        for theTemplateName in theTemplateNames:
+            alphaTests = self._alphaTests(theEnv, theTemplateName, constants)
+
+            alphaMemory = theEnv.network.findAlphaMemory(alphaTests)
+            if alphaMemory is not None:
+                wmes += alphaMemory.items
+            else:
+                wmes += [wme for wme in theEnv.network.factsForTemplate(theTemplateName)
+                            if len([test for tests in alphaTests for test in tests if not test.isValid(wme)]) == 0]
+
+        # a template name could be used twice
+        return sorted(dict([(wme.factId, wme) for wme in wmes]).values(), key=lambda wme: wme.factId)
+
+    def _constantSlotTests(self, theVarName, theQuery):
+        """
+        Find (eq (fact-slot-value ?var <slot>) <constant>) tests
+        in the query (or in a top level and)
+
+        @return: a list of (slot name, constant)
+        """
+        conjuncts = [theQuery]
+        if isinstance(theQuery, types.FunctionCall) and theQuery.funcName == "and":
+            conjuncts = theQuery.funcArgs
+
+        constants = {}
+        for theConjunct in conjuncts:
+            if not isinstance(theConjunct, types.FunctionCall) \
+                    or theConjunct.funcName != "eq" \
+                    or len(theConjunct.funcArgs) != 2:
+                continue
+
+            for (theSlotValue, theConstant) in [theConjunct.funcArgs, reversed(theConjunct.funcArgs)]:
+                if isinstance(theSlotValue, types.FunctionCall) \
+                        and theSlotValue.funcName == "fact-slot-value" \
+                        and isinstance(theSlotValue.funcArgs[0], types.SingleFieldVariable) \
+                        and theSlotValue.funcArgs[0].evaluate() == theVarName \
+                        and isinstance(theSlotValue.funcArgs[1], types.Symbol) \
+                        and isinstance(theConstant, (types.Symbol, types.String, types.Integer, types.Float)):
+                    constants.setdefault(theSlotValue.funcArgs[1].evaluate(), theConstant)
+                    break
+
+        return constants.items()
+
+    def _alphaTests(self, theEnv, theTemplateName, constants):
+        """
+        Compile template name and constant single-slot
+        tests to alpha tests, as for a pattern
+        (<template-name> (<slot> <constant>)...)
+        """
+        theDefinition = theEnv.modulesManager.currentScope.templates.getDefinition(theTemplateName)
+
+        theSlots = [types.SingleFieldLhsSlot(theSlotName, types.Constraint(types.PositiveTerm(theConstant)))
+                        for (theSlotName, theConstant) in constants
+                            if theDefinition.slots.has_key(theSlotName)
+                                and theDefinition.getSlot(theSlotName).getSlotType() == SlotDefinition.TYPE_SINGLE]
+
+        thePattern = types.TemplatePatternCE(theTemplateName, theEnv.modulesManager, theSlots)
+
+        alphaTests, _ = analysis.analyzePattern(thePattern, 0, {}, [])
+
+        return alphaTests
+
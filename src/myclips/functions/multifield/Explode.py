@@ -52,7 +52,9 @@ class Explode(Function):
                                 .setParseAction(lambda s,l,t: types.String("".join([str(x) for x in t.asList()])) )
                             | pp.Literal("$?")\
                                 .setParseAction(lambda s,l,t: types.String("$?") )                                
-                            | theEnv.network.getParser().getSParser("GlobalVariableParser").copy()\
+                            | (pp.Literal("?*") 
+                                    - theEnv.network.getParser().getSParser("VariableSymbolParser").copy().leaveWhitespace()
+                                    - pp.Literal("*").leaveWhitespace())\
                                 .setParseAction(lambda s,l,t: types.String("".join([str(x) for x in t.asList()])) )
                             | (pp.Literal("?") + theEnv.network.getParser().getSParser("VariableSymbolParser"))\
                                 .setParseAction(lambda s,l,t: types.String("".join([str(x) for x in t.asList()])) )
@@ -0,0 +1,58 @@
+'''
+Created on 17/ott/2026
+
+@author: Francesco Capozzo
+'''
+from myclips.FunctionsManager import FunctionDefinition,\
+    Constraint_ArgType, Constraint_MaxArgsLength
+import myclips.parser.Types as types
+from myclips.functions.Function import Function, InvalidArgValueError
+
+class ProfileReport(Function):
+    '''
+    Display statistics collected since the last (profile-rules):
+    rules (activations, fires, rhs time) and network nodes
+    (activations, join tests and time, peak memory size)
+    with the rules and CEs that use each node
+    
+    (profile-report [<logical-name>])
+    
+    WARNING:
+    
+    RESOURCES[wdisplay] is used for output if
+    <logical-name> is not specified
+    '''
+    def __init__(self, *args, **kwargs):
+        Function.__init__(self, *args, **kwargs)
+        
+        
+    def do(self, theEnv, theResourceId=None, *args, **kargs):
+        """
+        function handler implementation
+        """
+        
+        if theResourceId is not None:
+            theResourceId = self.resolve(theEnv, self.semplify(theEnv, theResourceId, types.Symbol, ("1", "symbol")))
+        else:
+            theResourceId = "wdisplay"
+        
+        try:
+            theResource = theEnv.RESOURCES[theResourceId]
+        except KeyError:
+            raise InvalidArgValueError("Resource with logical name %s cannot be found"%str(theResourceId))
+        
+        try:
+            theProfiler = theEnv.network.settings.getSetting("_funcs.ProfileRules.profiler")
+        except KeyError:
+            theResource.write("No profile data: use (profile-rules) first\n")
+        else:
+            theProfiler.report(theResource)
+        
+        return types.NullValue()
+    
+    
+ProfileReport.DEFINITION = FunctionDefinition("?SYSTEM?", "profile-report", ProfileReport(), types.NullValue, ProfileReport.do ,
+            [
+                Constraint_MaxArgsLength(1),
+                Constraint_ArgType(types.Symbol, 0, False),
+            ],forward=False)
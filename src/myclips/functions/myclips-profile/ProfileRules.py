@@ -0,0 +1,52 @@
+'''
+Created on 17/ott/2026
+
+@author: Francesco Capozzo
+'''
+from myclips.FunctionsManager import FunctionDefinition,\
+    Constraint_ArgType, Constraint_MaxArgsLength
+import myclips.parser.Types as types
+from myclips.functions.Function import Function
+from myclips.listeners.RulesProfiler import RulesProfiler
+
+class ProfileRules(Function):
+    '''
+    Start (or stop) collecting statistics about rules and
+    network nodes: activations, join tests, memories size
+    and rhs time. Statistics are reset on start.
+    
+    (profile-rules [TRUE|FALSE])
+    
+    Statistics are available through (profile-report)
+    until the next (profile-rules)
+    '''
+    def __init__(self, *args, **kwargs):
+        Function.__init__(self, *args, **kwargs)
+        
+        
+    def do(self, theEnv, theEnable=None, *args, **kargs):
+        """
+        function handler implementation
+        """
+        
+        if theEnable is not None:
+            theEnable = self.resolve(theEnv, self.semplify(theEnv, theEnable, types.Symbol, ("1", "symbol")))
+        
+        # stop the previous profiler (if any)
+        try:
+            theEnv.network.settings.getSetting("_funcs.ProfileRules.profiler").uninstall()
+        except KeyError:
+            pass
+        
+        if theEnable != "FALSE":
+            theEnv.network.settings.setSetting("_funcs.ProfileRules.profiler", 
+                                               RulesProfiler(theEnv.network).install(theEnv.network.eventsManager))
+        
+        return types.NullValue()
+    
+    
+ProfileRules.DEFINITION = FunctionDefinition("?SYSTEM?", "profile-rules", ProfileRules(), types.NullValue, ProfileRules.do ,
+            [
+                Constraint_MaxArgsLength(1),
+                Constraint_ArgType(types.Symbol, 0, False),
+            ],forward=False)
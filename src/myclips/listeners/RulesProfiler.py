@@ -0,0 +1,290 @@
+'''
+Created on 17/ott/2026
+
+@author: Francesco Capozzo
+'''
+from myclips.EventsManager import EventsManager
+from myclips.listeners.EventsManagerListener import EventsManagerListener
+from myclips.rete.HasJoinTests import HasJoinTests
+from myclips.rete.Memory import Memory
+from myclips.rete.nodes.JoinNode import JoinNode
+from myclips.rete.nodes.TestNode import TestNode
+from myclips.rete.nodes.NccNode import NccNode
+from myclips.rete.nodes.AlphaMemory import AlphaMemory
+from myclips.rete.nodes.PropertyTestNode import PropertyTestNode
+from myclips.rete.nodes.PNode import PNode
+import time
+
+class RulesProfiler(EventsManagerListener):
+    '''
+    Collect statistics about the network while installed:
+    for each node: right and left activations, join tests
+    executed (and time spent in them) and the peak size of
+    the node memory; for each rule: activations, fires and
+    time spent in the rhs (network changes made by rhs
+    actions are included).
+    Nodes are instrumented replacing activation methods in
+    the node instance (uninstall restores them), nodes added
+    while the profiler is installed are instrumented too.
+
+    Report attributes each node to the rules (and the CE
+    in the rule lhs) that use it
+    '''
+
+
+    def __init__(self, network):
+        '''
+        Create a new profiler
+
+        @param network: the Network instance profiled
+        '''
+
+        self._network = network
+        self._nodes = {}
+        '''id(node) => (node, stats)'''
+        self._rules = {}
+        '''complete main rule name => stats'''
+        self._wrapped = {}
+        '''id(node) => (node, {method name: instance attribute replaced or None})'''
+        EventsManagerListener.__init__(self, {
+                EventsManager.E_NODE_ADDED: self.onNodeAdded,
+                EventsManager.E_RULE_ACTIVATED: self.onRuleActivated
+            })
+
+    def _installImpl(self):
+        EventsManagerListener._installImpl(self)
+        for node in self._networkNodes():
+            self._instrument(node)
+
+    def uninstall(self):
+        '''
+        Remove the listener and restore all instrumented nodes
+        (statistics are still available)
+        '''
+        EventsManagerListener.uninstall(self)
+        for (node, originals) in self._wrapped.itervalues():
+            for (name, original) in originals.items():
+                if original is None:
+                    delattr(node, name)
+                else:
+                    setattr(node, name, original)
+        self._wrapped = {}
+
+    ######################
+    #    Events SLOTS    #
+    ######################
+
+    def onNodeAdded(self, node, *args, **kwargs):
+        self._instrument(node)
+
+    def onRuleActivated(self, theMainRuleName, theRuleName, theWmes, *args, **kwargs):
+        self._ruleStats(theMainRuleName)["activations"] += 1
+
+    ######################
+    #  Instrumentation   #
+    ######################
+
+    def _networkNodes(self):
+        """
+        Get all nodes in the network (alpha, beta and pnodes)
+        """
+        nodes = []
+        seen = set()
+        stack = [self._network._root]
+        while len(stack) > 0:
+            node = stack.pop()
+            if id(node) in seen:
+                continue
+            seen.add(id(node))
+            nodes.append(node)
+            stack.extend(node.children)
+            if isinstance(node, PropertyTestNode) and node.hasMemory():
+                stack.append(node.memory)
+        return nodes
+
+    def _instrument(self, node):
+
+        if self._wrapped.has_key(id(node)):
+            return
+
+        stats = self._nodes.setdefault(id(node), (node, {"right": 0,
+                                                         "left": 0,
+                                                         "tests": 0,
+                                                         "tests-time": 0.0,
+                                                         "peak": 0}))[1]
+        self._wrapped[id(node)] = (node, {})
+
+        if hasattr(node, "rightActivation"):
+            self._wrap(node, "rightActivation", _counter(stats, "right"))
+        if hasattr(node, "leftActivation"):
+            self._wrap(node, "leftActivation", _counter(stats, "left"))
+        if isinstance(node, HasJoinTests):
+            self._wrap(node, "isValid", _timer(stats))
+            if hasattr(node, "_isValidFilter"):
+                self._wrap(node, "_isValidFilter", _timer(stats))
+        if isinstance(node, Memory):
+            self._wrap(node, "addItem", _peak(stats, node))
+        if isinstance(node, PNode):
+            self._wrap(node, "execute", _rhsTimer(self._ruleStats(node.completeMainRuleName())))
+
+    def _wrap(self, node, name, makeWrapper):
+        self._wrapped[id(node)][1][name] = node.__dict__.get(name, None)
+        setattr(node, name, makeWrapper(getattr(node, name)))
+
+    def _ruleStats(self, theMainRuleName):
+        try:
+            return self._rules[theMainRuleName]
+        except KeyError:
+            stats = {"activations": 0,
+                     "fires": 0,
+                     "rhs-time": 0.0}
+            self._rules[theMainRuleName] = stats
+            return stats
+
+    ######################
+    #      Results       #
+    ######################
+
+    def rulesStats(self):
+        """
+        Get statistics for each rule
+
+        @return: a dict complete main rule name => {activations, fires, rhs-time}
+        @rtype: dict
+        """
+        return dict([(name, dict(stats)) for (name, stats) in self._rules.items()])
+
+    def nodesStats(self):
+        """
+        Get statistics for each node still in the network,
+        with the list of rules CE that use the node
+
+        @return: a list of tuples (node, {right, left, tests, tests-time, peak}, [(rule name, CE index)])
+            CE indexes start from 1, 0 is used for the pnode
+        @rtype: list
+        """
+        usedBy = self._usedBy()
+        return [(node, dict(stats), usedBy[id(node)])
+                    for (node, stats) in self._nodes.values()
+                        if usedBy.has_key(id(node))]
+
+    def _usedBy(self):
+        """
+        Walk each pnode circuit to map nodes to rules CEs
+        (nodes could be shared by many rules)
+        """
+        usedBy = {}
+
+        def link(node, ruleName, ceIndex):
+            usedBy.setdefault(id(node), []).append((ruleName, ceIndex))
+            # alpha circuit of the CE: memory and tests
+            if not isinstance(node, PNode) and not node.isRightRoot():
+                node = node.rightParent
+                while node is not None and isinstance(node, (AlphaMemory, PropertyTestNode)):
+                    usedBy.setdefault(id(node), []).append((ruleName, ceIndex))
+                    node = node.rightParent if not node.isRightRoot() else None
+
+        for mainPNode in self._network.rules.values():
+            for pnode in [mainPNode] + mainPNode.getLinkedPNodes():
+                ruleName = pnode.completeRuleName()
+
+                circuit = []
+                node = pnode
+                while node is not None:
+                    circuit.append(node)
+                    node = node.leftParent if not node.isLeftRoot() else None
+                circuit.reverse()
+
+                ceIndex = 0
+                for node in circuit:
+                    if isinstance(node, PNode):
+                        link(node, ruleName, 0)
+                        continue
+                    if isinstance(node, (JoinNode, TestNode, NccNode)):
+                        ceIndex += 1
+                    link(node, ruleName, ceIndex)
+                    if isinstance(node, NccNode):
+                        # the ncc subcircuit is part of the same CE
+                        subNode = node.partner
+                        while subNode is not None and subNode is not node.leftParent:
+                            link(subNode, ruleName, ceIndex)
+                            subNode = subNode.leftParent if not subNode.isLeftRoot() else None
+
+        for nodeUsers in usedBy.values():
+            nodeUsers.sort()
+
+        return usedBy
+
+    def report(self, resource):
+        """
+        Write the profile report to a resource:
+        rules are sorted by rhs time, nodes by time
+        spent in join tests and activations.
+        Only nodes activated at least once are reported
+
+        @param resource: a file-like resource
+        """
+
+        print >> resource, "%-40s %12s %8s %12s"%("Rule", "Activations", "Fires", "RHS time")
+        for (name, stats) in sorted(self.rulesStats().items(),
+                                    key=lambda (name, stats): (-stats["rhs-time"], -stats["fires"], name)):
+            print >> resource, "%-40s %12d %8d %12.6f"%(name, stats["activations"], stats["fires"], stats["rhs-time"])
+
+        print >> resource, ""
+        print >> resource, "%-20s %10s %10s %10s %12s %8s  %s"%("Node", "Right", "Left", "Tests", "Tests time", "Peak", "Used by")
+        for (node, stats, usedBy) in sorted(self.nodesStats(),
+                                            key=lambda (node, stats, usedBy): (-stats["tests-time"],
+                                                                               -(stats["right"] + stats["left"]),
+                                                                               usedBy)):
+            if stats["right"] + stats["left"] == 0:
+                continue
+            print >> resource, "%-20s %10d %10d %10d %12.6f %8d  %s"%(node.__class__.__name__,
+                                                                     stats["right"],
+                                                                     stats["left"],
+                                                                     stats["tests"],
+                                                                     stats["tests-time"],
+                                                                     stats["peak"],
+                                                                     ", ".join(["%s#%d"%(name, ceIndex) if ceIndex > 0 else name
+                                                                                    for (name, ceIndex) in usedBy]))
+
+
+def _counter(stats, key):
+    def makeWrapper(method):
+        def wrapper(*args, **kwargs):
+            stats[key] += 1
+            return method(*args, **kwargs)
+        return wrapper
+    return makeWrapper
+
+def _timer(stats):
+    def makeWrapper(method):
+        def wrapper(*args, **kwargs):
+            stats["tests"] += 1
+            start = time.time()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                stats["tests-time"] += time.time() - start
+        return wrapper
+    return makeWrapper
+
+def _peak(stats, memory):
+    def makeWrapper(method):
+        def wrapper(*args, **kwargs):
+            method(*args, **kwargs)
+            if len(memory._items) > stats["peak"]:
+                stats["peak"] = len(memory._items)
+        return wrapper
+    return makeWrapper
+
+def _rhsTimer(stats):
+    def makeWrapper(method):
+        def wrapper(*args, **kwargs):
+            stats["fires"] += 1
+            start = time.time()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                stats["rhs-time"] += time.time() - start
+        return wrapper
+    return makeWrapper
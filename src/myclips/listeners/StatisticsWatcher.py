@@ -31,7 +31,9 @@ class StatisticsWatcher(EventsManagerListener):
         EventsManagerListener.__init__(self, {
                 EventsManager.E_RULE_FIRED: self.onRuleFired,
                 EventsManager.E_RUN_START: self.onRunStart,
-                EventsManager.E_RUN_STOP: self.onRunStop
+                EventsManager.E_RUN_STOP: self.onRunStop,
+                EventsManager.E_RUN_PAUSE: self.onRunPause,
+                EventsManager.E_RUN_RESUME: self.onRunResume
             })
         
     ######################
@@ -49,4 +51,13 @@ class StatisticsWatcher(EventsManagerListener):
         
     def onRunStop(self, *args, **kwargs):
         total_time = self._stats["buffer"] + ( time.time() - self._stats["timer-start"] )
+        self._stats["buffer"] = 0
         print >> self._resource, "%d rules fired        Run time is %.3f seconds."%(self._stats['rules'], total_time)
+
+    def onRunPause(self, *args, **kwargs):
+        # time between slices of an async run
+        # is not run time
+        self._stats["buffer"] += time.time() - self._stats["timer-start"]
+
+    def onRunResume(self, *args, **kwargs):
+        self._stats["timer-start"] = time.time()
@@ -12,6 +12,7 @@ import unittest
 from genericpath import exists
 from myclips.shell.Interpreter import Interpreter
 from myclips.rete.Network import Network
+from myclips.Settings import Settings
 
 def main():
     '''
@@ -48,6 +49,14 @@ def main():
       -q, --quiet             Minimal output
       -b, --background        Background service
     %(options)s
+    Environment:
+      MYCLIPS_PARSE_CACHE     Directory used to cache parsed constructs (batch/bench)
+      MYCLIPS_PARSER          Parser backend: pyparsing (default) or fast (batch/bench)
+      MYCLIPS_SLOT_SPECIFIC   If 1, modify keeps fact-ids and only updates patterns
+                              that read the changed slots (batch/bench)
+      MYCLIPS_ALPHA_PROCESSES Number of processes used to evaluate alpha tests
+                              of big fact batches (batch/bench)
+    
     Examples:
       %(progName)s                                   - Show this message
       %(progName)s shell                             - run a MyCLIPS shell
@@ -68,7 +77,20 @@ def main():
     if theMode == "shell":
         Shell().loop()
     elif (theMode == "batch" or theMode == "bench") and len(sys.argv) >= 3:
-        i = Interpreter(Network())
+        settings = Settings()
+        if os.environ.has_key("MYCLIPS_PARSE_CACHE"):
+            # cache parsed constructs in this directory
+            settings.setSetting("parser.cacheDir", os.environ["MYCLIPS_PARSE_CACHE"])
+        if os.environ.has_key("MYCLIPS_PARSER"):
+            # use another parser backend
+            settings.setSetting("parser.backend", os.environ["MYCLIPS_PARSER"])
+        if os.environ.get("MYCLIPS_SLOT_SPECIFIC", "0") == "1":
+            # slot-specific modify
+            settings.setSetting("network.modify.slotSpecific", True)
+        if os.environ.has_key("MYCLIPS_ALPHA_PROCESSES"):
+            # evaluate alpha network of big batches in a pool
+            settings.setSetting("network.alpha.processes", int(os.environ["MYCLIPS_ALPHA_PROCESSES"]))
+        i = Interpreter(Network(settings=settings))
         i.evaluate("(batch \"%s\")"%sys.argv[2].strip('"'))
         if theMode == "batch":
             i.evaluate("(run)")
@@ -0,0 +1,1142 @@
+'''
+Created on 17/ott/2026
+
+@author: Francesco Capozzo
+'''
+import re
+import string
+import pyparsing as pp
+import myclips
+import myclips.parser.Types as types
+from myclips.parser.Parser import Parser
+
+
+### LEXER
+
+# same chars sets used by the pyparsing grammar
+_SYMBOL_CHARS = "".join([ c for c in string.printable if c not in string.whitespace and c not in "\"'()&?|<~;" ])
+_VARIABLE_SYMBOL_CHARS = "".join([ c for c in string.printable if c not in string.whitespace and c not in "*\"'()&?|<~;" ])
+_IDENT_CHARS = frozenset(pp.Keyword.DEFAULT_KEYWORD_CHARS)
+
+_WHITESPACES = re.compile(r'[ \n\t\r]*')
+_WHITESPACES_AND_COMMENTS = re.compile(r'(?:[ \n\t\r]|;[^\n]*)*')
+_COMMENT = re.compile(r';.*')
+_SYMBOL = re.compile(r'[%s]+'%re.escape(_SYMBOL_CHARS))
+_VARIABLE_SYMBOL = re.compile(r'[%s][%s]*'%(re.escape(string.letters), re.escape(_VARIABLE_SYMBOL_CHARS)))
+_INTEGER = re.compile(r'[+-]?\d+')
+_FLOAT = re.compile(r'[+-]?\d+(\.\d*)?([eE]-?\d+)?')
+_STRING = re.compile(r'"(?:[^"\\]|(?:\\.))*"', re.MULTILINE | re.DOTALL)
+_ESCAPED_CHAR = re.compile(r'\\(.)')
+_ESCAPED_WHITESPACES = [(r'\t', '\t'), (r'\n', '\n'), (r'\f', '\f'), (r'\r', '\r')]
+
+_PORT_CONSTRUCTS = ["deftemplate", "defglobal", "deffunction"]
+
+
+def _syntaxError(e):
+    '''
+    Convert a parse error found after a `-` (error stop)
+    to a ParseSyntaxException (like pyparsing does)
+    '''
+    if isinstance(e, pp.ParseSyntaxException):
+        return e
+    return pp.ParseSyntaxException(e.pstr, e.loc, e.msg, e.parserElement)
+
+
+def _longer(e1, e2):
+    '''
+    Return the parse error found farther in the string
+    (the first one if both have the same location)
+    '''
+    return e2 if e2.loc > e1.loc else e1
+
+
+class FastElement(pp.ParserElement):
+    '''
+    A pyparsing element backed by a recursive-descent
+    parse method of a FastParser: it can be used
+    everywhere a subparser of the pyparsing grammar
+    is used (combined with other pyparsing elements too)
+    '''
+
+    def __init__(self, name, parseMethod, multipleTokens=False):
+        '''
+        Create a new element
+        @param name: the subparser name
+        @type name: string
+        @param parseMethod: a method (string, location) -> (location, value)
+        @type parseMethod: function
+        @param multipleTokens: the value is a list of tokens
+        @type multipleTokens: boolean
+        '''
+        pp.ParserElement.__init__(self)
+        self._parseMethod = parseMethod
+        self._multipleTokens = multipleTokens
+        self.mayIndexError = False
+        self.setName(name)
+
+    def parseImpl(self, instring, loc, doActions=True):
+        loc, value = self._parseMethod(instring, loc)
+        return loc, (value if self._multipleTokens else [value])
+
+
+class FastParser(Parser):
+    '''
+    CLIPS parser backed by a hand-written lexer and
+    recursive-descent parser (no pyparsing grammar is built).
+
+    It produces the same types and the same errors (type and location)
+    of the pyparsing based Parser. Subparsers are still available
+    through getSParser: they are pyparsing elements, so they can
+    be combined with other pyparsing elements as usual
+    '''
+
+    # subparsers without the comments ignore-expression
+    # in the pyparsing grammar (copies or not linked to the constructs parser)
+    NO_COMMENTS_SUBPARSERS = ['ClipsCommentParser', 'DefFactsNameParser', 'DefFunctionNameParser',
+                              'DefRuleNameParser', 'DefTemplateNameParser', 'ExtendedCLIPSProgramParser',
+                              'ExtendedConstructParser', 'SingleConstraintParser', 'TermParser']
+
+    def _initParsers(self):
+
+        if self._initied:
+            return
+
+        self._initied = True
+
+        self._skipper = (_WHITESPACES_AND_COMMENTS if self._enableComments else _WHITESPACES).match
+
+        # function names matched by the FunctionNameParser only
+        # if they are not variable symbols (longest first)
+        self._systemFunctionsNames = sorted([x for x in self.getModulesManager().currentScope.functions.systemFunctions
+                                                if _VARIABLE_SYMBOL.match(x) is None],
+                                            key=len, reverse=True)
+        self._typesNames = sorted(types.TYPES.keys(), key=len, reverse=True)
+
+        subparsers = {
+            "SymbolParser": self._symbol,
+            "StringParser": self._string,
+            "CommentParser": self._string,
+            "IntegerParser": self._integer,
+            "FloatParser": self._float,
+            "VariableSymbolParser": self._variableSymbol,
+            "NumberParser": self._number,
+            "LexemeParser": self._lexeme,
+            "ConstantParser": self._constant,
+            "SingleFieldVariableParser": self._singleFieldVariable,
+            "MultiFieldVariableParser": self._multiFieldVariable,
+            "GlobalVariableParser": self._globalVariable,
+            "VariableParser": self._variable,
+            "FunctionNameParser": self._functionName,
+            "FunctionCallParser": self._functionCall,
+            "ExpressionParser": self._expression,
+            "RhsExpressionParser": self._rhsExpression,
+            "RhsFieldParser": self._expression,
+            "MultiFieldRhsSlotParser": self._multiFieldRhsSlot,
+            "SingleFieldRhsSlotParser": self._singleFieldRhsSlot,
+            "RhsSlotParser": self._rhsSlot,
+            "OrderedRhsPatternParser": self._orderedRhsPattern,
+            "TemplateRhsPatternParser": self._templateRhsPattern,
+            "RhsPatternParser": self._rhsPattern,
+            "FactDefinitionParser": self._rhsPattern,
+            "ArgumentsGroupParser": self._argumentsGroup,
+            "RhsFunctionCallParser": self._rhsFunctionCall,
+            "ActionParser": self._action,
+            "DefFactsNameParser": self._constructName,
+            "DefFactsConstructParser": self._defFactsConstruct,
+            "RulePropertyParser": self._ruleProperty,
+            "UnnamedSingleFieldVariableParser": self._unnamedSingleFieldVariable,
+            "UnnamedMultiFieldVariableParser": self._unnamedMultiFieldVariable,
+            "TermParser": self._term,
+            "SingleConstraintParser": self._singleConstraint,
+            "ConnectedConstraintParser": self._connectedConstraint,
+            "ConstraintParser": self._constraint,
+            "SingleFieldLhsSlotParser": self._singleFieldLhsSlot,
+            "MultiFieldLhsSlotParser": self._multiFieldLhsSlot,
+            "LhsSlotParser": self._lhsSlot,
+            "OrderedPatternCEParser": self._orderedPatternCE,
+            "TemplatePatternCEParser": self._templatePatternCE,
+            "PatternCEParser": self._patternCE,
+            "AssignedPatternCEParser": self._assignedPatternCE,
+            "NotCEParser": self._notCE,
+            "ExistsCEParser": self._existsCE,
+            "AndCEParser": self._andCE,
+            "OrCEParser": self._orCE,
+            "TestCEParser": self._testCE,
+            "ConditionalElementParser": self._conditionalElement,
+            "DefRuleNameParser": self._constructName,
+            "DefRuleConstructParser": self._defRuleConstruct,
+            "DefaultAttributeParser": self._defaultAttribute,
+            "TypeSpecificationParser": self._typeSpecification,
+            "TypeAttributeParser": self._typeAttribute,
+            "TemplateAttributeParser": self._templateAttribute,
+            "SingleSlotDefinitionParser": self._singleSlotDefinition,
+            "MultiSlotDefinitionParser": self._multiSlotDefinition,
+            "SlotDefinitionParser": self._slotDefinition,
+            "DefTemplateNameParser": self._constructName,
+            "DefTemplateConstructParser": self._defTemplateConstruct,
+            "GlobalAssignmentParser": self._globalAssignment,
+            "DefGlobalModuleParser": self._defGlobalModule,
+            "DefGlobalConstructParser": self._defGlobalConstruct,
+            "PortConstructParser": self._portConstruct,
+            "PortItemParser": self._portItem,
+            "PortSpecificationImportParser": self._portSpecificationImport,
+            "PortSpecificationExportParser": self._portSpecificationExport,
+            "PortSpecificationParser": self._portSpecification,
+            "DefModuleConstructParser": self._defModuleConstruct,
+            "DefFunctionNameParser": self._constructName,
+            "DefFunctionConstructParser": self._defFunctionConstruct,
+            "ClipsCommentParser": self._clipsComment,
+            "ConstructParser": self._construct,
+            "ExtendedConstructParser": self._extendedConstruct,
+        }
+
+        self.subparsers = dict([(k, FastElement(k, v)) for (k, v) in subparsers.items()])
+
+        # subparsers with a list of tokens as result
+        self.subparsers["DeclarationParser"] = FastElement("DeclarationParser", self._declaration, True)
+        self.subparsers["CLIPSProgramParser"] = FastElement("CLIPSProgramParser", self._program, True)
+        self.subparsers["ExtendedCLIPSProgramParser"] = FastElement("ExtendedCLIPSProgramParser", self._extendedProgram, True)
+
+        if self._enableComments:
+            commentsParser = pp.Suppress(pp.Regex(r";.*"))
+            for (k, v) in self.subparsers.items():
+                if k not in self.NO_COMMENTS_SUBPARSERS:
+                    v.ignore(commentsParser)
+
+        for v in self.subparsers.values():
+            v.setDebug(self._debug)
+
+    ### LEXER HELPERS
+
+    def _skipComments(self, s, i):
+        # skip comments only (for tokens without leading whitespaces)
+        if not self._enableComments:
+            return i
+        while True:
+            j = _WHITESPACES.match(s, i).end()
+            if s.startswith(";", j):
+                i = _COMMENT.match(s, j).end()
+            else:
+                return i
+
+    @staticmethod
+    def _keyword(s, i, keyword):
+        # keyword can't be part of a bigger word
+        end = i + len(keyword)
+        return (s.startswith(keyword, i)
+                    and (end >= len(s) or s[end] not in _IDENT_CHARS)
+                    and (i == 0 or s[i - 1] not in _IDENT_CHARS))
+
+    @staticmethod
+    def _oneOf(s, i, words):
+        # words are sorted by length (longest first)
+        for word in words:
+            if s.startswith(word, i):
+                return word
+        return None
+
+    def _expect(self, s, i, literal):
+        # skip and match a literal. Return the location after the literal
+        i = self._skipper(s, i).end()
+        if not s.startswith(literal, i):
+            raise pp.ParseException(s, i, 'Expected "%s"'%literal)
+        return i + len(literal)
+
+    def _expectKeyword(self, s, i, keyword):
+        # match '(' + keyword. Return the location after the keyword
+        if not s.startswith("(", i):
+            raise pp.ParseException(s, i, 'Expected "("')
+        j = self._skipper(s, i + 1).end()
+        if not self._keyword(s, j, keyword):
+            raise pp.ParseException(s, j, 'Expected "%s"'%keyword)
+        return j + len(keyword)
+
+    def _make(self, cls, s, loc, *args, **kargs):
+        # create a type instance, converting types errors
+        # to parse errors (like makeInstance in the pyparsing grammar)
+        try:
+            instance = cls(*args, **kargs)
+        except types.TypeRecoverableInstanceCreationError as e:
+            self._lastParseError = e.message
+            raise pp.ParseException(s, loc, self._lastParseError)
+        except types.TypeInstanceCreationError as e:
+            raise pp.ParseFatalException(s, loc, e.message)
+        except IndexError:
+            # pyparsing converts index errors in parse actions
+            raise pp.ParseException("exception raised in parse action")
+        # need to reset last error on first positive match
+        self._lastParseError = None
+        return instance
+
+    def _zeroOrMore(self, s, i, method):
+        # parse items until the first recoverable error
+        values = []
+        while True:
+            j = self._skipper(s, i).end()
+            try:
+                j, value = method(s, j)
+            except pp.ParseException:
+                return i, values
+            values.append(value)
+            i = j
+
+    def _optionalComment(self, s, i):
+        j = self._skipper(s, i).end()
+        if s.startswith('"', j):
+            try:
+                return self._string(s, j)
+            except pp.ParseException:
+                pass
+        return i, None
+
+    ### BASE PARSERS
+
+    def _symbol(self, s, i):
+        m = _SYMBOL.match(s, i)
+        if m is None:
+            raise pp.ParseException(s, i, "Expected SymbolParser")
+        self._lastParseError = None
+        return m.end(), types.Symbol(m.group())
+
+    def _variableSymbol(self, s, i):
+        m = _VARIABLE_SYMBOL.match(s, i)
+        if m is None:
+            raise pp.ParseException(s, i, "Expected VariableSymbolParser")
+        self._lastParseError = None
+        return m.end(), types.Symbol(m.group())
+
+    def _string(self, s, i):
+        m = _STRING.match(s, i)
+        if m is None:
+            raise pp.ParseException(s, i, "Expected StringParser")
+        content = m.group()[1:-1]
+        if '\\' in content:
+            for (escaped, char) in _ESCAPED_WHITESPACES:
+                content = content.replace(escaped, char)
+            content = _ESCAPED_CHAR.sub(r"\g<1>", content)
+        self._lastParseError = None
+        return m.end(), types.String(content)
+
+    def _integer(self, s, i):
+        m = _INTEGER.match(s, i)
+        if m is None:
+            raise pp.ParseException(s, i, "Expected IntegerParser")
+        self._lastParseError = None
+        return m.end(), types.Integer(m.group())
+
+    def _floatFromMatch(self, m):
+        # try to cast to Integer first, otherwise Float
+        try:
+            value = types.Integer(m.group())
+        except ValueError:
+            value = types.Float(m.group())
+        self._lastParseError = None
+        return m.end(), value
+
+    def _float(self, s, i):
+        m = _FLOAT.match(s, i)
+        if m is None:
+            raise pp.ParseException(s, i, "Expected FloatParser")
+        return self._floatFromMatch(m)
+
+    def _number(self, s, i):
+        # a float match is never shorter than the integer one
+        m = _FLOAT.match(s, i)
+        if m is None:
+            raise pp.ParseException(s, i, "Expected NumberParser")
+        return self._floatFromMatch(m)
+
+    def _lexeme(self, s, i):
+        if s.startswith('"', i) and _STRING.match(s, i) is not None:
+            return self._string(s, i)
+        if _SYMBOL.match(s, i) is not None:
+            return self._symbol(s, i)
+        raise pp.ParseException(s, i, "Expected LexemeParser")
+
+    def _constant(self, s, i):
+        # the longest between number and lexeme (number if same length)
+        if s.startswith('"', i):
+            if _STRING.match(s, i) is not None:
+                return self._string(s, i)
+            raise pp.ParseException(s, i, "Expected ConstantParser")
+        m = _SYMBOL.match(s, i)
+        if m is None:
+            raise pp.ParseException(s, i, "Expected ConstantParser")
+        n = _FLOAT.match(s, i)
+        if n is not None and n.end() == m.end():
+            return self._floatFromMatch(n)
+        self._lastParseError = None
+        return m.end(), types.Symbol(m.group())
+
+    def _singleFieldVariable(self, s, i):
+        if not s.startswith("?", i):
+            raise pp.ParseException(s, i, 'Expected "?"')
+        try:
+            j, name = self._variableSymbol(s, self._skipper(s, i + 1).end())
+        except pp.ParseException, e:
+            raise _syntaxError(e)
+        return j, types.SingleFieldVariable(name)
+
+    def _multiFieldVariable(self, s, i):
+        if not s.startswith("$?", i):
+            raise pp.ParseException(s, i, 'Expected "$?"')
+        try:
+            j, name = self._variableSymbol(s, self._skipper(s, i + 2).end())
+        except pp.ParseException, e:
+            raise _syntaxError(e)
+        return j, types.MultiFieldVariable(name)
+
+    def _globalVariable(self, s, i, ignoreCheck=False):
+        if not s.startswith("?*", i):
+            raise pp.ParseException(s, i, 'Expected "?*"')
+        # no whitespaces allowed between ?*, name and *
+        j = self._skipComments(s, i + 2)
+        try:
+            j, name = self._variableSymbol(s, j)
+        except pp.ParseException, e:
+            raise _syntaxError(e)
+        j = self._skipComments(s, j)
+        if not s.startswith("*", j):
+            raise pp.ParseSyntaxException(s, j, 'Expected "*"')
+        return j + 1, self._make(types.GlobalVariable, s, i,
+                                 content=name, modulesManager=self._modulesManager, ignoreCheck=ignoreCheck)
+
+    def _variable(self, s, i):
+        if s.startswith("$?", i):
+            return self._multiFieldVariable(s, i)
+        elif s.startswith("?*", i):
+            return self._globalVariable(s, i)
+        elif s.startswith("?", i):
+            return self._singleFieldVariable(s, i)
+        raise pp.ParseException(s, i, "Expected VariableParser")
+
+    ### FUNCTION CALLS
+
+    def _functionName(self, s, i):
+        m = _VARIABLE_SYMBOL.match(s, i)
+        if m is not None:
+            self._lastParseError = None
+            return m.end(), types.Symbol(m.group())
+        name = self._oneOf(s, i, self._systemFunctionsNames)
+        if name is None:
+            raise pp.ParseException(s, i, "Expected FunctionNameParser")
+        self._lastParseError = None
+        return i + len(name), types.Symbol(name)
+
+    def _functionCall(self, s, i):
+        if not s.startswith("(", i):
+            raise pp.ParseException(s, i, 'Expected "("')
+        j, funcName = self._functionName(s, self._skipper(s, i + 1).end())
+        j, funcArgs = self._zeroOrMore(s, j, self._expression)
+        j = self._expect(s, j, ")")
+        return j, self._make(types.FunctionCall, s, i,
+                             funcName=funcName, funcArgs=funcArgs, modulesManager=self._modulesManager)
+
+    def _expression(self, s, i):
+        if s.startswith("(", i):
+            try:
+                return self._functionCall(s, i)
+            except pp.ParseException, e:
+                raise pp.ParseException(s, e.loc, "Expected ExpressionParser")
+        elif s.startswith("?", i) or s.startswith("$?", i):
+            return self._variable(s, i)
+        try:
+            return self._constant(s, i)
+        except pp.ParseException:
+            raise pp.ParseException(s, i, "Expected ExpressionParser")
+
+    def _rhsExpression(self, s, i):
+        if s.startswith("(", i):
+            try:
+                return self._rhsFunctionCall(s, i)
+            except pp.ParseException, e:
+                raise pp.ParseException(s, e.loc, "Expected RhsExpressionParser")
+        elif s.startswith("?", i) or s.startswith("$?", i):
+            return self._variable(s, i)
+        try:
+            return self._constant(s, i)
+        except pp.ParseException:
+            raise pp.ParseException(s, i, "Expected RhsExpressionParser")
+
+    def _rhsFunctionArgument(self, s, i):
+        # rhs expression | fact definition | arguments group
+        if s.startswith("(", i):
+            try:
+                return self._rhsFunctionCall(s, i)
+            except pp.ParseException, e:
+                error = e
+            try:
+                return self._rhsPattern(s, i)
+            except pp.ParseException, e:
+                error = _longer(error, e)
+            try:
+                return self._argumentsGroup(s, i)
+            except pp.ParseException, e:
+                raise _longer(error, e)
+        return self._rhsExpression(s, i)
+
+    def _rhsFunctionCall(self, s, i):
+        if not s.startswith("(", i):
+            raise pp.ParseException(s, i, 'Expected "("')
+        j, funcName = self._functionName(s, self._skipper(s, i + 1).end())
+        j, funcArgs = self._zeroOrMore(s, j, self._rhsFunctionArgument)
+        j = self._expect(s, j, ")")
+        return j, self._make(types.FunctionCall, s, i,
+                             funcName=funcName, funcArgs=funcArgs, modulesManager=self._modulesManager)
+
+    def _argumentsGroup(self, s, i):
+        if not s.startswith("(", i):
+            raise pp.ParseException(s, i, 'Expected "("')
+        j, first = self._argumentsGroupField(s, self._skipper(s, i + 1).end())
+        j, others = self._zeroOrMore(s, j, self._argumentsGroupField)
+        j = self._expect(s, j, ")")
+        return j, [first] + others
+
+    def _argumentsGroupField(self, s, i):
+        # expression | nested arguments group
+        if s.startswith("(", i):
+            try:
+                return self._expression(s, i)
+            except pp.ParseException, e:
+                error = e
+            try:
+                return self._argumentsGroup(s, i)
+            except pp.ParseException, e:
+                raise _longer(error, e)
+        return self._expression(s, i)
+
+    def _action(self, s, i):
+        if s.startswith("?", i) or s.startswith("$?", i):
+            return self._variable(s, i)
+        elif s.startswith("(", i):
+            try:
+                return self._rhsFunctionCall(s, i)
+            except pp.ParseException, e:
+                raise pp.ParseException(s, e.loc, "Expected ActionParser")
+        try:
+            return self._constant(s, i)
+        except pp.ParseException:
+            raise pp.ParseException(s, i, "Expected ActionParser")
+
+    ### RHS PATTERNS
+
+    def _slotFields(self, s, i, method):
+        # parse '(' slotName fields... ')'
+        # and return the location, the name, the fields
+        # and the location a single-field slot would fail at (or None)
+        if not s.startswith("(", i):
+            raise pp.ParseException(s, i, 'Expected "("')
+        j, slotName = self._symbol(s, self._skipper(s, i + 1).end())
+        fields = []
+        singleErrorLoc = None
+        while True:
+            k = self._skipper(s, j).end()
+            try:
+                k, field = method(s, k)
+            except pp.ParseException, e:
+                if len(fields) == 0:
+                    singleErrorLoc = e.loc
+                break
+            fields.append(field)
+            j = k
+        k = self._skipper(s, j).end()
+        if not s.startswith(")", k):
+            # pyparsing would have tried the single field slot first
+            raise pp.ParseException(s, max(k, singleErrorLoc), 'Expected ")"')
+        return k + 1, slotName, fields, singleErrorLoc
+
+    def _multiFieldRhsSlot(self, s, i):
+        j, slotName, fields, _ = self._slotFields(s, i, self._expression)
+        return j, self._make(types.MultiFieldRhsSlot, s, i, slotName=slotName, slotValue=fields)
+
+    def _singleFieldRhsSlot(self, s, i):
+        if not s.startswith("(", i):
+            raise pp.ParseException(s, i, 'Expected "("')
+        j, slotName = self._symbol(s, self._skipper(s, i + 1).end())
+        j, field = self._expression(s, self._skipper(s, j).end())
+        j = self._expect(s, j, ")")
+        return j, self._make(types.SingleFieldRhsSlot, s, i, slotName=slotName, slotValue=field)
+
+    def _rhsSlot(self, s, i):
+        # single field slot if only one field
+        # is found, otherwise a multi field one
+        try:
+            j, slotName, fields, _ = self._slotFields(s, i, self._expression)
+        except pp.ParseException, e:
+            raise pp.ParseException(s, e.loc, "Expected RhsSlotParser")
+        if len(fields) == 1:
+            return j, self._make(types.SingleFieldRhsSlot, s, i, slotName=slotName, slotValue=fields[0])
+        return j, self._make(types.MultiFieldRhsSlot, s, i, slotName=slotName, slotValue=fields)
+
+    def _orderedRhsPattern(self, s, i):
+        if not s.startswith("(", i):
+            raise pp.ParseException(s, i, 'Expected "("')
+        j, name = self._symbol(s, self._skipper(s, i + 1).end())
+        j, fields = self._zeroOrMore(s, j, self._expression)
+        j = self._expect(s, j, ")")
+        return j, self._make(types.OrderedRhsPattern, s, i, [name] + fields)
+
+    def _templateRhsPattern(self, s, i):
+        if not s.startswith("(", i):
+            raise pp.ParseException(s, i, 'Expected "("')
+        j, name = self._symbol(s, self._skipper(s, i + 1).end())
+        j, slots = self._zeroOrMore(s, j, self._rhsSlot)
+        j = self._expect(s, j, ")")
+        return j, self._make(types.TemplateRhsPattern, s, i,
+                             templateName=name, templateSlots=slots, modulesManager=self._modulesManager)
+
+    def _rhsPattern(self, s, i):
+        try:
+            return self._templateRhsPattern(s, i)
+        except pp.ParseException, e:
+            error = e
+        try:
+            return self._orderedRhsPattern(s, i)
+        except pp.ParseException, e:
+            error = _longer(error, e)
+            raise pp.ParseException(s, error.loc, "Expected RhsPatternParser")
+
+    ### DEFFACTS
+
+    def _constructName(self, s, i):
+        # symbol: MODULE::NAME changes the current scope
+        j, name = self._symbol(s, i)
+        splitted = name.evaluate().split("::", 2)
+        if len(splitted) == 2:
+            # there is a module definition
+            moduleName, _ = splitted
+            modulesManager = self._modulesManager
+            myclips.logger.debug("Changing scope: %s -> %s", modulesManager.currentScope.moduleName, moduleName)
+            if moduleName != modulesManager.currentScope.moduleName:
+                try:
+                    modulesManager.currentScope.modules.changeCurrentScope(moduleName)
+                except ValueError, e:
+                    raise pp.ParseFatalException(s, i, e.args[0])
+        return j, name
+
+    def _defFactsConstruct(self, s, i):
+        j = self._expectKeyword(s, i, "deffacts")
+        try:
+            j, name = self._constructName(s, self._skipper(s, j).end())
+            j, comment = self._optionalComment(s, j)
+            j, first = self._rhsPattern(s, self._skipper(s, j).end())
+            j, others = self._zeroOrMore(s, j, self._rhsPattern)
+            j = self._expect(s, j, ")")
+        except pp.ParseBaseException, e:
+            raise _syntaxError(e)
+        return j, self._make(types.DefFactsConstruct, s, i,
+                             deffactsName=name, deffactsComment=comment, rhs=[first] + others,
+                             modulesManager=self._modulesManager)
+
+    ### DEFRULE
+
+    def _ruleProperty(self, s, i):
+        if not s.startswith("(", i):
+            raise pp.ParseException(s, i, 'Expected "("')
+        j = self._skipper(s, i + 1).end()
+        if self._keyword(s, j, "salience"):
+            name = "salience"
+            j, value = self._integer(s, self._skipper(s, j + len(name)).end())
+        elif self._keyword(s, j, "auto-focus"):
+            name = "auto-focus"
+            j, value = self._symbol(s, self._skipper(s, j + len(name)).end())
+        else:
+            raise pp.ParseException(s, j, "Expected RulePropertyParser")
+        j = self._expect(s, j, ")")
+        return j, self._make(types.RuleProperty, s, i, propertyName=name, propertyValue=value)
+
+    def _declaration(self, s, i):
+        j = self._expectKeyword(s, i, "declare")
+        j, first = self._ruleProperty(s, self._skipper(s, j).end())
+        j, others = self._zeroOrMore(s, j, self._ruleProperty)
+        j = self._expect(s, j, ")")
+        return j, [first] + others
+
+    def _unnamedSingleFieldVariable(self, s, i):
+        if not self._keyword(s, i, "?"):
+            raise pp.ParseException(s, i, 'Expected "?"')
+        self._lastParseError = None
+        return i + 1, types.UnnamedSingleFieldVariable("?")
+
+    def _unnamedMultiFieldVariable(self, s, i):
+        if not self._keyword(s, i, "$?"):
+            raise pp.ParseException(s, i, 'Expected "$?"')
+        self._lastParseError = None
+        return i + 2, types.UnnamedMultiFieldVariable("$?")
+
+    def _term(self, s, i):
+        if s.startswith(":", i) or s.startswith("=", i):
+            try:
+                return self._functionCall(s, self._skipper(s, i + 1).end())
+            except pp.ParseBaseException, e:
+                raise _syntaxError(e)
+        elif s.startswith("?", i):
+            return self._singleFieldVariable(s, i)
+        elif s.startswith("$?", i):
+            return self._multiFieldVariable(s, i)
+        try:
+            return self._constant(s, i)
+        except pp.ParseException:
+            raise pp.ParseException(s, i, "Expected TermParser")
+
+    def _singleConstraint(self, s, i):
+        if s.startswith("~", i):
+            j, term = self._term(s, self._skipper(s, i + 1).end())
+            self._lastParseError = None
+            return j, types.NegativeTerm(term, "~")
+        j, term = self._term(s, i)
+        self._lastParseError = None
+        return j, types.PositiveTerm(term)
+
+    def _connectedConstraint(self, s, i):
+        j, constraint = self._singleConstraint(s, i)
+        k = self._skipper(s, j).end()
+        connective = s[k:k + 1]
+        if connective == "|" or connective == "&":
+            try:
+                k, connected = self._connectedConstraint(s, self._skipper(s, k + 1).end())
+            except pp.ParseException:
+                # connected constraint is optional
+                pass
+            else:
+                self._lastParseError = None
+                return k, types.ConnectedConstraint(constraint, [connective, connected])
+        self._lastParseError = None
+        return j, types.Constraint(constraint)
+
+    def _constraint(self, s, i):
+        if self._keyword(s, i, "?"):
+            return self._unnamedSingleFieldVariable(s, i)
+        elif self._keyword(s, i, "$?"):
+            return self._unnamedMultiFieldVariable(s, i)
+        try:
+            return self._connectedConstraint(s, i)
+        except pp.ParseException, e:
+            raise pp.ParseException(s, e.loc, "Expected ConstraintParser")
+
+    def _singleFieldLhsSlot(self, s, i):
+        if not s.startswith("(", i):
+            raise pp.ParseException(s, i, 'Expected "("')
+        j, slotName = self._symbol(s, self._skipper(s, i + 1).end())
+        j, constraint = self._constraint(s, self._skipper(s, j).end())
+        j = self._expect(s, j, ")")
+        return j, self._make(types.SingleFieldLhsSlot, s, i, slotName=slotName, slotValue=constraint)
+
+    def _multiFieldLhsSlot(self, s, i):
+        j, slotName, constraints, _ = self._slotFields(s, i, self._constraint)
+        return j, self._make(types.MultiFieldLhsSlot, s, i, slotName=slotName, slotValue=constraints)
+
+    def _lhsSlot(self, s, i):
+        # single field slot if only one constraint
+        # is found, otherwise a multi field one
+        try:
+            j, slotName, constraints, _ = self._slotFields(s, i, self._constraint)
+        except pp.ParseException, e:
+            raise pp.ParseException(s, e.loc, "Expected LhsSlotParser")
+        if len(constraints) == 1:
+            return j, self._make(types.SingleFieldLhsSlot, s, i, slotName=slotName, slotValue=constraints[0])
+        return j, self._make(types.MultiFieldLhsSlot, s, i, slotName=slotName, slotValue=constraints)
+
+    def _orderedPatternCE(self, s, i):
+        if not s.startswith("(", i):
+            raise pp.ParseException(s, i, 'Expected "("')
+        j, name = self._symbol(s, self._skipper(s, i + 1).end())
+        j, constraints = self._zeroOrMore(s, j, self._constraint)
+        j = self._expect(s, j, ")")
+        return j, self._make(types.OrderedPatternCE, s, i,
+                             constraints=[name] + constraints, modulesManager=self._modulesManager)
+
+    def _templatePatternCE(self, s, i):
+        if not s.startswith("(", i):
+            raise pp.ParseException(s, i, 'Expected "("')
+        j, name = self._symbol(s, self._skipper(s, i + 1).end())
+        j, slots = self._zeroOrMore(s, j, self._lhsSlot)
+        j = self._expect(s, j, ")")
+        return j, self._make(types.TemplatePatternCE, s, i,
+                             templateName=name, templateSlots=slots, modulesManager=self._modulesManager)
+
+    def _patternCE(self, s, i):
+        try:
+            return self._templatePatternCE(s, i)
+        except pp.ParseException, e:
+            error = e
+        try:
+            return self._orderedPatternCE(s, i)
+        except pp.ParseException, e:
+            error = _longer(error, e)
+            raise pp.ParseException(s, error.loc, "Expected PatternCEParser")
+
+    def _assignedPatternCE(self, s, i):
+        j, variable = self._singleFieldVariable(s, i)
+        try:
+            j = self._expect(s, j, "<-")
+            j, pattern = self._patternCE(s, self._skipper(s, j).end())
+        except pp.ParseBaseException, e:
+            raise _syntaxError(e)
+        return j, self._make(types.AssignedPatternCE, s, i, variable=variable, pattern=pattern)
+
+    def _innerCE(self, s, i, keyword, cls):
+        # '(' keyword CE ')'
+        j = self._expectKeyword(s, i, keyword)
+        try:
+            j, pattern = self._conditionalElement(s, self._skipper(s, j).end())
+            j = self._expect(s, j, ")")
+        except pp.ParseBaseException, e:
+            raise _syntaxError(e)
+        return j, self._make(cls, s, i, pattern)
+
+    def _innerCEs(self, s, i, keyword, cls):
+        # '(' keyword CE+ ')'
+        j = self._expectKeyword(s, i, keyword)
+        try:
+            j, first = self._conditionalElement(s, self._skipper(s, j).end())
+            j, others = self._zeroOrMore(s, j, self._conditionalElement)
+            j = self._expect(s, j, ")")
+        except pp.ParseBaseException, e:
+            raise _syntaxError(e)
+        return j, self._make(cls, s, i, [first] + others)
+
+    def _notCE(self, s, i):
+        return self._innerCE(s, i, "not", types.NotPatternCE)
+
+    def _existsCE(self, s, i):
+        return self._innerCE(s, i, "exists", types.ExistsPatternCE)
+
+    def _andCE(self, s, i):
+        return self._innerCEs(s, i, "and", types.AndPatternCE)
+
+    def _orCE(self, s, i):
+        return self._innerCEs(s, i, "or", types.OrPatternCE)
+
+    def _testCE(self, s, i):
+        j = self._expectKeyword(s, i, "test")
+        try:
+            j, function = self._functionCall(s, self._skipper(s, j).end())
+            j = self._expect(s, j, ")")
+        except pp.ParseBaseException, e:
+            raise _syntaxError(e)
+        return j, self._make(types.TestPatternCE, s, i, function)
+
+    # keywords are checked before patterns,
+    # or they will be parsed as template names
+    _CE_KEYWORDS = [("not", _notCE),
+                    ("and", _andCE),
+                    ("test", _testCE),
+                    ("or", _orCE),
+                    ("exists", _existsCE)]
+
+    def _conditionalElement(self, s, i):
+        if s.startswith("(", i):
+            j = self._skipper(s, i + 1).end()
+            for (keyword, method) in self._CE_KEYWORDS:
+                if self._keyword(s, j, keyword):
+                    return method(self, s, i)
+            try:
+                return self._patternCE(s, i)
+            except pp.ParseException, e:
+                raise pp.ParseException(s, max(e.loc, j), "Expected ConditionalElementParser")
+        elif s.startswith("?", i):
+            return self._assignedPatternCE(s, i)
+        raise pp.ParseException(s, i, "Expected ConditionalElementParser")
+
+    def _defRuleConstruct(self, s, i):
+        j = self._expectKeyword(s, i, "defrule")
+        try:
+            j, name = self._constructName(s, self._skipper(s, j).end())
+            j, comment = self._optionalComment(s, j)
+            try:
+                j, declaration = self._declaration(s, self._skipper(s, j).end())
+            except pp.ParseException:
+                declaration = None
+            j, lhs = self._zeroOrMore(s, j, self._conditionalElement)
+            j = self._expect(s, j, "=>")
+            j, rhs = self._zeroOrMore(s, j, self._action)
+            j = self._expect(s, j, ")")
+        except pp.ParseBaseException, e:
+            raise _syntaxError(e)
+        return j, self._make(types.DefRuleConstruct, s, i,
+                             defruleName=name, defruleComment=comment, defruleDeclaration=declaration,
+                             lhs=lhs, rhs=rhs, modulesManager=self._modulesManager)
+
+    ### DEFTEMPLATE
+
+    def _defaultAttribute(self, s, i):
+        j = self._expectKeyword(s, i, "default")
+        try:
+            j = self._skipper(s, j).end()
+            if self._keyword(s, j, "?DERIVE"):
+                j, value = j + 7, "?DERIVE"
+            elif self._keyword(s, j, "?NONE"):
+                j, value = j + 5, "?NONE"
+            else:
+                j, value = self._expression(s, j)
+            j = self._expect(s, j, ")")
+        except pp.ParseBaseException, e:
+            raise _syntaxError(e)
+        return j, self._make(types.DefaultAttribute, s, i, value)
+
+    def _typeSpecification(self, s, i):
+        typeName = self._oneOf(s, i, self._typesNames)
+        if typeName is None:
+            raise pp.ParseException(s, i, "Expected TypeSpecificationParser")
+        typesNames = [typeName]
+        i += len(typeName)
+        while True:
+            j = self._skipper(s, i).end()
+            typeName = self._oneOf(s, j, self._typesNames)
+            if typeName is None:
+                return i, typesNames
+            typesNames.append(typeName)
+            i = j + len(typeName)
+
+    def _typeAttribute(self, s, i):
+        j = self._expectKeyword(s, i, "type")
+        try:
+            j, typesNames = self._typeSpecification(s, self._skipper(s, j).end())
+            j = self._expect(s, j, ")")
+        except pp.ParseBaseException, e:
+            raise _syntaxError(e)
+        return j, self._make(types.TypeAttribute, s, i, typesNames)
+
+    def _templateAttribute(self, s, i):
+        if s.startswith("(", i):
+            j = self._skipper(s, i + 1).end()
+            if self._keyword(s, j, "default"):
+                return self._defaultAttribute(s, i)
+            elif self._keyword(s, j, "type"):
+                return self._typeAttribute(s, i)
+            raise pp.ParseException(s, j, "Expected TemplateAttributeParser")
+        raise pp.ParseException(s, i, "Expected TemplateAttributeParser")
+
+    def _slot(self, s, i, keyword, cls):
+        j = self._expectKeyword(s, i, keyword)
+        try:
+            j, slotName = self._symbol(s, self._skipper(s, j).end())
+            j, attributes = self._zeroOrMore(s, j, self._templateAttribute)
+            j = self._expect(s, j, ")")
+        except pp.ParseBaseException, e:
+            raise _syntaxError(e)
+        return j, self._make(cls, s, i, slotName=slotName, attributes=attributes)
+
+    def _singleSlotDefinition(self, s, i):
+        return self._slot(s, i, "slot", types.SingleSlotDefinition)
+
+    def _multiSlotDefinition(self, s, i):
+        return self._slot(s, i, "multislot", types.MultiSlotDefinition)
+
+    def _slotDefinition(self, s, i):
+        if s.startswith("(", i):
+            j = self._skipper(s, i + 1).end()
+            if self._keyword(s, j, "multislot"):
+                return self._multiSlotDefinition(s, i)
+            elif self._keyword(s, j, "slot"):
+                return self._singleSlotDefinition(s, i)
+            raise pp.ParseException(s, j, "Expected SlotDefinitionParser")
+        raise pp.ParseException(s, i, "Expected SlotDefinitionParser")
+
+    def _defTemplateConstruct(self, s, i):
+        j = self._expectKeyword(s, i, "deftemplate")
+        try:
+            j, name = self._constructName(s, self._skipper(s, j).end())
+            j, comment = self._optionalComment(s, j)
+            j, slots = self._zeroOrMore(s, j, self._slotDefinition)
+            j = self._expect(s, j, ")")
+        except pp.ParseBaseException, e:
+            raise _syntaxError(e)
+        return j, self._make(types.DefTemplateConstruct, s, i,
+                             templateName=name, templateComment=comment, slots=slots,
+                             modulesManager=self._modulesManager)
+
+    ### DEFGLOBAL
+
+    def _globalAssignment(self, s, i):
+        j, variable = self._globalVariable(s, i, ignoreCheck=True)
+        j = self._expect(s, j, "=")
+        j, value = self._expression(s, self._skipper(s, j).end())
+        return j, self._make(types.GlobalAssignment, s, i, variable=variable, value=value)
+
+    def _defGlobalModule(self, s, i):
+        j, moduleName = self._symbol(s, i)
+        modulesManager = self._modulesManager
+        myclips.logger.debug("Changing scope: %s -> %s", modulesManager.currentScope.moduleName, moduleName.evaluate())
+        if moduleName.evaluate() != modulesManager.currentScope.moduleName:
+            try:
+                modulesManager.currentScope.modules.changeCurrentScope(moduleName.evaluate())
+            except ValueError, e:
+                raise pp.ParseFatalException(s, i, e.args[0])
+        return j, moduleName
+
+    def _defGlobalConstruct(self, s, i):
+        j = self._expectKeyword(s, i, "defglobal")
+        try:
+            k = self._skipper(s, j).end()
+            if _SYMBOL.match(s, k) is not None:
+                j, moduleName = self._defGlobalModule(s, k)
+            else:
+                moduleName = None
+            j, assignments = self._zeroOrMore(s, j, self._globalAssignment)
+            j = self._expect(s, j, ")")
+        except pp.ParseBaseException, e:
+            raise _syntaxError(e)
+        return j, self._make(types.DefGlobalConstruct, s, i,
+                             assignments=assignments, moduleName=moduleName,
+                             modulesManager=self._modulesManager)
+
+    ### DEFMODULE
+
+    def _portConstruct(self, s, i):
+        construct = self._oneOf(s, i, _PORT_CONSTRUCTS)
+        if construct is None:
+            raise pp.ParseException(s, i, "Expected PortConstructParser")
+        return i + len(construct), self._make(types.Symbol, s, i, construct)
+
+    def _portItem(self, s, i):
+        if self._keyword(s, i, "?ALL"):
+            j, content = i + 4, "?ALL"
+        elif self._keyword(s, i, "?NONE"):
+            j, content = i + 5, "?NONE"
+        else:
+            try:
+                j, construct = self._portConstruct(s, i)
+            except pp.ParseException:
+                raise pp.ParseException(s, i, "Expected PortItemParser")
+            try:
+                j = self._skipper(s, j).end()
+                if self._keyword(s, j, "?ALL"):
+                    j, names = j + 4, "?ALL"
+                elif self._keyword(s, j, "?NONE"):
+                    j, names = j + 5, "?NONE"
+                else:
+                    j, first = self._symbol(s, j)
+                    j, others = self._zeroOrMore(s, j, self._symbol)
+                    names = [first] + others
+            except pp.ParseBaseException, e:
+                raise _syntaxError(e)
+            content = [construct, names]
+        return j, self._make(types.PortItem, s, i, content)
+
+    def _portSpecificationImport(self, s, i):
+        j = self._expectKeyword(s, i, "import")
+        try:
+            j, moduleName = self._symbol(s, self._skipper(s, j).end())
+            j, item = self._portItem(s, self._skipper(s, j).end())
+            j = self._expect(s, j, ")")
+        except pp.ParseBaseException, e:
+            raise _syntaxError(e)
+        return j, self._make(types.ImportSpecification, s, i,
+                             moduleName=moduleName, item=item, modulesManager=self._modulesManager)
+
+    def _portSpecificationExport(self, s, i):
+        j = self._expectKeyword(s, i, "export")
+        try:
+            j, item = self._portItem(s, self._skipper(s, j).end())
+            j = self._expect(s, j, ")")
+        except pp.ParseBaseException, e:
+            raise _syntaxError(e)
+        return j, self._make(types.ExportSpecification, s, i, item)
+
+    def _portSpecification(self, s, i):
+        if s.startswith("(", i):
+            j = self._skipper(s, i + 1).end()
+            if self._keyword(s, j, "import"):
+                return self._portSpecificationImport(s, i)
+            elif self._keyword(s, j, "export"):
+                return self._portSpecificationExport(s, i)
+            raise pp.ParseException(s, j, "Expected PortSpecificationParser")
+        raise pp.ParseException(s, i, "Expected PortSpecificationParser")
+
+    def _defModuleConstruct(self, s, i):
+        j = self._expectKeyword(s, i, "defmodule")
+        try:
+            j, moduleName = self._symbol(s, self._skipper(s, j).end())
+            j, comment = self._optionalComment(s, j)
+            j, specifications = self._zeroOrMore(s, j, self._portSpecification)
+            j = self._expect(s, j, ")")
+        except pp.ParseBaseException, e:
+            raise _syntaxError(e)
+        return j, self._make(types.DefModuleConstruct, s, i,
+                             specifications=specifications, comment=comment, moduleName=moduleName,
+                             modulesManager=self._modulesManager)
+
+    ### DEFFUNCTION
+
+    def _defFunctionConstruct(self, s, i):
+        j = self._expectKeyword(s, i, "deffunction")
+        try:
+            j, name = self._constructName(s, self._skipper(s, j).end())
+            j, comment = self._optionalComment(s, j)
+            j = self._expect(s, j, "(")
+            j, params = self._zeroOrMore(s, j, self._singleFieldVariable)
+            k = self._skipper(s, j).end()
+            if s.startswith("$?", k):
+                j, param = self._multiFieldVariable(s, k)
+                params.append(param)
+            j = self._expect(s, j, ")")
+            j, actions = self._zeroOrMore(s, j, self._action)
+            j = self._expect(s, j, ")")
+        except pp.ParseBaseException, e:
+            raise _syntaxError(e)
+        return j, self._make(types.DefFunctionConstruct, s, i,
+                             functionName=name, comment=comment, params=params, actions=actions,
+                             modulesManager=self._modulesManager)
+
+    ### HIGH-LEVEL PARSERS
+
+    def _clipsComment(self, s, i):
+        m = _COMMENT.match(s, i)
+        if m is None:
+            raise pp.ParseException(s, i, "Expected ClipsCommentParser")
+        return m.end(), m.group()
+
+    _CONSTRUCT_KEYWORDS = [("deffacts", _defFactsConstruct),
+                           ("defglobal", _defGlobalConstruct),
+                           ("defrule", _defRuleConstruct),
+                           ("deftemplate", _defTemplateConstruct),
+                           ("deffunction", _defFunctionConstruct),
+                           ("defmodule", _defModuleConstruct)]
+
+    def _construct(self, s, i):
+        if s.startswith("(", i):
+            j = self._skipper(s, i + 1).end()
+            for (keyword, method) in self._CONSTRUCT_KEYWORDS:
+                if self._keyword(s, j, keyword):
+                    return method(self, s, i)
+            raise pp.ParseException(s, j, "Expected ConstructParser")
+        elif not self._enableComments and s.startswith(";", i):
+            # comments are parsed as constructs without a value:
+            # the pyparsing grammar fails to forward them
+            raise pp.ParseException("exception raised in parse action")
+        raise pp.ParseException(s, i, "Expected ConstructParser")
+
+    def _extendedConstruct(self, s, i):
+        # constant | global variable | construct | function call
+        # (all of them skip comments)
+        i = self._skipper(s, i).end()
+        if s.startswith("(", i):
+            try:
+                return self._construct(s, i)
+            except pp.ParseException, e:
+                error = e
+            try:
+                return self._rhsFunctionCall(s, i)
+            except pp.ParseException, e:
+                error = _longer(error, e)
+                raise pp.ParseException(s, error.loc, "Expected ExtendedConstructParser")
+        elif s.startswith("?*", i):
+            return self._globalVariable(s, i)
+        try:
+            return self._constant(s, i)
+        except pp.ParseException:
+            raise pp.ParseException(s, i, "Expected ExtendedConstructParser")
+
+    def _oneOrMore(self, s, i, method):
+        j, first = method(s, i)
+        j, others = self._zeroOrMore(s, j, method)
+        return j, [first] + others
+
+    def _program(self, s, i):
+        return self._oneOrMore(s, i, self._construct)
+
+    def _extendedProgram(self, s, i):
+        return self._oneOrMore(s, i, self._extendedConstruct)
+
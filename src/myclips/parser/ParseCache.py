@@ -0,0 +1,191 @@
+'''
+Created on 17/ott/2026
+
+@author: Francesco Capozzo
+'''
+import os
+import re
+import hashlib
+import tempfile
+import cPickle as pickle
+import cStringIO
+import myclips
+from myclips.parser.Parser import Parser
+from myclips.Scope import Scope
+from myclips.ModulesManager import ModulesManager
+from myclips.FunctionsManager import FunctionDefinition
+from myclips.TemplatesManager import TemplateDefinition
+
+class ParseCache(object):
+    '''
+    On-disk cache of parsed constructs for a program text.
+
+    Cache files are keyed by the hash of the text and
+    the grammar version. Inside a file, constructs are stored
+    by the hash of the construct source and the current module name
+    (at parse time). Only defrule and deffacts constructs are
+    cached: other constructs change the modules manager status
+    while they are parsed, so they are always parsed again.
+
+    Parsed types are linked to scopes, templates and
+    functions definitions: they are stored by name and
+    linked again to the current definitions when the construct is
+    loaded. If a definition is missing or changed, the cached construct
+    is ignored and the construct is parsed again (so errors
+    are still reported by the parser)
+    '''
+
+    CACHEABLE = re.compile(r'^\(\s*(defrule|deffacts)\s+([^\s()";]+)')
+
+    def __init__(self, cacheDir, text):
+        '''
+        Create the cache for a program text, using
+        cacheDir as storage for the cache file
+
+        @param cacheDir: a directory path
+        @type cacheDir: string
+        @param text: the program text
+        @type text: string
+        '''
+        self._cacheDir = cacheDir
+        self._path = os.path.join(cacheDir, hashlib.sha1("%s\n%s"%(Parser.GRAMMAR_VERSION, text)).hexdigest() + ".pcache")
+        self._entries = {}
+        self._changed = False
+        self._signatures = {}
+        '''definition => signature (signatures are computed once for each definition)'''
+
+        try:
+            with open(self._path, 'rb') as cacheFile:
+                self._entries = pickle.load(cacheFile)
+        except Exception:
+            # no cache file (or an unreadable one)
+            self._entries = {}
+
+    def get(self, chunk, modulesManager):
+        '''
+        Get the parsed constructs for the chunk
+        or None if it is not in the cache
+
+        @param chunk: the construct source
+        @type chunk: string
+        @param modulesManager: the modules manager used by the parser
+        @type modulesManager: ModulesManager
+        @rtype: list|None
+        '''
+        try:
+            data = self._entries[self._key(chunk, modulesManager)]
+        except KeyError:
+            return None
+
+        unpickler = pickle.Unpickler(cStringIO.StringIO(data))
+        unpickler.persistent_load = lambda pid: self._resolve(pid, modulesManager)
+        try:
+            return unpickler.load()
+        except Exception, e:
+            # definitions changed. Parse it again
+            myclips.logger.debug("Cached construct ignored: %s", e)
+            return None
+
+    def put(self, chunk, parsed, modulesManager):
+        '''
+        Store the parsed constructs for the chunk
+        (if the chunk is cacheable)
+
+        @param chunk: the construct source
+        @type chunk: string
+        @param parsed: the parsed constructs
+        @type parsed: list
+        @param modulesManager: the modules manager used by the parser
+        @type modulesManager: ModulesManager
+        '''
+        match = self.CACHEABLE.match(chunk)
+        if match is None or "::" in match.group(2) or "?*" in chunk:
+            # module changes and global variables
+            # checks are done while parsing
+            return
+
+        data = cStringIO.StringIO()
+        pickler = pickle.Pickler(data, pickle.HIGHEST_PROTOCOL)
+        pickler.persistent_id = self._reference
+        try:
+            pickler.dump(parsed)
+        except Exception, e:
+            myclips.logger.debug("Construct not cached: %s", e)
+            return
+
+        self._entries[self._key(chunk, modulesManager)] = data.getvalue()
+        self._changed = True
+
+    def save(self):
+        '''
+        Write the cache file (if new constructs were added)
+        '''
+        if not self._changed:
+            return
+
+        try:
+            if not os.path.isdir(self._cacheDir):
+                os.makedirs(self._cacheDir)
+            # write a temp file and move it, so
+            # a broken cache file is never read
+            fd, tmpPath = tempfile.mkstemp(dir=self._cacheDir)
+            with os.fdopen(fd, 'wb') as cacheFile:
+                pickle.dump(self._entries, cacheFile, pickle.HIGHEST_PROTOCOL)
+            os.rename(tmpPath, self._path)
+            self._changed = False
+        except (IOError, OSError), e:
+            myclips.logger.warning("Unable to write the parse cache %s: %s", self._path, e)
+
+    def _key(self, chunk, modulesManager):
+        return hashlib.sha1("%s\n%s"%(modulesManager.currentScope.moduleName, chunk)).digest()
+
+    def _reference(self, obj):
+        # store definitions by name
+        if isinstance(obj, Scope):
+            return ("scope", obj.moduleName)
+        elif isinstance(obj, ModulesManager):
+            return ("modules",)
+        elif isinstance(obj, FunctionDefinition):
+            return ("function", obj.name, self._functionSignature(obj))
+        elif isinstance(obj, TemplateDefinition):
+            return ("template", obj.moduleName, obj.name, self._templateSignature(obj))
+        return None
+
+    def _resolve(self, pid, modulesManager):
+        # link definitions stored by name
+        # (raise an exception if missing or changed)
+        if pid[0] == "scope":
+            return modulesManager.getScope(pid[1])
+        elif pid[0] == "modules":
+            return modulesManager
+        elif pid[0] == "function":
+            definition = modulesManager.currentScope.functions.getDefinition(pid[1])
+            if self._functionSignature(definition) != pid[2]:
+                raise pickle.UnpicklingError("Function %s changed"%pid[1])
+            return definition
+        elif pid[0] == "template":
+            definition = modulesManager.currentScope.templates.getDefinition(pid[2])
+            if definition.moduleName != pid[1] or self._templateSignature(definition) != pid[3]:
+                raise pickle.UnpicklingError("Template %s changed"%pid[2])
+            return definition
+        raise pickle.UnpicklingError("Unknown reference: %s"%str(pid))
+
+    def _functionSignature(self, definition):
+        try:
+            return self._signatures[id(definition)][1]
+        except KeyError:
+            signature = hashlib.md5(repr([(c.__class__.__name__, sorted(c.__dict__.items())) 
+                                            for c in definition.constraints])).digest()
+            # keep a reference to the definition, so the id is not reused
+            self._signatures[id(definition)] = (definition, signature)
+            return signature
+
+    def _templateSignature(self, definition):
+        try:
+            return self._signatures[id(definition)][1]
+        except KeyError:
+            signature = hashlib.md5(repr(sorted([(slotName, slot.getSlotType(), sorted([(a.__class__.__name__, sorted(a.__dict__.items()))
+                                                                                        for a in slot.getSlotAttributes()]))
+                                                    for (slotName, slot) in definition.slots.items()]))).digest()
+            self._signatures[id(definition)] = (definition, signature)
+            return signature
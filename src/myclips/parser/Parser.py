@@ -9,6 +9,9 @@ import myclips
 
 class Parser(object):
     
+    GRAMMAR_VERSION = "1"
+    '''version of the grammar: change it when the parsed types produced change'''
+    
     def __init__(self, debug=False, enableComments=True, enableDirectives=True, modulesManager=None):
         
         self.subparsers = {}
@@ -295,7 +298,11 @@ class Parser(object):
 
         self.subparsers["FactDefinitionParser"] = self._sb("RhsPatternParser").copy()
         
-        self.subparsers["ArgumentsGroupParser"] = (LPAR + pp.Group( pp.OneOrMore(self._sb("RhsFieldParser")) ) + RPAR)\
+        # groups could be nested (ex: fact-set templates
+        # in fact-set query functions)
+        self.subparsers["ArgumentsGroupParser"] = pp.Forward()
+        self.subparsers["ArgumentsGroupParser"] << (LPAR + pp.Group( pp.OneOrMore(self._sb("RhsFieldParser")
+                                                                               | self._sb("ArgumentsGroupParser")) ) + RPAR)\
                 .setParseAction(forwardParsed())
         
         self.subparsers["RhsFunctionCallParser"] << (LPAR + self._sb("FunctionNameParser") 
@@ -700,10 +707,12 @@ class Parser(object):
         self.subparsers["CLIPSProgramParser"] = pp.OneOrMore( self.getSParser("ConstructParser") )\
                 .setParseAction(forwardParsed())
         
-        self.subparsers['ExtendedCLIPSProgramParser'] = pp.OneOrMore(self._sb('ConstantParser')
-                                                                        | self._sb('GlobalVariableParser')
-                                                                        | self._sb('ConstructParser')
-                                                                        | self._sb('RhsFunctionCallParser'))\
+        self.subparsers['ExtendedConstructParser'] = (self._sb('ConstantParser')
+                                                        | self._sb('GlobalVariableParser')
+                                                        | self._sb('ConstructParser')
+                                                        | self._sb('RhsFunctionCallParser'))
+        
+        self.subparsers['ExtendedCLIPSProgramParser'] = pp.OneOrMore(self._sb('ExtendedConstructParser'))\
                 .setParseAction(forwardParsed())
 
 
@@ -740,6 +749,126 @@ class Parser(object):
             else:
                 raise
     
+    def iterParse(self, text, extended=False, cache=None):
+        """
+        Parse a program one construct at a time: every construct
+        is returned as soon as it is parsed, so it can be compiled
+        before the next one is parsed (like parse, but memory and
+        time to the first construct don't depend on the text length)
+        
+        @param text: the program text
+        @type text: string
+        @param extended: allow constants, variables and function calls between constructs
+        @type extended: boolean
+        @param cache: a cache of parsed constructs for this text (optional)
+        @type cache: L{myclips.parser.ParseCache.ParseCache}
+        @return: a generator of parsed constructs
+        @raise pp.ParseBaseException: on parse errors. Error location
+            is relative to the whole text
+        """
+        
+        parserName = 'ConstructParser' if not extended else 'ExtendedConstructParser'
+        
+        for (start, end) in self.splitProgram(text):
+            chunk = text[start:end]
+            
+            parsed = cache.get(chunk, self._modulesManager) if cache is not None else None
+            
+            if parsed is None:
+                try:
+                    parsed = [x for x 
+                                in self.getSParser(parserName).parseString(chunk, True).asList()
+                                    if not isinstance(x, (str, unicode))]
+                except pp.ParseBaseException, e:
+                    # report the error location in the whole text
+                    msg = e.msg
+                    if self._lastParseError != None and e.msg != self._lastParseError:
+                        msg = e.msg + ". Possible cause: " + self._lastParseError
+                    raise e.__class__(text, start + e.loc, msg, e.parserElement)
+                
+                if cache is not None:
+                    cache.put(chunk, parsed, self._modulesManager)
+            
+            for construct in parsed:
+                yield construct
+        
+    @staticmethod
+    def splitProgram(text):
+        """
+        Find the bounds of all top-level items (constructs, function calls, atoms)
+        in a program, skipping comments and whitespaces between them.
+        Strings and comments are skipped while looking for the closing
+        parenthesis. Unbalanced items are returned as they are: the grammar
+        will report the error
+        
+        @param text: the program text
+        @type text: string
+        @return: a generator of (start, end) tuples
+        """
+        
+        i = 0
+        length = len(text)
+        while i < length:
+            c = text[i]
+            if c.isspace():
+                i += 1
+            elif c == ';':
+                # comment: skip to the end of line
+                i = Parser._skipComment(text, i)
+            elif c == '(':
+                start = i
+                depth = 0
+                while i < length:
+                    c = text[i]
+                    if c == '"':
+                        i = Parser._skipString(text, i)
+                        continue
+                    elif c == ';':
+                        i = Parser._skipComment(text, i)
+                        continue
+                    elif c == '(':
+                        depth += 1
+                    elif c == ')':
+                        depth -= 1
+                        if depth == 0:
+                            i += 1
+                            break
+                    i += 1
+                yield (start, i)
+            elif c == '"':
+                start = i
+                i = Parser._skipString(text, i)
+                yield (start, i)
+            elif c == ')':
+                # unbalanced parenthesis
+                yield (i, i + 1)
+                i += 1
+            else:
+                # an atom
+                start = i
+                while i < length and not text[i].isspace() and text[i] not in '();"':
+                    i += 1
+                yield (start, i)
+    
+    @staticmethod
+    def _skipComment(text, i):
+        end = text.find("\n", i)
+        return end if end != -1 else len(text)
+    
+    @staticmethod
+    def _skipString(text, i):
+        # i is the opening quote position
+        i += 1
+        length = len(text)
+        while i < length:
+            if text[i] == '\\':
+                i += 2
+            elif text[i] == '"':
+                return i + 1
+            else:
+                i += 1
+        return length
+    
     def _changeDebug(self):
         for p in self.subparsers:
             p.setDebug(self._debug)
@@ -19,6 +19,8 @@ class ParsedType(object):
     
     __FIELDS__=[]
     
+    __slots__ = ('content',)
+    
     def __init__(self, content):
         self.content = content
 
@@ -47,6 +49,10 @@ class BaseParsedType(ParsedType):
     
     __FIELDS__=['content']
     
+    # no per-instance dict: base values are the bulk
+    # of the facts storage
+    __slots__ = ()
+    
     def __init__(self, content):
         ParsedType.__init__(self, content)
         if hasattr(self, 'converter'):
@@ -55,6 +61,15 @@ class BaseParsedType(ParsedType):
     def evaluate(self):
         return self.content
     
+    # base values are never changed after creation
+    # (and some of them are interned):
+    # copies can share the same instance
+    def __copy__(self):
+        return self
+    
+    def __deepcopy__(self, memo):
+        return self
+    
     def toClipsStr(self):
         return str(self.content)
     
@@ -62,10 +77,11 @@ class BaseParsedType(ParsedType):
         return self.content == value
 
     def __eq__(self, other):
-        return self.__class__ == other.__class__ \
-                and self.evaluate() == other.evaluate()
+        return self is other \
+            or (self.__class__ == other.__class__
+                and self.evaluate() == other.evaluate())
                 
-    def __neq__(self, other):
+    def __ne__(self, other):
         return not self.__eq__(other)
     
     def __hash__(self):
@@ -97,36 +113,93 @@ class HasScope(object):
         return constructName.split("::", 2)[-1]
     
 class Number(BaseParsedType):
-    pass
+    __slots__ = ()
 
 class Lexeme(BaseParsedType):
-    pass
+    __slots__ = ()
 
 class Integer(Number):
+    __slots__ = ()
     converter = lambda self, t: int(t)
+    
+    INTERN_RANGE = (-5, 256)
+    '''small integers in this range are interned'''
+    _interned = {}
+    
+    def __new__(cls, content=None):
+        if cls is not Integer:
+            return Number.__new__(cls)
+        try:
+            return Integer._interned[content]
+        except (KeyError, TypeError):
+            instance = Number.__new__(cls)
+            try:
+                value = int(content)
+            except (ValueError, TypeError):
+                # leave the error to __init__
+                return instance
+            if Integer.INTERN_RANGE[0] <= value <= Integer.INTERN_RANGE[1]:
+                # the first one is the shared instance
+                instance = Integer._interned.setdefault(value, instance)
+                if isinstance(content, basestring) and content == str(value):
+                    # "12" and 12 are the same integer
+                    # (only the canonical form is stored, so keys
+                    # are bounded by the range of values)
+                    Integer._interned[content] = instance
+            return instance
+        
+    def __getnewargs__(self):
+        return (self.content,)
+    
     def pyEqual(self, value):
         return value.__class__ == int and self.evaluate() == value
     pass
 
 class Symbol(Lexeme):
+    __slots__ = ()
+    
+    INTERN_LIMIT = 65536
+    '''max number of interned symbols. New symbols
+    after the limit are not interned (gensym, ...)'''
+    _interned = {}
+    
+    def __new__(cls, content=None):
+        if cls is not Symbol:
+            return Lexeme.__new__(cls)
+        try:
+            return Symbol._interned[content]
+        except KeyError:
+            instance = Lexeme.__new__(cls)
+            if len(Symbol._interned) < Symbol.INTERN_LIMIT \
+                    and isinstance(content, basestring):
+                Symbol._interned[content] = instance
+            return instance
+        except TypeError:
+            return Lexeme.__new__(cls)
+        
+    def __getnewargs__(self):
+        return (self.content,)
+    
     def pyEqual(self, value):
         return isinstance(value, (str, unicode)) and self.evaluate() == value
     pass
 
 class String(Lexeme):
+    __slots__ = ()
     converter = lambda self, t: '"'+str(t)+'"'
     def pyEqual(self, value):
         return isinstance(value, (str, unicode)) and self.evaluate() == value
     pass
 
 class Float(Number):
+    __slots__ = ()
     converter = float
     def pyEqual(self, value):
         return value.__class__ == float and self.evaluate() == value
     pass
 
 class InstanceName(BaseParsedType):
-    pass
+    __slots__ = ()
 
 class Variable(ParsedType):
     __FIELDS__=['content']
@@ -946,6 +1019,8 @@ class DefFunctionConstruct(ParsedType, HasScope):
     
 class NullValue(BaseParsedType):
     
+    __slots__ = ()
+    
     def __init__(self):
         BaseParsedType.__init__(self, None)
         
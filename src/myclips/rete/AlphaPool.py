@@ -0,0 +1,89 @@
+'''
+Created on 17/ott/2026
+
+@author: Francesco Capozzo
+'''
+import os
+import multiprocessing
+from myclips.rete.WME import WME
+
+_context = None
+'''(network, facts, memories index) shared with the workers.
+Workers are forked when the pool is created, so they get
+a copy of the alpha network and of the facts without
+pickling them'''
+
+def isAvailable():
+    """
+    Check if the alpha network could be evaluated in a pool
+    (workers need to be forked to share the network)
+    @rtype: bool
+    """
+    return hasattr(os, "fork")
+
+def alphaMemberships(network, facts, processes):
+    """
+    Evaluate the alpha network for a batch of facts
+    using a pool of processes. Alpha tests only read
+    a wme, so they are evaluated in the workers: only the
+    list of alpha memories for each fact is sent back
+    to the main process. The network is not changed: the
+    beta phase is left to the caller (see Network.assertFacts)
+
+    @param network: the network
+    @type network: myclips.rete.Network
+    @param facts: the facts to evaluate
+    @type facts: list of Fact
+    @param processes: the number of workers
+    @type processes: int
+    @return: a list with the alpha memories (in activation order)
+        for each fact, in the same order of facts
+    @rtype: list
+    """
+    global _context
+
+    memories = _alphaMemories(network)
+    memoriesIndex = dict([(memory, index) for (index, memory) in enumerate(memories)])
+
+    # a few chunks for each worker, to balance the load
+    chunkSize = max(1, len(facts) / (processes * 4))
+    chunks = [(start, min(start + chunkSize, len(facts))) for start in xrange(0, len(facts), chunkSize)]
+
+    _context = (network, facts, memoriesIndex)
+    try:
+        pool = multiprocessing.Pool(processes)
+        try:
+            results = pool.map(_evaluateChunk, chunks)
+        finally:
+            pool.terminate()
+            pool.join()
+    finally:
+        _context = None
+
+    return [[memories[index] for index in indexes]
+                for chunkResults in results
+                    for indexes in chunkResults]
+
+def _alphaMemories(network):
+    """
+    Get all alpha memories in the network
+    """
+    memories = []
+    nodes = list(network._root.children)
+    while len(nodes) > 0:
+        node = nodes.pop()
+        if node.hasMemory():
+            memories.append(node.memory)
+        nodes.extend(node.children)
+    return memories
+
+def _evaluateChunk(bounds):
+    """
+    Worker side: evaluate the alpha network for
+    facts[start:stop] and return indexes of alpha
+    memories for each fact
+    """
+    network, facts, memoriesIndex = _context
+    start, stop = bounds
+    return [tuple([memoriesIndex[memory] for memory in network._alphaMemoriesFor(WME(factId, facts[factId]))])
+                for factId in xrange(start, stop)]
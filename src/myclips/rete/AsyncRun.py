@@ -0,0 +1,200 @@
+'''
+Created on 17/ott/2026
+
+@author: Francesco Capozzo
+'''
+import time
+import threading
+from collections import deque
+from myclips.EventsManager import EventsManager
+from myclips.functions.Function import HaltException
+
+class AsyncRun(object):
+    '''
+    A run executed in slices. Each iteration
+    (next()) executes a slice and returns the number
+    of steps executed in it, while the run is paused.
+    Iteration stops when the run is complete: the focus
+    stack is empty, the max number of steps has been
+    reached, halt has been called or the run has been stopped.
+
+    The run could be driven by any loop that can iterate
+    a generator (a scheduler, a coroutine trampoline, a
+    thread): between two slices the network is not in use.
+    Facts asserted or retracted through this object are queued
+    and applied to the network at the start of the next slice.
+
+    E_RUN_PAUSE and E_RUN_RESUME events are fired between slices.
+    E_RUN_STOP completion could be waited (wait) or observed
+    (addDoneCallback)
+
+        theRun = network.runAsync(budget=5)
+        for _ in theRun:
+            serveOtherTasks()
+    '''
+
+    def __init__(self, network, steps=None, activations=100, budget=None):
+        '''
+        Create a new run for the network (see Network.runAsync)
+
+        @param network: the network
+        @type network: myclips.rete.Network
+        @param steps: max number of steps (None: no limit)
+        @type steps: int
+        @param activations: max number of steps in a slice (None: no limit)
+        @type activations: int
+        @param budget: max time in milliseconds for a slice (None: no limit)
+        @type budget: float
+        '''
+        self._network = network
+        self._steps = int(steps) if steps is not None else None
+        self._activations = int(activations) if activations is not None else None
+        self._budget = float(budget) / 1000 if budget is not None else None
+        self._pending = deque()
+        '''queued (method, arg) changes for the network'''
+        self._stopRequested = False
+        self._done = threading.Event()
+        self._callbacks = []
+        self._slices = self._run()
+
+    def __iter__(self):
+        return self
+
+    def next(self):
+        """
+        Execute the next slice
+
+        @return: the number of steps executed in the slice
+            (the run is paused)
+        @rtype: int
+        @raise StopIteration: if the run is complete
+        """
+        return self._slices.next()
+
+    def assertFact(self, fact):
+        """
+        Queue a fact to assert in the next slice.
+        If the run is complete, the fact is asserted now
+
+        @param fact: the fact
+        @type fact: Fact
+        """
+        self._schedule(self._network.assertFact, fact)
+
+    def retractFact(self, wme):
+        """
+        Queue a wme to retract in the next slice.
+        If the run is complete, the wme is retracted now
+
+        @param wme: the wme
+        @type wme: WME
+        """
+        self._schedule(self._network.retractFact, wme)
+
+    def stop(self):
+        """
+        Stop the run before the next slice
+        """
+        self._stopRequested = True
+
+    @property
+    def done(self):
+        """
+        True if the run is complete
+        """
+        return self._done.isSet()
+
+    def wait(self, timeout=None):
+        """
+        Wait the end of the run (if it's driven by another thread)
+
+        @param timeout: max seconds to wait (None: no limit)
+        @type timeout: float
+        @return: True if the run is complete
+        @rtype: bool
+        """
+        self._done.wait(timeout)
+        return self.done
+
+    def addDoneCallback(self, callback):
+        """
+        Register a callable to call (without arguments)
+        after E_RUN_STOP. If the run is already
+        complete, it's called now
+
+        @param callback: the callable
+        @type callback: callable
+        """
+        if self.done:
+            callback()
+        else:
+            self._callbacks.append(callback)
+
+    def _schedule(self, method, arg):
+        if self.done:
+            method(arg)
+        else:
+            self._pending.append((method, arg))
+
+    def _applyPending(self):
+        # changes queued while the network was paused
+        while len(self._pending) > 0:
+            method, arg = self._pending.popleft()
+            method(arg)
+
+    def _run(self):
+        network = self._network
+        eventsManager = network.eventsManager
+        theRuns = self._steps if self._steps is not None else True
+
+        eventsManager.fire(EventsManager.E_RUN_START)
+
+        try:
+            try:
+                while theRuns and not self._stopRequested:
+                    self._applyPending()
+
+                    theSteps = 0
+                    theSliceEnd = time.time() + self._budget if self._budget is not None else None
+                    while theRuns:
+                        #decrease theRuns if integer
+                        if theRuns is not True:
+                            theRuns -= 1
+
+                        if not network._runStep():
+                            # agenda is empty: queued changes could
+                            # activate new rules, otherwise run is complete
+                            if len(self._pending) > 0:
+                                self._applyPending()
+                                # nothing fired: not a step
+                                if theRuns is not True:
+                                    theRuns += 1
+                                continue
+                            else:
+                                theRuns = False
+                                break
+
+                        theSteps += 1
+                        if (self._activations is not None and theSteps >= self._activations) \
+                                or (theSliceEnd is not None and time.time() >= theSliceEnd):
+                            break
+
+                    # the last slice is not returned: the iteration
+                    # stops when the run is complete
+                    if theRuns and not self._stopRequested:
+                        eventsManager.fire(EventsManager.E_RUN_PAUSE)
+                        yield theSteps
+                        eventsManager.fire(EventsManager.E_RUN_RESUME)
+
+            except HaltException:
+                pass
+
+        finally:
+            # the run is complete, or the generator has been closed
+            self._applyPending()
+            eventsManager.fire(EventsManager.E_RUN_STOP)
+            self._done.set()
+            callbacks, self._callbacks = self._callbacks, []
+            for callback in callbacks:
+                callback()
+
@@ -0,0 +1,185 @@
+'''
+Created on 17/ott/2026
+
+@author: Francesco Capozzo
+'''
+from bisect import bisect_left
+from heapq import merge
+from myclips.facts.TemplateFact import TemplateFact
+
+class FactsIndex(object):
+    '''
+    Secondary indexes of the working memory: wmes
+    ordered by fact-id, for all facts, per module
+    (fact.moduleName) and per template name.
+    Queries (fact-id range, module, template) cost
+    O(result), not O(working memory)
+    '''
+
+    def __init__(self):
+        '''
+        Create an empty index
+        '''
+        self._all = _OrderedWmes()
+        self._byModule = {}
+        '''moduleName => _OrderedWmes'''
+        self._byTemplate = {}
+        '''templateName => _OrderedWmes'''
+
+    def add(self, wme):
+        '''
+        Index a new wme
+
+        @param wme: the wme asserted
+        @type wme: myclips.rete.WME
+        '''
+        for wmes in self._indexesFor(wme, True):
+            wmes.add(wme)
+
+    def remove(self, wme):
+        '''
+        Remove a wme from the index
+
+        @param wme: the wme retracted
+        @type wme: myclips.rete.WME
+        '''
+        for wmes in self._indexesFor(wme, False):
+            wmes.remove(wme)
+
+    def _indexesFor(self, wme, create):
+        fact = wme.fact
+        indexes = [self._all, self._index(self._byModule, fact.moduleName, create)]
+        if isinstance(fact, TemplateFact):
+            indexes.append(self._index(self._byTemplate, fact.templateName, create))
+        return [wmes for wmes in indexes if wmes is not None]
+
+    def _index(self, indexes, key, create):
+        try:
+            return indexes[key]
+        except KeyError:
+            if not create:
+                return None
+            wmes = _OrderedWmes()
+            indexes[key] = wmes
+            return wmes
+
+    def wmes(self, start=0, end=None):
+        '''
+        Iterate over all wmes with start <= fact-id <= end
+        in fact-id order
+
+        @param start: the first fact-id
+        @type start: int
+        @param end: the last fact-id (None: no limit)
+        @type end: int
+        @rtype: iterator
+        '''
+        return self._all.wmes(start, end)
+
+    def wmesForModule(self, moduleName, start=0, end=None):
+        '''
+        Iterate over wmes of facts defined in a module
+        with start <= fact-id <= end in fact-id order
+
+        @param moduleName: the fact module name
+        @type moduleName: string
+        @rtype: iterator
+        '''
+        try:
+            return self._byModule[moduleName].wmes(start, end)
+        except KeyError:
+            return iter([])
+
+    def wmesForTemplate(self, templateName, start=0, end=None):
+        '''
+        Iterate over wmes of template facts with
+        start <= fact-id <= end in fact-id order
+
+        @param templateName: the template name
+        @type templateName: string
+        @rtype: iterator
+        '''
+        try:
+            return self._byTemplate[templateName].wmes(start, end)
+        except KeyError:
+            return iter([])
+
+    def wmesForScope(self, theScope, start=0, end=None):
+        '''
+        Iterate over wmes that can be seen in a scope: facts
+        defined in the scope module and template facts for
+        templates imported in the scope.
+        start <= fact-id <= end, in fact-id order
+
+        @param theScope: the scope
+        @type theScope: myclips.Scope.Scope
+        @rtype: iterator
+        '''
+        iterators = [self.wmesForModule(theScope.moduleName, start, end)]
+        iterators += [self._byTemplate[templateName].wmes(start, end)
+                        for templateName in theScope.templates.definitions
+                            if self._byTemplate.has_key(templateName)]
+
+        # a template fact defined in the scope module
+        # is in two lists
+        lastId = None
+        for (factId, wme) in merge(*[((wme.factId, wme) for wme in iterator) for iterator in iterators]):
+            if factId != lastId:
+                lastId = factId
+                yield wme
+
+    def __len__(self):
+        return len(self._all)
+
+
+class _OrderedWmes(object):
+    '''
+    Wmes ordered by fact-id. Fact-ids are given in
+    ascending order, so new wmes are appended.
+    Retracted wmes are only marked: they are
+    skipped, and removed when they are more than half
+    '''
+
+    __slots__ = ('_ids', '_wmes', '_retracted')
+
+    def __init__(self):
+        self._ids = []
+        self._wmes = []
+        self._retracted = set()
+        '''ids of the retracted wmes (still in the lists)'''
+
+    def add(self, wme):
+        if len(self._ids) == 0 or wme.factId > self._ids[-1]:
+            self._ids.append(wme.factId)
+            self._wmes.append(wme)
+        else:
+            # fact-ids have been reset
+            self._compact()
+            index = bisect_left(self._ids, wme.factId)
+            self._ids.insert(index, wme.factId)
+            self._wmes.insert(index, wme)
+
+    def remove(self, wme):
+        self._retracted.add(wme.factId)
+        if len(self._retracted) * 2 > len(self._ids):
+            self._compact()
+
+    def _compact(self):
+        if len(self._retracted) > 0:
+            retracted = self._retracted
+            self._wmes = [wme for wme in self._wmes if wme.factId not in retracted]
+            self._ids = [wme.factId for wme in self._wmes]
+            self._retracted = set()
+
+    def wmes(self, start=0, end=None):
+        ids = self._ids
+        wmes = self._wmes
+        retracted = self._retracted
+        index = bisect_left(ids, start)
+        while index < len(ids) and (end is None or ids[index] <= end):
+            if ids[index] not in retracted:
+                yield wmes[index]
+            index += 1
+
+    def __len__(self):
+        return len(self._ids) - len(self._retracted)
@@ -0,0 +1,140 @@
+'''
+Created on 17/ott/2026
+
+@author: Francesco Capozzo
+'''
+import collections
+
+class HasDispatchIndex(object):
+    '''
+    Interface for alpha nodes that route wmes to children
+    using hash tables instead of asking every child:
+    children with a dispatchable test (see AlphaTest.getDispatchKeys)
+    are grouped by the kind of test (the discriminator) and
+    stored in a table value -> children (a child could be stored
+    with more values: OR of constants). On activation, the wme
+    value is computed once for each group and only children in the
+    matching bucket (and children without a dispatchable test)
+    are activated.
+    Children are activated in the same order of the children deque
+
+    Node.children is still the main children container: the
+    index is updated on add/prepend/append/removeChild
+    '''
+
+    def __init__(self):
+        '''
+        Constructor
+        '''
+        self._dispatchGroups = {}
+        '''discriminator => (keyFunction, {value: [children]})'''
+        self._undispatched = []
+        '''children without dispatchable tests'''
+        self._childrenOrder = {}
+        '''child => position, to keep the children deque order'''
+        self._firstOrder = 0
+        self._lastOrder = 0
+        self._dispatching = True
+        '''dispatch could be disabled while the children deque is swapped'''
+
+    def prependChild(self, child):
+        self._children.appendleft(child)
+        self._firstOrder -= 1
+        self._indexChild(child, self._firstOrder)
+
+    # alias for prependChild
+    addChild = prependChild
+
+    def appendChild(self, child):
+        self._children.append(child)
+        self._lastOrder += 1
+        self._indexChild(child, self._lastOrder)
+
+    def removeChild(self, child):
+        self._children.remove(child)
+        self._unindexChild(child)
+
+    def _indexChild(self, child, order):
+        self._childrenOrder[child] = order
+
+        try:
+            dispatchKeys = child.getDispatchKeys()
+        except AttributeError:
+            # not an alpha node with tests
+            dispatchKeys = None
+
+        if dispatchKeys is None:
+            self._undispatched.append(child)
+        else:
+            discriminator, keyFunction, values = dispatchKeys
+            try:
+                _, buckets = self._dispatchGroups[discriminator]
+            except KeyError:
+                buckets = {}
+                self._dispatchGroups[discriminator] = (keyFunction, buckets)
+            for value in set(values):
+                buckets.setdefault(value, []).append(child)
+
+    def _unindexChild(self, child):
+        del self._childrenOrder[child]
+
+        try:
+            dispatchKeys = child.getDispatchKeys()
+        except AttributeError:
+            dispatchKeys = None
+
+        if dispatchKeys is None:
+            self._undispatched.remove(child)
+        else:
+            discriminator, _, values = dispatchKeys
+            _, buckets = self._dispatchGroups[discriminator]
+            for value in set(values):
+                bucket = buckets[value]
+                bucket.remove(child)
+                if len(bucket) == 0:
+                    del buckets[value]
+            if len(buckets) == 0:
+                del self._dispatchGroups[discriminator]
+
+    def rebuildDispatchIndex(self):
+        """
+        Index all children again (in the children deque order),
+        using the current children dispatch keys
+        """
+        self._dispatchGroups = {}
+        self._undispatched = []
+        for child in sorted(self._childrenOrder, key=self._childrenOrder.__getitem__):
+            self._indexChild(child, self._childrenOrder[child])
+
+    def dispatch(self, wme):
+        """
+        Forward the wme to children that could
+        be activated by it
+        """
+        for child in self.dispatchTargets(wme):
+            child.rightActivation(wme)
+
+    def dispatchTargets(self, wme):
+        """
+        Get the children that could be activated
+        by the wme (in the children deque order)
+        @rtype: list
+        """
+        if not self._dispatching:
+            return list(self._children)
+
+        targets = list(self._undispatched)
+        for (keyFunction, buckets) in self._dispatchGroups.itervalues():
+            try:
+                targets.extend(buckets[keyFunction(wme)])
+            except Exception:
+                # no child for the value or the value
+                # can't be computed: tests would fail for
+                # all children in this group
+                pass
+
+        if len(targets) > 1:
+            targets.sort(key=self._childrenOrder.__getitem__)
+
+        return targets
+
@@ -3,6 +3,7 @@ Created on 04/lug/2012
 
 @author: ximarx
 '''
+from myclips.rete.tests import compileJoinTests
 
 class HasJoinTests(object):
     '''
@@ -48,4 +49,12 @@ class HasJoinTests(object):
             for test in self.tests:
                 if not test.isValid(token, wme):
                     return False
-        return True
\ No newline at end of file
+        return True
+    
+    def compileTests(self):
+        '''
+        Replace isValid with a function compiled
+        from the tests list (see compileJoinTests).
+        Tests must not be changed after compilation
+        '''
+        self.isValid = compileJoinTests(self.tests)
@@ -0,0 +1,121 @@
+'''
+Created on 17/ott/2026
+
+@author: Francesco Capozzo
+'''
+import bisect
+from myclips.rete.Memory import Memory
+
+class HasLinkedChildren(object):
+    '''
+    Interface for memory nodes (alpha and beta memories) that
+    allow children to be temporary unlinked (Doorenbos' left
+    and right unlinking): an unlinked child is still in the
+    children deque (the network structure doesn't change) but
+    it doesn't get activations from this memory.
+    Linked children are activated in the same order of
+    the children deque.
+
+    When the memory becomes empty or not-empty, children
+    with the useUnlinking flag are asked to update their links
+    (see JoinNode.updateLinks)
+    '''
+
+    def __init__(self):
+        '''
+        Constructor
+        '''
+        self._childrenOrder = {}
+        '''child => position, to keep the children deque order'''
+        self._firstOrder = 0
+        self._lastOrder = 0
+        self._linkedOrders = []
+        self._linkedChildren = []
+        '''children that get activations (in deque order). The list is
+        replaced (never changed) on link/unlink: links could change
+        while the memory is activating children'''
+        self._unlinkedChildren = set()
+        self._unlinkableChildren = []
+        '''children that update links on memory empty/not-empty'''
+
+    def prependChild(self, child):
+        self._children.appendleft(child)
+        self._firstOrder -= 1
+        self._indexChild(child, self._firstOrder)
+
+    # alias for prependChild
+    addChild = prependChild
+
+    def appendChild(self, child):
+        self._children.append(child)
+        self._lastOrder += 1
+        self._indexChild(child, self._lastOrder)
+
+    def removeChild(self, child):
+        self._children.remove(child)
+        if child in self._unlinkedChildren:
+            self._unlinkedChildren.remove(child)
+        else:
+            self._unlinkChild(child)
+        del self._childrenOrder[child]
+        if child in self._unlinkableChildren:
+            self._unlinkableChildren.remove(child)
+
+    def _indexChild(self, child, order):
+        self._childrenOrder[child] = order
+        self._linkChild(child)
+        if getattr(child, "useUnlinking", False):
+            self._unlinkableChildren.append(child)
+
+    def _linkChild(self, child):
+        order = self._childrenOrder[child]
+        position = bisect.bisect(self._linkedOrders, order)
+        linkedOrders = list(self._linkedOrders)
+        linkedOrders.insert(position, order)
+        linkedChildren = list(self._linkedChildren)
+        linkedChildren.insert(position, child)
+        self._linkedOrders = linkedOrders
+        self._linkedChildren = linkedChildren
+
+    def _unlinkChild(self, child):
+        position = bisect.bisect_left(self._linkedOrders, self._childrenOrder[child])
+        self._linkedOrders = self._linkedOrders[:position] + self._linkedOrders[position + 1:]
+        self._linkedChildren = self._linkedChildren[:position] + self._linkedChildren[position + 1:]
+
+    @property
+    def linkedChildren(self):
+        """
+        Children that get activations from this memory
+        """
+        return self._linkedChildren
+
+    def isLinkedChild(self, child):
+        return child in self._childrenOrder and child not in self._unlinkedChildren
+
+    def unlinkChild(self, child):
+        """
+        Stop activations to the child
+        """
+        if self.isLinkedChild(child):
+            self._unlinkedChildren.add(child)
+            self._unlinkChild(child)
+
+    def relinkChild(self, child):
+        """
+        Restore activations to an unlinked child
+        """
+        if child in self._unlinkedChildren:
+            self._unlinkedChildren.remove(child)
+            self._linkChild(child)
+
+    def addItem(self, item):
+        Memory.addItem(self, item)
+        if len(self._items) == 1 and len(self._unlinkableChildren) > 0:
+            for child in list(self._unlinkableChildren):
+                child.updateLinks()
+
+    def removeItem(self, item):
+        Memory.removeItem(self, item)
+        if len(self._items) == 0 and len(self._unlinkableChildren) > 0:
+            for child in list(self._unlinkableChildren):
+                child.updateLinks()
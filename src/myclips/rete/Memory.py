@@ -9,6 +9,12 @@ import collections
 class Memory(object):
     '''
     Local results storage. It contains a group of MemoryItem
+    
+    Memory can keep hash indexes over its items too:
+    every index is owned by a node (usually a JoinNode)
+    that provide a key function. Items are partitioned
+    in buckets by key, so the owner can get only
+    the items that could match (instead of a full scan)
     '''
 
 
@@ -17,6 +23,7 @@ class Memory(object):
         Constructor
         '''
         self._items = collections.OrderedDict()
+        self._indexes = {}
 
     @property
     def items(self):
@@ -26,13 +33,91 @@ class Memory(object):
     def keys(self):
         return self._items.keys()
 
+    def isEmpty(self):
+        return len(self._items) == 0
+
     def addItem(self, item):
         assert isinstance(item, MemoryItem)
         self._items[item] = item
+        
+        for (keyFunc, buckets, itemsKeys) in self._indexes.itervalues():
+            key = keyFunc(item)
+            if key is not None:
+                buckets.setdefault(key, collections.OrderedDict())[item] = item
+                itemsKeys[item] = key
 
     def removeItem(self, item):
         del self._items[item]
         
+        for (_, buckets, itemsKeys) in self._indexes.itervalues():
+            # i use the key stored on insert, the item
+            # could be changed in the meanwhile
+            key = itemsKeys.pop(item, None)
+            if key is not None:
+                bucket = buckets[key]
+                del bucket[item]
+                if len(bucket) == 0:
+                    del buckets[key]
+        
+    def updateItem(self, item):
+        """
+        Recompute index keys of an item
+        changed in place
+        """
+        for (keyFunc, buckets, itemsKeys) in self._indexes.itervalues():
+            key = itemsKeys.pop(item, None)
+            if key is not None:
+                bucket = buckets[key]
+                del bucket[item]
+                if len(bucket) == 0:
+                    del buckets[key]
+            key = keyFunc(item)
+            if key is not None:
+                buckets.setdefault(key, collections.OrderedDict())[item] = item
+                itemsKeys[item] = key
+        
+    def addIndex(self, owner, keyFunc):
+        """
+        Create a new hash index for the owner and
+        index all items already stored
+        
+        @param owner: the node that will use the index
+        @type owner: object
+        @param keyFunc: a function item -> hashable key. If the
+            function return None, the item will not be indexed at all
+        @type keyFunc: callable
+        """
+        buckets = {}
+        itemsKeys = {}
+        for item in self._items.itervalues():
+            key = keyFunc(item)
+            if key is not None:
+                buckets.setdefault(key, collections.OrderedDict())[item] = item
+                itemsKeys[item] = key
+                
+        self._indexes[owner] = (keyFunc, buckets, itemsKeys)
+        
+    def removeIndex(self, owner):
+        """
+        Remove the hash index of the owner (if any)
+        """
+        self._indexes.pop(owner, None)
+        
+    def hasIndex(self, owner):
+        return self._indexes.has_key(owner)
+        
+    def lookup(self, owner, key):
+        """
+        Get all items in the owner's index with the key
+        (in insertion order)
+        
+        @rtype: list
+        """
+        try:
+            return self._indexes[owner][1][key].values()
+        except KeyError:
+            return []
+        
     def delete(self):
         while len(self._items) > 0:
             self._items[self._items.keys()[0]].delete()
@@ -49,4 +134,3 @@ class Memory(object):
         return "<Memory: {0} item(s)>".format(
                                             len(self._items)
                                         )
-    
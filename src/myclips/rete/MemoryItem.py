@@ -9,6 +9,8 @@ class MemoryItem(object):
     Base class for items that can be stored
     inside memories (alpha or beta)
     '''
+    
+    __slots__ = ()
 
     def delete(self):
         return NotImplementedError()
@@ -4,6 +4,7 @@ Created on 24/lug/2012
 @author: Francesco Capozzo
 '''
 from myclips.Agenda import Agenda, AgendaNoMoreActivationError
+import myclips.strategies as strategies
 import myclips.parser.Types as types
 from myclips.MyClipsException import MyClipsBugException, MyClipsException
 from myclips.rete.nodes.PropertyTestNode import PropertyTestNode
@@ -15,11 +16,18 @@ from myclips.rete.nodes.JoinNode import JoinNode
 from myclips.rete.nodes.NegativeJoinNode import NegativeJoinNode
 from myclips.rete.nodes.NccNode import NccNode
 from myclips.rete import analysis
+from myclips.rete import AlphaPool
+from myclips.rete.NetworkImage import NetworkImage
+from myclips.rete.FactsIndex import FactsIndex
+from myclips.rete.AsyncRun import AsyncRun
 from myclips.rete.nodes.PNode import PNode
 from myclips.EventsManager import EventsManager
 from myclips.ModulesManager import ModulesManager, UnknownModuleError
 from myclips.TemplatesManager import TemplateDefinition
 import sys
+import os
+from cStringIO import StringIO
+from itertools import islice
 from myclips.functions.Function import HaltException
 from myclips.rete.tests.DynamicFunctionTest import DynamicFunctionTest
 from myclips.rete.nodes.TestNode import TestNode
@@ -29,6 +37,9 @@ from myclips.rete.tests.locations import VariableLocation
 from myclips.rete.nodes.ExistsNode import ExistsNode
 from myclips.facts.TemplateFact import TemplateFact
 from myclips.facts.OrderedFact import OrderedFact
+from myclips.rete.tests.ScopeTest import ScopeTest
+from myclips.rete.tests.TemplateNameTest import TemplateNameTest
+from myclips.rete.tests.OrderedFactLengthTest import OrderedFactLengthTest
 
 
 class Network(object):
@@ -56,6 +67,7 @@ class Network(object):
         self._rules = {}
         self._facts = {}
         self._factsWmeMap = {}
+        self._factsIndex = FactsIndex()
         self._currentWmeId = 0
         self._linkedParser = None
         self._deffacts = {}
@@ -90,11 +102,18 @@ class Network(object):
         """
         Get an instance of myclips.Parser
         (default myclips.parser.Parser.Parser),
-        linked to the modulesManager references in this Network instance 
+        linked to the modulesManager references in this Network instance.
+        If the setting "parser.backend" is "fast", the
+        recursive-descent backend (myclips.parser.FastParser.FastParser)
+        is used instead
         """
         if self._linkedParser is None:
-            import myclips
-            self._linkedParser = myclips.Parser(modulesManager=self.modulesManager, **kargs)
+            if self._settings.getSetting("parser.backend", None) == "fast":
+                from myclips.parser.FastParser import FastParser as parserClass
+            else:
+                import myclips
+                parserClass = myclips.Parser
+            self._linkedParser = parserClass(modulesManager=self.modulesManager, **kargs)
             
         return self._linkedParser
         
@@ -123,28 +142,7 @@ class Network(object):
         if not self._factsWmeMap.has_key(fact):
             
             # check if fact is valid
-            
-            # first check moduleName
-            if not self.modulesManager.isDefined(fact.moduleName):
-                raise UnknownModuleError("Fact module is unknown: %s"%fact.moduleName)
-            
-            # if fact is a template one
-            if isinstance(fact, TemplateFact):
-                # other validations are required for:
-                #    templateName is valid?
-                #    templateName is available in this scope?
-                #    slots are valid for the template definition?
-                
-                # if the template name is invalid, an exception is raised 
-                tmplDef = self.modulesManager.currentScope.templates.getDefinition(fact.templateName)
-                
-                assert isinstance(tmplDef, TemplateDefinition)
-                
-                isValid = tmplDef.isValidFact(fact)
-                
-                if isValid is not True:
-                    raise InvalidFactFormatError(str(isValid))
-                 
+            self._validateFact(fact)
             
             # create the new wme, ...
             wme = WME(self._currentWmeId, fact)
@@ -152,11 +150,14 @@ class Network(object):
             self._facts[self._currentWmeId] = wme
             # ... and link the fact to the wme
             self._factsWmeMap[wme.fact] = wme
+            # ... and index it
+            self._factsIndex.add(wme)
             
             # increment the fact-id counter
             self._currentWmeId += 1 
             
-            self.eventsManager.fire(EventsManager.E_FACT_ASSERTED, wme, True)
+            if self.eventsManager.isObserved(EventsManager.E_FACT_ASSERTED):
+                self.eventsManager.fire(EventsManager.E_FACT_ASSERTED, wme, True)
             
             # propagate the new assertion in the network
             self._root.rightActivation(wme)
@@ -170,10 +171,154 @@ class Network(object):
             
             wme = self._factsWmeMap[fact]
             # fire an event
-            self.eventsManager.fire(EventsManager.E_FACT_ASSERTED, wme, False)
+            if self.eventsManager.isObserved(EventsManager.E_FACT_ASSERTED):
+                self.eventsManager.fire(EventsManager.E_FACT_ASSERTED, wme, False)
             
             return (wme, False)
         
+    def assertFacts(self, facts):
+        """
+        Assert many facts in a single batch.
+        All facts are validated before any change to the
+        working memory: if a fact is invalid, an exception
+        is raised and nothing is asserted.
+        New activations and E_FACT_ASSERTED events
+        are coalesced until all the facts are propagated.
+        With the network.alpha.processes setting, alpha tests
+        of big batches are evaluated in a pool of processes
+        
+        @param facts: the facts to assert
+        @type facts: iterable of Fact
+        @return: a list of tuples (WME for the fact, bool(the WME is new)),
+            one for each fact, in the same order
+        @rtype: list
+        """
+        
+        facts = list(facts)
+        
+        # validate all the facts first
+        # (template definitions are shared by many facts
+        # in a batch, so keep them cached)
+        tmplDefs = {}
+        for fact in facts:
+            if not self._factsWmeMap.has_key(fact):
+                self._validateFact(fact, tmplDefs)
+        
+        # alpha network could be evaluated in a pool
+        # of processes for big batches (the beta phase
+        # is still sequential, in assert order)
+        memberships = self._alphaMembershipsInPool(facts)
+        
+        results = []
+        
+        self.agenda.beginBatch()
+        try:
+            for fact in facts:
+                try:
+                    # already in the working memory
+                    # (or previously in this batch)
+                    results.append((self._factsWmeMap[fact], False))
+                except KeyError:
+                    # create the new wme and link it
+                    # in the facts tables
+                    wme = WME(self._currentWmeId, fact)
+                    self._facts[self._currentWmeId] = wme
+                    self._factsWmeMap[wme.fact] = wme
+                    self._factsIndex.add(wme)
+                    self._currentWmeId += 1
+                    
+                    results.append((wme, True))
+                    
+                    # propagate the new assertion in the network
+                    if memberships is None:
+                        self._root.rightActivation(wme)
+                    else:
+                        for memory in memberships.next():
+                            memory.rightActivation(wme)
+            
+        finally:
+            # notify events before the agenda is updated
+            # (same order of the single fact assertion)
+            if self.eventsManager.isObserved(EventsManager.E_FACT_ASSERTED):
+                for (wme, isNew) in results:
+                    self.eventsManager.fire(EventsManager.E_FACT_ASSERTED, wme, isNew)
+
+            self.agenda.endBatch()
+            
+        return results
+        
+    def _alphaMembershipsInPool(self, facts):
+        """
+        Evaluate the alpha network for the new facts
+        of a batch in a pool of processes (see AlphaPool).
+        The pool is used only if the setting
+        network.alpha.processes is greater than 1
+        and there are at least network.alpha.minBatch
+        new facts
+        
+        @param facts: the facts of the batch
+        @type facts: list of Fact
+        @return: an iterator over alpha memories
+            of each new fact (in assert order) or None
+            if the pool is not used
+        @rtype: iterator|None
+        """
+        processes = self._settings.getSetting("network.alpha.processes", 1)
+        if processes <= 1 or not AlphaPool.isAvailable():
+            return None
+        
+        # duplicates are not propagated
+        newFacts = []
+        seen = set()
+        for fact in facts:
+            if not self._factsWmeMap.has_key(fact) and fact not in seen:
+                seen.add(fact)
+                newFacts.append(fact)
+        
+        if len(newFacts) < self._settings.getSetting("network.alpha.minBatch", 1000):
+            return None
+        
+        return iter(AlphaPool.alphaMemberships(self, newFacts, processes))
+        
+    def _validateFact(self, fact, tmplDefs=None):
+        """
+        Check if a fact could be asserted in the network
+        or raise an exception
+        
+        @param fact: the fact to check
+        @type fact: Fact
+        @param tmplDefs: a cache for template definitions (templateName => definition)
+        @type tmplDefs: dict
+        """
+        if not isinstance(fact, (TemplateFact, OrderedFact)):
+            raise InvalidFactFormatError("fact is expected to be a %s or %s instance, %s passed"%(str(TemplateFact), str(OrderedFact), str(fact.__class__)))
+        
+        # first check moduleName
+        if not self.modulesManager.isDefined(fact.moduleName):
+            raise UnknownModuleError("Fact module is unknown: %s"%fact.moduleName)
+        
+        # if fact is a template one
+        if isinstance(fact, TemplateFact):
+            # other validations are required for:
+            #    templateName is valid?
+            #    templateName is available in this scope?
+            #    slots are valid for the template definition?
+            
+            # if the template name is invalid, an exception is raised 
+            try:
+                tmplDef = tmplDefs[fact.templateName]
+            except (KeyError, TypeError):
+                tmplDef = self.modulesManager.currentScope.templates.getDefinition(fact.templateName)
+                if tmplDefs is not None:
+                    tmplDefs[fact.templateName] = tmplDef
+            
+            assert isinstance(tmplDef, TemplateDefinition)
+            
+            isValid = tmplDef.isValidFact(fact)
+            
+            if isValid is not True:
+                raise InvalidFactFormatError(str(isValid))
+        
     def retractFact(self, wme):
         """
         Retract a WME from the working memory
@@ -191,13 +336,170 @@ class Network(object):
         del self._facts[wme.factId]
         # and from the fact -> wme map
         del self._factsWmeMap[wme.fact]
+        # and from the index
+        self._factsIndex.remove(wme)
         
-        self.eventsManager.fire(EventsManager.E_FACT_RETRACTED, wme)
+        if self.eventsManager.isObserved(EventsManager.E_FACT_RETRACTED):
+            self.eventsManager.fire(EventsManager.E_FACT_RETRACTED, wme)
         
         # then start wme revocation from the network
         wme.delete()
         
-    
+    def retractFacts(self, wmes):
+        """
+        Retract many WMEs from the working memory
+        and from the network in a single batch.
+        All wmes are checked before any removal.
+        Activations created while the wmes are removed
+        (ex: by negative patterns) are coalesced until
+        all wmes are removed
+        
+        @param wmes: the wmes to be removed
+        @type wmes: iterable of myclips.rete.WME
+        @return: None
+        """
+        wmes = list(wmes)
+        
+        for wme in wmes:
+            assert isinstance(wme, WME)
+            if not self._facts.get(wme.factId, None) == wme:
+                raise InvalidWmeOwner("The wme owner is not this network: %s"%str(wme))
+        
+        self.agenda.beginBatch()
+        try:
+            for wme in wmes:
+                # the same wme could be in the list twice
+                if not self._facts.has_key(wme.factId):
+                    continue
+                
+                del self._facts[wme.factId]
+                del self._factsWmeMap[wme.fact]
+                self._factsIndex.remove(wme)
+                
+                if self.eventsManager.isObserved(EventsManager.E_FACT_RETRACTED):
+                    self.eventsManager.fire(EventsManager.E_FACT_RETRACTED, wme)
+                
+                wme.delete()
+
+        finally:
+            self.agenda.endBatch()
+
+    def modifyFact(self, wme, slotValues):
+        """
+        Change some slots of a template-fact in the working memory.
+        By default, this is the same as retract the wme and
+        assert the modified fact (with a new fact-id).
+        If the network.modify.slotSpecific setting is True,
+        the wme keeps its fact-id and only patterns
+        that read the changed slots are updated:
+        partial matches (and activations) that don't
+        depend on changed slots are kept
+
+        @param wme: the wme of the fact to modify
+        @type wme: myclips.rete.WME
+        @param slotValues: a dict of slotName => new value
+        @type slotValues: dict
+        @return: a tuple with (WME for the modified fact, bool(the WME is new))
+        @rtype: tuple
+        """
+        assert isinstance(wme, WME)
+
+        fact = wme.fact
+        if not isinstance(fact, TemplateFact):
+            raise InvalidFactFormatError("Only template-facts could be modified: %s"%str(fact))
+
+        # asserted facts are never changed: their
+        # hash is cached
+        values = dict(fact.values)
+        values.update(slotValues)
+        newFact = TemplateFact(fact.templateName, values, fact.moduleName)
+
+        if not self._settings.getSetting("network.modify.slotSpecific", False):
+            self.retractFact(wme)
+            return self.assertFact(newFact)
+
+        if not self._facts.get(wme.factId, None) == wme:
+            raise InvalidWmeOwner("The wme owner is not this network: %s"%str(wme))
+
+        changedSlots = set([slotName for (slotName, value) in slotValues.items()
+                                if fact.values.get(slotName, None) != value])
+
+        if len(changedSlots) == 0:
+            # nothing to do
+            return (wme, True)
+
+        if self._factsWmeMap.has_key(newFact):
+            # the modified fact is a duplicate:
+            # same as retract + assert
+            self.retractFact(wme)
+            return self.assertFact(newFact)
+
+        try:
+            self._validateFact(newFact)
+        except:
+            # retract is done before assert
+            self.retractFact(wme)
+            raise
+
+        oldMemories = list(wme._alphaMemories)
+        newMemories = self._alphaMemoriesFor(WME(wme.factId, newFact))
+        keptMemories = set(newMemories).intersection(oldMemories)
+
+        if self.eventsManager.isObserved(EventsManager.E_FACT_RETRACTED):
+            self.eventsManager.fire(EventsManager.E_FACT_RETRACTED, wme)
+
+        # in alpha memories where the wme is still valid
+        # only children with patterns that read changed slots
+        # need to be updated
+        updatedChildren = {}
+        for memory in oldMemories:
+            if memory in keptMemories:
+                updatedChildren[memory] = memory.childrenReadingSlots(changedSlots)
+                wme.deleteFrom(memory, updatedChildren[memory])
+            else:
+                wme.deleteFrom(memory)
+
+        del self._factsWmeMap[fact]
+        wme.fact = newFact
+        self._factsWmeMap[newFact] = wme
+        
+        # hash indexes keys could be changed
+        for memory in keptMemories:
+            memory.updateItem(wme)
+
+        if self.eventsManager.isObserved(EventsManager.E_FACT_ASSERTED):
+            self.eventsManager.fire(EventsManager.E_FACT_ASSERTED, wme, True)
+
+        for memory in newMemories:
+            if memory in keptMemories:
+                for child in updatedChildren[memory]:
+                    child.rightActivation(wme)
+            else:
+                memory.rightActivation(wme)
+
+        return (wme, True)
+
+    def _alphaMemoriesFor(self, wme):
+        """
+        Get alpha memories a wme would be stored in
+        (in activation order) without activating
+        the network
+
+        @param wme: the wme
+        @type wme: myclips.rete.WME
+        @rtype: list
+        """
+        memories = []
+        nodes = list(reversed(self._root.dispatchTargets(wme)))
+        while len(nodes) > 0:
+            node = nodes.pop()
+            if node.isValid(wme):
+                if node.hasMemory():
+                    memories.append(node.memory)
+                nodes.extend(reversed(node.dispatchTargets(wme)))
+        return memories
+
+
     def addRule(self, defrule):
         '''
         Compile a DefRuleConstruct in a network circuit
@@ -225,7 +527,14 @@ class Network(object):
             
             variables = {}
             
-            lastNode, _ = self._makeNetwork(None, AndInOr.patterns, 0, variables)
+            lastNode, _ = self._makeNetwork(None, AndInOr.patterns, 0, variables, 
+                                            analysis.getVariablesNames(AndInOr.patterns))
+            
+            properties = analysis.normalizeDeclarations(defrule.defruleDeclaration)
+            if properties is None:
+                properties = {"salience": 0, "auto-focus": False}
+            # the specificity is used by complexity/simplicity strategies
+            properties["specificity"] = self._getSpecificity(lastNode)
             
             # I need to create a PNode (and it must always linked to the first PNode created)
             pNode = PNode(ruleName=defrule.defruleName, 
@@ -233,9 +542,11 @@ class Network(object):
                           network=self, 
                           orClauseCount=index - 1 if index > 0 else None,
                           rhs=defrule.rhs, 
-                          properties=analysis.normalizeDeclarations(defrule.defruleDeclaration),
+                          properties=properties,
                           variables=variables)
             
+            pNode.compileActions()
+            
             lastNode.prependChild(pNode)
             lastNode.updateChild(pNode)
             
@@ -254,6 +565,36 @@ class Network(object):
         
         return firstPNode
     
+    def _getSpecificity(self, lastNode):
+        """
+        Count the tests the rule circuit performs
+        (join tests, test-ce tests and alpha tests
+        on fact values) going back from the last node
+        of the main circuit
+        
+        @param lastNode: the last node of the rule circuit
+        @type lastNode: Node
+        @rtype: int
+        """
+        specificity = 0
+        node = lastNode
+        while node is not None:
+            if isinstance(node, (JoinNode, TestNode)):
+                specificity += len(node.tests)
+                
+            if isinstance(node, JoinNode) and isinstance(node.rightParent, AlphaMemory):
+                alphaNode = node.rightParent.rightParent
+                while isinstance(alphaNode, PropertyTestNode):
+                    # tests about scope/template/length
+                    # are not conditions on fact values
+                    specificity += len([test for test in alphaNode.tests 
+                                            if not isinstance(test, (ScopeTest, TemplateNameTest, OrderedFactLengthTest))])
+                    alphaNode = alphaNode.rightParent
+                    
+            node = node.leftParent
+        
+        return specificity
+    
     def removeRule(self, ruleName, moduleName=None):
         if moduleName is None:
             # the the moduleName from the current scope
@@ -328,8 +669,7 @@ class Network(object):
         self.eventsManager.fire(EventsManager.E_NETWORK_RESET_PRE, self)
          
         # retract all wme in the network
-        for wme in self.facts:
-            self.retractFact(wme)
+        self.retractFacts(self.facts)
         
         # reset the fact-id counter
         self._currentWmeId = 0
@@ -342,8 +682,8 @@ class Network(object):
         # and reset the resources map
         self._resources = self._init_resources
         
-        # reset the agenda
-        self._agenda = Agenda(self)
+        # reset the agenda (but keep the strategy)
+        self._agenda = Agenda(self, strategies.factory.newInstance(self._agenda.strategy))
         
         # push the MAIN::initial-fact
         self.assertFact(TemplateFact(values={}, templateName="initial-fact", moduleName="MAIN"))
@@ -356,6 +696,7 @@ class Network(object):
             # in this way asserted ordered fact gain the scope
             # from the current one and templates definition
             # could be checked vs module scope
+            facts = []
             for pattern in deffact.rhs:
                 if isinstance(pattern, types.TemplateRhsPattern):
                     assert isinstance(pattern, types.TemplateRhsPattern)
@@ -365,7 +706,7 @@ class Network(object):
                     
                     # use the module name of the scope in the template,
                     # not the current one
-                    self.assertFact(TemplateFact(values=values, templateName=pattern.templateName, moduleName=pattern.scope.moduleName))
+                    facts.append(TemplateFact(values=values, templateName=pattern.templateName, moduleName=pattern.scope.moduleName))
                     
                 elif isinstance(pattern, types.OrderedRhsPattern):
                     assert isinstance(pattern, types.OrderedRhsPattern)
@@ -374,7 +715,10 @@ class Network(object):
                     values = pattern.values
                     
                     # use the moduleName from the deffact scope (or the current one)
-                    self.assertFact(OrderedFact(values=values, moduleName=deffact.scope.moduleName))
+                    facts.append(OrderedFact(values=values, moduleName=deffact.scope.moduleName))
+            
+            # and assert them all in a batch
+            self.assertFacts(facts)
                     
         # reset globals value for each module
         for module in self.modulesManager.getModulesNames():
@@ -424,6 +768,7 @@ class Network(object):
         self._rules = {}
         self._facts = {}
         self._factsWmeMap = {}
+        self._factsIndex = FactsIndex()
         self._currentWmeId = 0
         self._linkedParser = None
         self._deffacts = {}
@@ -450,6 +795,92 @@ class Network(object):
 
         # ok, all done
 
+    def saveImage(self, path, workingMemory=False):
+        """
+        Save the compiled network (rules, deffacts,
+        templates, globals and deffunctions) in a binary
+        image file (like CLIPS bsave). Loading the image
+        (see loadImage) is faster than parsing and
+        compiling the constructs again
+
+        @param path: the image file path
+        @type path: string
+        @param workingMemory: if True, the working memory
+            and the agenda are saved too (checkpoint), otherwise
+            the image contains the initial-fact only
+        @type workingMemory: bool
+        """
+        if workingMemory:
+            network = self
+        else:
+            # save a copy of the network without
+            # facts and activations
+            buffer = StringIO()
+            NetworkImage(self).dump(buffer, True)
+            buffer.seek(0)
+
+            network = Network(settings=self._settings)
+            network._loadState(NetworkImage(network).load(buffer)[0])
+            network.retractFacts(network.facts)
+            network._currentWmeId = 0
+            network._agenda = Agenda(network, strategies.factory.newInstance(self._agenda.strategy))
+            network.assertFact(TemplateFact("initial-fact", {}, "MAIN"))
+
+        # write in a temp file first: a failure
+        # doesn't destroy a previous image
+        tmpPath = "%s.%d.tmp"%(path, os.getpid())
+        try:
+            with open(tmpPath, "wb") as imageFile:
+                NetworkImage(network).dump(imageFile, workingMemory)
+            if os.path.exists(path):
+                os.remove(path)
+            os.rename(tmpPath, path)
+        finally:
+            if os.path.exists(tmpPath):
+                os.remove(tmpPath)
+
+    def loadImage(self, path):
+        """
+        Replace the network contents (rules, deffacts,
+        templates, globals, deffunctions and, if saved,
+        working memory and agenda) with the contents
+        of an image file saved by saveImage (like CLIPS bload).
+        Events manager, settings and resources of the network
+        are not changed
+
+        @param path: the image file path
+        @type path: string
+        @return: True if the image contains the working memory
+        @rtype: bool
+        @raise InvalidImageError: if the file is not a valid image
+        """
+        with open(path, "rb") as imageFile:
+            state, workingMemory = NetworkImage(self).load(imageFile)
+
+        # close all pending resources (as clear does)
+        for (name, res) in self._resources.items():
+            if not self._init_resources.has_key(name) and hasattr(res, "close"):
+                res.close()
+        self._resources = self._init_resources
+
+        self._loadState(state)
+
+        # for behavioural consistency, notify root creation
+        self.eventsManager.fire(EventsManager.E_NODE_ADDED, self._root)
+
+        return workingMemory
+
+    def _loadState(self, state):
+        state = dict(state)
+        # modules are restored in the current modules manager:
+        # parsers linked to it (ex: the interpreter and
+        # batch ones) must see the loaded constructs
+        modulesState = state.pop("_modulesManager")
+        self._modulesManager.__dict__.clear()
+        self._modulesManager.__dict__.update(modulesState)
+        for (name, value) in state.items():
+            setattr(self, name, value)
+
     def run(self, steps=None):
         
         if steps is not None:
@@ -465,30 +896,65 @@ class Network(object):
                 if theRuns is not True:
                     theRuns -= 1
                     
-                try:
-                    pnode, token = self.agenda.getActivation()
-                    self.eventsManager.fire(EventsManager.E_RULE_FIRED, pnode.completeMainRuleName(), pnode.completeRuleName(), token.linearize(False))
-                    pnode.execute(token)
-                    
-                except AgendaNoMoreActivationError:
-                    try:
-                        # try to pop the focusStack
-                        oldFocus = self.agenda.focusStack.pop()
-                        try:
-                            newFocus = self.agenda.focusStack[-1]
-                        except IndexError:
-                            newFocus = None
-                        self.eventsManager.fire(EventsManager.E_FOCUS_CHANGED, oldFocus, newFocus)
-                        
-                    except IndexError:
-                        # pop from an empty stack
-                        break
+                if not self._runStep():
+                    break
             
         except HaltException:
             pass
         
         self.eventsManager.fire(EventsManager.E_RUN_STOP)
 
+    def _runStep(self):
+        """
+        Fire the next activation in the agenda
+        or pop the focus stack if the current focus
+        has no more activations
+        
+        @return: False if the focus stack is empty (run is complete)
+        @rtype: bool
+        """
+        try:
+            pnode, token = self.agenda.getActivation()
+            if self.eventsManager.isObserved(EventsManager.E_RULE_FIRED):
+                self.eventsManager.fire(EventsManager.E_RULE_FIRED, pnode.completeMainRuleName(), pnode.completeRuleName(), token.linearize(False))
+            pnode.execute(token)
+            
+        except AgendaNoMoreActivationError:
+            try:
+                # try to pop the focusStack
+                oldFocus = self.agenda.focusStack.pop()
+                try:
+                    newFocus = self.agenda.focusStack[-1]
+                except IndexError:
+                    newFocus = None
+                self.eventsManager.fire(EventsManager.E_FOCUS_CHANGED, oldFocus, newFocus)
+                
+            except IndexError:
+                # pop from an empty stack
+                return False
+            
+        return True
+        
+    def runAsync(self, steps=None, activations=100, budget=None):
+        """
+        Prepare a cooperative run: the run is executed
+        in slices, one slice for each iteration of the 
+        returned AsyncRun. A slice ends after
+        <activations> steps or after <budget> milliseconds,
+        so the caller's loop could serve other tasks
+        between slices
+        
+        @param steps: max number of steps (as for run)
+        @type steps: int
+        @param activations: max number of steps in a slice (None: no limit)
+        @type activations: int
+        @param budget: max time in milliseconds for a slice (None: no limit)
+        @type budget: float
+        @return: the run handle
+        @rtype: AsyncRun
+        """
+        return AsyncRun(self, steps, activations, budget)
+
     
     @property
     def agenda(self):
@@ -506,17 +972,46 @@ class Network(object):
     def facts(self):
         """
         Return the list of all fact defined in the working memory
-        for ALL defined scopes
+        for ALL defined scopes (in fact-id order)
         """
-        return self._facts.values()
-
-    def factsForScope(self, scopeName=None):
+        return list(self._factsIndex.wmes())
+    
+    def factsInRange(self, start=0, end=None, limit=None):
+        """
+        Return a list of wme for facts with
+        start <= fact-id <= end (in fact-id order)
+        @param start: the first fact-id
+        @type start: int
+        @param end: the last fact-id (None: no limit)
+        @type end: int
+        @param limit: max number of wme returned (None: no limit)
+        @type limit: int
+        @return: a list of wme
+        @rtype: list
+        """
+        return list(islice(self._factsIndex.wmes(start, end), limit))
+    
+    def factsForTemplate(self, templateName, start=0, end=None, limit=None):
+        """
+        Return a list of wme for all template facts for
+        templateName, with start <= fact-id <= end (in fact-id order)
+        @param templateName: the template name
+        @type templateName: string
+        @see: Network.factsInRange
+        @return: a list of wme
+        @rtype: list
+        """
+        return list(islice(self._factsIndex.wmesForTemplate(templateName, start, end), limit))
+    
+    def factsForScope(self, scopeName=None, start=0, end=None, limit=None):
         """
         Return a list of wme for all facts
         that can be seen in the scope for scopeName
+        (in fact-id order)
         @param scopeName: the moduleName for a defined module. If None
             the currentScope name will be used
         @type scopeName: string
+        @see: Network.factsInRange
         @return: a list of wme
         @rtype: list
         """
@@ -527,12 +1022,10 @@ class Network(object):
         else:
             theScope = self.modulesManager.currentScope
         
-        # ok, the module exists. Prepare return
-        return [wme for wme in self._facts.values()
-                            # fact can be seen if it was defined in the scope (for ordered)
-                            if wme.fact.moduleName == theScope.moduleName
-                                # of if it's a template fact and is definition is imported in the current scope 
-                                or (wme.fact.templateName is not None and theScope.templates.has(wme.fact.templateName)) ]
+        # ok, the module exists. Prepare return:
+        # fact can be seen if it was defined in the scope (for ordered)
+        # or if it's a template fact and is definition is imported in the current scope 
+        return list(islice(self._factsIndex.wmesForScope(theScope, start, end), limit))
 
     @property
     def rules(self):
@@ -546,7 +1039,7 @@ class Network(object):
     def modulesManager(self):
         return self._modulesManager
 
-    def _makeNetwork(self, node, patterns, prevPatterns=0, variables=None):
+    def _makeNetwork(self, node, patterns, prevPatterns=0, variables=None, lhsVariables=None):
         
         variables = {} if variables is None else variables
         
@@ -562,6 +1055,7 @@ class Network(object):
                 # not with the main assigned.
                 # i use the assigned only to store info about variable
                 # use old way to store variables coordinates, waiting for a new one
+                readSlots = analysis.getReadSlots(patternCE, lhsVariables)
                 if isinstance(patternCE, types.AssignedPatternCE):
                     variables[patternCE.variable.evaluate()] = VariableLocation(patternCE.variable.evaluate(), prevPatterns, fullFact=True)
                     patternCE = patternCE.pattern
@@ -576,6 +1070,7 @@ class Network(object):
                 # then a join + beta node if needed (beta join circuit)
                 alphaMemory = self._makeAlphaCircuit(alphaTests)
                 node = self._makeBetaJoinCircuit(node, alphaMemory, joinTests)
+                alphaMemory.linkReadSlots(node, readSlots)
                 
                 prevPatterns += 1
                 
@@ -589,7 +1084,7 @@ class Network(object):
                     # that's it: ncc required
                     
                     # this build the normal circuit
-                    lastNccCircuitNode, circuitPatternCount = self._makeNetwork(node, patternCE.pattern.patterns, prevPatterns, variables)
+                    lastNccCircuitNode, circuitPatternCount = self._makeNetwork(node, patternCE.pattern.patterns, prevPatterns, variables, lhsVariables)
                     node = self._makeBetaNccCircuit(node, lastNccCircuitNode, circuitPatternCount - prevPatterns )
                     # inner conditions already appended by recursive call
                     # but i have to add a +1 for the (not (...))
@@ -603,7 +1098,8 @@ class Network(object):
                     alphaTests, joinTests = analysis.analyzePattern(patternCE.pattern.pattern, prevPatterns, variables, inPatternVariables)
     
                     alphaMemory = self._makeAlphaCircuit(alphaTests)
-                    node = self._makeBetaExistsCircuit(node, alphaMemory)
+                    node = self._makeBetaExistsCircuit(node, alphaMemory, joinTests)
+                    alphaMemory.linkReadSlots(node, analysis.getReadSlots(patternCE.pattern.pattern, lhsVariables))
                     
                     prevPatterns += 1
                     
@@ -622,6 +1118,7 @@ class Network(object):
                     # then a join + beta node if needed (beta join circuit)
                     alphaMemory = self._makeAlphaCircuit(alphaTests)
                     node = self._makeBetaNegativeJoinCircuit(node, alphaMemory, joinTests)
+                    alphaMemory.linkReadSlots(node, analysis.getReadSlots(patternCE.pattern, lhsVariables))
                     
                     prevPatterns += 1
 
@@ -640,7 +1137,8 @@ class Network(object):
                 alphaTests, joinTests = analysis.analyzePattern(patternCE.pattern, prevPatterns, variables, inPatternVariables)
 
                 alphaMemory = self._makeAlphaCircuit(alphaTests)
-                node = self._makeBetaExistsCircuit(node, alphaMemory)
+                node = self._makeBetaExistsCircuit(node, alphaMemory, joinTests)
+                alphaMemory.linkReadSlots(node, analysis.getReadSlots(patternCE.pattern, lhsVariables))
                 
                 prevPatterns += 1
 
@@ -665,9 +1163,34 @@ class Network(object):
             lastCircuitNode = self._shareNode_PropertyTestNode(lastCircuitNode, tests)
         
         lastCircuitNode = self._shareNode_AlphaMemoryNode(lastCircuitNode)
-        
+
         return lastCircuitNode
-        
+
+    def findAlphaMemory(self, alphaTests):
+        """
+        Get the alpha memory for a list of alpha tests groups
+        (see analysis.analyzePattern) if the network already
+        has one. No node is created or shared
+
+        @param alphaTests: the list of alpha tests groups
+        @type alphaTests: list
+        @return: the alpha memory or None
+        @rtype: AlphaMemory
+        """
+        node = self._root
+        for tests in alphaTests:
+            for child in node.children:
+                if isinstance(child, PropertyTestNode)\
+                    and child.tests == tests:
+                    node = child
+                    break
+            else:
+                return None
+
+        if isinstance(node, PropertyTestNode) and node.hasMemory():
+            return node.memory
+        return None
+
     def _makeBetaJoinCircuit(self, lastBetaCircuitNode, alphaMemory, joinTests):
         
         if lastBetaCircuitNode != None:
@@ -702,12 +1225,12 @@ class Network(object):
         return self._shareNode_NegativeJoinNode(lastBetaCircuitNode, alphaMemory, joinTests )           
         
 
-    def _makeBetaExistsCircuit(self, lastBetaCircuitNode, alphaMemory):
+    def _makeBetaExistsCircuit(self, lastBetaCircuitNode, alphaMemory, joinTests):
         
         if lastBetaCircuitNode != None:
             lastBetaCircuitNode = self._shareNode_BetaMemory(lastBetaCircuitNode)
             
-        return self._shareNode_ExistsNode(lastBetaCircuitNode, alphaMemory )           
+        return self._shareNode_ExistsNode(lastBetaCircuitNode, alphaMemory, joinTests )           
 
 
     def _makeBetaNccCircuit(self, lastBetaCircuitNode, lastNccCircuitNode, nccCircuitLength):
@@ -847,6 +1370,8 @@ class Network(object):
         # it's time to create a new one
         
         newChild = JoinNode(rightParent=alphaMemory, leftParent=lastCircuitNode, tests=tests)
+        # tests will never change: compile them
+        newChild.compileTests()
         # link the new join to the right alpha memory
         alphaMemory.prependChild(newChild)
         
@@ -856,6 +1381,9 @@ class Network(object):
             # it's useless to update a leaf join node
             # even if it find matches
             # it has no children to propage the activation
+            
+            # unlink the node from parents if a memory is empty
+            newChild.updateLinks()
         
         
         #myclips.logger.info("New node: %s", newChild)
@@ -943,6 +1471,8 @@ class Network(object):
         # it's time to create a new one
         
         newChild = NegativeJoinNode(rightParent=alphaMemory, leftParent=lastCircuitNode, tests=tests)
+        # tests will never change: compile them
+        newChild.compileTests()
         # link the new join to the right alpha memory
         alphaMemory.prependChild(newChild)
         
@@ -969,7 +1499,7 @@ class Network(object):
         
         return newChild    
 
-    def _shareNode_ExistsNode(self, lastCircuitNode, alphaMemory):
+    def _shareNode_ExistsNode(self, lastCircuitNode, alphaMemory, tests):
             
         # check if i can share looking at beta network first
         if lastCircuitNode is not None:
@@ -980,7 +1510,10 @@ class Network(object):
                 # otherwise negative node could be shared and this is a problem
                 if (child.__class__ == ExistsNode
                     # is a exists node
-                    and child.rightParent == alphaMemory):
+                    and child.rightParent == alphaMemory
+                        # alpha memory is the same
+                        and child.tests == tests):
+                            # tests are the same too
                     
                     # i can share the node
                     self.eventsManager.fire(EventsManager.E_NODE_SHARED, child)
@@ -990,15 +1523,18 @@ class Network(object):
         # i can't share an old node
         # it's time to create a new one
         
-        newChild = ExistsNode(rightParent=alphaMemory, leftParent=lastCircuitNode)
+        newChild = ExistsNode(rightParent=alphaMemory, leftParent=lastCircuitNode, tests=tests)
+        # tests will never change: compile them
+        newChild.compileTests()
         # link the new join to the right alpha memory
         alphaMemory.prependChild(newChild)
         
         # link the join node to the parent
         lastCircuitNode.prependChild(newChild)
         
-        # try to update from the right
-        alphaMemory.updateChild(newChild)
+        # try to update from the left: tokens
+        # count supports in the alpha memory
+        lastCircuitNode.updateChild(newChild)
             
         #myclips.logger.info("New node: %s", newChild)
         #myclips.logger.info("Right-linked node: %s to %s", newChild, alphaMemory)
@@ -0,0 +1,238 @@
+'''
+Created on 17/ott/2026
+
+@author: Francesco Capozzo
+'''
+import sys
+import threading
+import types as pytypes
+import cPickle as pickle
+from myclips.MyClipsException import MyClipsException
+from myclips.FunctionsManager import FunctionDefinition
+from myclips.functions import SystemFunctionBroker
+from myclips.rete.HasJoinTests import HasJoinTests
+from myclips.rete.HasDispatchIndex import HasDispatchIndex
+from myclips.rete.nodes.PropertyTestNode import PropertyTestNode
+from myclips.rete.nodes.PNode import PNode
+
+class NetworkImage(object):
+    '''
+    Binary image of a compiled network: the rete
+    (alpha network, beta network and pnodes), modules
+    (templates, globals, deffunctions), deffacts,
+    working memory and agenda.
+
+    The image is a pickle of the network state. Objects
+    of the running environment (the network itself, the events
+    manager, the settings and system functions definitions) are
+    stored by name and linked to the network the image is
+    loaded in. The modules manager is linked too: its contents
+    (modules and scopes) are stored and restored in the
+    modules manager of the network, so parsers linked to it
+    are still valid. Compiled tests and actions (closures) can't
+    be stored: they are compiled again when the image is loaded
+    '''
+
+    MAGIC = "myclips-image"
+    VERSION = 2
+
+    STATE = ["_root", "_agenda", "_rules", "_deffacts",
+             "_facts", "_factsWmeMap", "_factsIndex", "_currentWmeId"]
+    '''network attributes stored in the image'''
+
+    STACK_SIZE = 256 * 1024 * 1024
+    RECURSION_LIMIT = 200000
+    '''the rete is a deep graph of linked objects: (un)pickling
+    is done in a thread with a bigger stack'''
+
+    def __init__(self, network):
+        '''
+        Create an image handler for the network
+
+        @param network: the network to save or to restore
+        @type network: myclips.rete.Network
+        '''
+        self._network = network
+
+    def dump(self, aFile, workingMemory):
+        '''
+        Write the network state in the file
+
+        @param aFile: a binary file opened for write
+        @param workingMemory: the state contains the working memory
+            and the agenda (or only the initial-fact)
+        @type workingMemory: bool
+        '''
+        state = dict([(name, getattr(self._network, name)) for name in self.STATE])
+        state["_modulesManager"] = dict(vars(self._network.modulesManager))
+
+        pickler = pickle.Pickler(aFile, pickle.HIGHEST_PROTOCOL)
+        pickler.persistent_id = self._reference
+
+        pickler.dump((self.MAGIC, self.VERSION, workingMemory))
+        _deep(pickler.dump, state)
+
+    def load(self, aFile):
+        '''
+        Read a network state from the file, linked to
+        the network of this image handler
+
+        @param aFile: a binary file opened for read
+        @return: a tuple (state, workingMemory): state is a dict
+            network attribute => value (_modulesManager => the
+            modules manager contents)
+        @rtype: tuple
+        @raise InvalidImageError: the file is not a valid image
+        '''
+        unpickler = pickle.Unpickler(aFile)
+        unpickler.persistent_load = self._resolve
+
+        try:
+            magic, version, workingMemory = unpickler.load()
+        except Exception, e:
+            raise InvalidImageError("Not a network image: %s"%e)
+
+        if magic != self.MAGIC or version != self.VERSION:
+            raise InvalidImageError("Unsupported network image: %s version %s"%(magic, version))
+
+        try:
+            state = _deep(unpickler.load)
+        except Exception, e:
+            raise InvalidImageError("Network image cannot be loaded: %s"%e)
+
+        self._recompile(state["_root"])
+
+        return (state, workingMemory)
+
+    def _reference(self, obj):
+        # store environment objects by name
+        if obj is self._network:
+            return ("network",)
+        elif obj is self._network.eventsManager:
+            return ("events",)
+        elif obj is self._network.settings:
+            return ("settings",)
+        elif obj is self._network.modulesManager:
+            return ("modules",)
+        elif obj is SystemFunctionBroker.definitions():
+            return ("system-functions",)
+        elif isinstance(obj, FunctionDefinition) and obj.moduleName == "?SYSTEM?":
+            return ("function", obj.name)
+        elif type(obj) is pytypes.MethodType:
+            return ("method", obj.im_self if obj.im_self is not None else obj.im_class, obj.im_func.__name__)
+        elif type(obj) is pytypes.FunctionType and not _isImportable(obj):
+            # closures are compiled again
+            return ("compiled",)
+        return None
+
+    def _resolve(self, pid):
+        if pid[0] == "network":
+            return self._network
+        elif pid[0] == "events":
+            return self._network.eventsManager
+        elif pid[0] == "settings":
+            return self._network.settings
+        elif pid[0] == "modules":
+            return self._network.modulesManager
+        elif pid[0] == "system-functions":
+            return SystemFunctionBroker.definitions()
+        elif pid[0] == "function":
+            return SystemFunctionBroker.definitions()[pid[1]]
+        elif pid[0] == "method":
+            return getattr(pid[1], pid[2])
+        elif pid[0] == "compiled":
+            return _COMPILED
+        raise pickle.UnpicklingError("Unknown reference: %s"%str(pid))
+
+    def _recompile(self, root):
+        """
+        Replace compiled tests and actions
+        (not stored in the image)
+        """
+        nodes = _nodes(root)
+
+        for node in nodes:
+            for (name, value) in node.__dict__.items():
+                if value is _COMPILED:
+                    del node.__dict__[name]
+            if isinstance(node, PropertyTestNode):
+                node.compileDispatchKeys()
+            if isinstance(node, HasJoinTests):
+                node.compileTests()
+            if isinstance(node, PNode):
+                node.compileActions()
+
+        # dispatch indexes use children keys: all
+        # children keys must be compiled first
+        for node in nodes:
+            if isinstance(node, HasDispatchIndex):
+                node.rebuildDispatchIndex()
+
+
+class InvalidImageError(MyClipsException):
+    '''
+    Raised when a network image cannot be loaded
+    '''
+    pass
+
+
+_COMPILED = object()
+'''placeholder for compiled functions in a loaded image'''
+
+def _isImportable(function):
+    """
+    Check if a function is a module level one
+    (pickle stores them by name)
+    """
+    try:
+        return getattr(sys.modules[function.__module__], function.__name__) is function
+    except (KeyError, AttributeError):
+        return False
+
+def _nodes(root):
+    """
+    Get all nodes linked to the root
+    """
+    nodes = []
+    seen = set()
+    stack = [root]
+    while len(stack) > 0:
+        node = stack.pop()
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        nodes.append(node)
+        stack.extend(node.children)
+        if isinstance(node, PropertyTestNode) and node.hasMemory():
+            stack.append(node.memory)
+    return nodes
+
+def _deep(function, *args):
+    """
+    Execute function in a thread with a big stack
+    and recursion limit
+    """
+    result = []
+    error = []
+
+    def run():
+        try:
+            result.append(function(*args))
+        except Exception:
+            error.append(sys.exc_info())
+
+    oldStackSize = threading.stack_size(NetworkImage.STACK_SIZE)
+    oldLimit = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(oldLimit, NetworkImage.RECURSION_LIMIT))
+    try:
+        thread = threading.Thread(target=run)
+        thread.start()
+        thread.join()
+    finally:
+        threading.stack_size(oldStackSize)
+        sys.setrecursionlimit(oldLimit)
+
+    if len(error) > 0:
+        raise error[0][0], error[0][1], error[0][2]
+
+    return result[0] if len(result) > 0 else None
@@ -3,14 +3,21 @@ Created on 23/lug/2012
 
 @author: Francesco Capozzo
 '''
-import collections
 from myclips.rete.Memory import Memory
 from myclips.rete.MemoryItem import MemoryItem
 
 class Token(MemoryItem):
     '''
-    classdocs
+    Token: a partial match in the beta network.
+        Tokens are linked to the parent (for tree-based removal)
+        but the wmes of the whole match are stored as a tuple
+        too (shared with the parent one), so access to an anchestor
+        wme is O(1) and linearization doesn't need to walk the
+        parents chain
     '''
+    
+    __slots__ = ('_node', '_parent', '_wme', '_wmes', '_wmesNotNone', '_factIds', '_hash', 
+                 '_children', '_negativeJoinResults', '_nccResults', '_nccOwner')
 
 
     def __init__(self, node, parentToken = None, wme = None):
@@ -22,14 +29,24 @@ class Token(MemoryItem):
         self._parent = parentToken # the parent token of this one (or None if root)
         self._wme = wme # the wme that combine with parent token to create a new match
         
-        # use hashString as an id for the token. All wmes in the token (and parents)
-        #     gave a contribute for hash creation
-        # hashString = parentHashString,wmeFactId if parent != None and wme != None
-        #    else    = parentHashString,, if wme == None
-        #    else    = wmeFactId if parent == None
-        #    else    = "" if both parent and wme == None
-        self._hashString = (",".join([parentToken.hashString, str(wme.factId) if wme is not None else ""]) if not self.isRoot()
-                                else str(wme.factId) if wme is not None else "")
+        # all wmes in the match: (parent wmes) + (wme, )
+        # the root token wme is not part of the match
+        # (like in linearize)
+        self._wmes = (parentToken._wmes + (wme,)) if parentToken is not None else ()
+        # wmes without None, built on first request
+        self._wmesNotNone = None
+        
+        # use the tuple of fact-ids as an id for the token. All wmes in the token (and parents)
+        #     gave a contribute for it
+        # factIds = parentFactIds + (wmeFactId,) if parent != None and wme != None
+        #    else  = parentFactIds + (None,) if wme == None
+        #    else  = (wmeFactId,) if parent == None
+        #    else  = () if both parent and wme == None
+        wmeFactId = wme.factId if wme is not None else None
+        self._factIds = (parentToken._factIds + (wmeFactId,) if parentToken is not None
+                            else (wmeFactId,) if wme is not None else ())
+        # the hash is computed once: token is immutable
+        self._hash = hash((id(node), self._factIds))
         
         # for faster child removal
         # i can use a dict, using token.hash for index 
@@ -45,8 +62,8 @@ class Token(MemoryItem):
         # between:
         #    1) this ---> parent (self._parent) [DONE]
         #    2) parent ---> this (parent._children) [TO BE DONE]
-        if not self.isRoot():
-            self._parent._children[self] = self
+        if parentToken is not None:
+            parentToken._children[self] = self
         
         # for tree-based token/wme removal, i need to store a reference
         # to this token in the wme that has a role in token creation
@@ -67,14 +84,28 @@ class Token(MemoryItem):
         return self._parent
     
     def linearize(self, includeNone=True):
-        current = self
-        wmes = collections.deque()
-        while not current.isRoot():
-            if includeNone or current.wme != None:
-                wmes.appendleft(current.wme)
-            current = current.parent
+        """
+        Get all wmes in the match, from the first
+        pattern to the last one
+        
+        @param includeNone: include None for not/exists/ncc matches
+        @type includeNone: boolean
+        @rtype: tuple
+        """
+        if includeNone:
+            return self._wmes
         
-        return list(wmes)
+        if self._wmesNotNone is None:
+            self._wmesNotNone = tuple([w for w in self._wmes if w is not None])
+        return self._wmesNotNone
+    
+    def anchestorWme(self, tokenRelativeIndex):
+        """
+        Get the wme of a token anchestor from the relative index
+        (0 is the wme of this token). Same as getTokenAnchestor(token, index).wme
+        but in O(1)
+        """
+        return self._wmes[-1 - tokenRelativeIndex]
         
     def delete(self):
         """
@@ -202,23 +233,47 @@ class Token(MemoryItem):
     def node(self):
         return self._node
     
+    @property
+    def factIds(self):
+        """
+        Token identity: the tuple of fact-ids of all wmes
+        in the match (None for not/exists/ncc matches)
+        
+        @rtype: tuple
+        """
+        return self._factIds
+    
     @property
     def hashString(self):
-        return self._hashString
+        """
+        Token identity as a string
+        @deprecated: use factIds
+        """
+        return (",".join([self._parent.hashString, str(self._wme.factId) if self._wme is not None else ""]) if self._parent is not None
+                    else str(self._wme.factId) if self._wme is not None else "")
 
-    def __hash__(self, *args, **kwargs):
-        return hash(str(id(self.node)) + self.hashString)
+    def __hash__(self):
+        return self._hash
     
     def __eq__(self, other):
         return (isinstance(other, Token) 
-                and self.hashString == other.hashString
-                and self.wme == other.wme
-                and self.node == other.node
-                and self.nccOwner == other.nccOwner)
+                and self._factIds == other._factIds
+                and self._node is other._node
+                and self._wme == other._wme
+                and self._nccOwner == other._nccOwner)
     
-    def __neq__(self, other):
+    def __ne__(self, other):
         return not self.__eq__(other)
     
+    def __reduce__(self):
+        # tokens are used as dict keys: the hash is set
+        # on creation, so a token could be hashed even before
+        # its state is restored (see myclips.rete.NetworkImage).
+        # The stored hash is kept: restored tokens are
+        # always found by identity, never by a new equal token
+        return (_newToken, (self._hash,), 
+                (None, dict([(slot, getattr(self, slot)) for slot in self.__slots__])))
+    
     def __str__(self):
         return ", ".join(["f-"+str(wme.factId) if wme is not None else "" for wme in self.linearize(True)])
     
@@ -232,3 +287,9 @@ class Token(MemoryItem):
 #    @parent.setter
 #    def parent(self, newParent):
 #        self._parent = newParent
+
+
+def _newToken(tokenHash):
+    token = Token.__new__(Token)
+    token._hash = tokenHash
+    return token
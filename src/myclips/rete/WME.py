@@ -10,6 +10,9 @@ class WME(MemoryItem):
     WME: a working memory element. Wrap a fact
         inside the rete network
     '''
+    
+    __slots__ = ('_alphaMemories', '_tokens', '_negativeJoinResults', 
+                 '_factId', '_fact')
 
 
     def __init__(self, factId, fact):
@@ -26,8 +29,6 @@ class WME(MemoryItem):
         '''the fact-id of this wme'''
         self._fact = fact
         '''the fact wrapped'''
-        self._existsNode = []
-        '''store references of exists node where this wme is counted'''
         
         
     def delete(self):
@@ -46,10 +47,6 @@ class WME(MemoryItem):
         for memory in self._alphaMemories:
             memory.removeItem(self)
         self._alphaMemories = []
-
-        for memory in self._existsNode:
-            memory.reduceCount()
-        self._existsNode = []
         
         # then, revoke all token where this wme
         # has a role
@@ -62,18 +59,58 @@ class WME(MemoryItem):
             
         # last but not least, njr cleanup
         #from myclips.rete.nodes.NegativeJoinNode import NegativeJoinResult
-        for njr in self._negativeJoinResults:
+        while len(self._negativeJoinResults) > 0:
+            # revoking an exists token could delete
+            # tokens (and their njrs) downstream: the
+            # list is consumed one njr at time
+            njr = self._negativeJoinResults.pop(0)
             #assert isinstance(njr, NegativeJoinResult)
-            njr.token.unlinkNegativeJoinResult(njr)
-            # after i removed a negative join result from a token
-            # i need to revaluate if the njr was the last one.
-            # if true, then token must be propagated
-            # to token creator node's children 
-            if not njr.token.hasNegativeJoinResults():
-                for child in njr.token.node.children:
-                    child.leftActivation(njr.token, None)
+            # the token creator node (negative join or exists)
+            # propagates or revokes the token if the njr
+            # was the last one
+            njr.token.node.revokeNegativeJoinResult(njr)
+        
+    def deleteFrom(self, alphaMemory, children=None):
+        """
+        Revoke only activations made by this wme 
+        through an alpha memory and remove the wme
+        from the memory. The wme is still valid
+        for other alpha memories
+        
+        @param alphaMemory: the alpha memory
+        @type alphaMemory: myclips.rete.nodes.AlphaMemory
+        @param children: revoke only activations made through
+            these children of the alpha memory. The wme is
+            not removed from the memory
+        @type children: list|None
+        """
+        if children is None:
+            alphaMemory.removeItem(self)
+            self._alphaMemories.remove(alphaMemory)
+            children = alphaMemory.children
             
-        self._negativeJoinResults = [] # for garbage collector ?
+        # nodes fed by the alpha memory
+        successors = set(children)
+        if len(successors) == 0:
+            return
+        
+        # tokens where this wme is the leader are created
+        # by children of the join node that got the wme
+        # from the alpha memory
+        toDelete = [t for t in self._tokens.itervalues() 
+                        if t.node.leftParent in successors]
+        for token in toDelete:
+            # the token could be already removed
+            # as child of a previous one
+            if self._tokens.has_key(token):
+                token.delete()
+                
+        for njr in [njr for njr in self._negativeJoinResults if njr.token.node in successors]:
+            # the njr could be already removed
+            # with a token revoked by a previous one
+            if njr in self._negativeJoinResults:
+                self._negativeJoinResults.remove(njr)
+                njr.token.node.revokeNegativeJoinResult(njr)
         
         
     @property
@@ -109,19 +146,6 @@ class WME(MemoryItem):
         """
         self._alphaMemories.remove(alphaMemory)
         
-    def linkExistsNode(self, existsNode):
-        """
-        Add a reference between this wme and an alpha-memory
-        who store it
-        """
-        self._existsNode.append(existsNode)
-        
-    def unlinkExistsNode(self, existsNode):
-        """
-        Remove a reference between this wme and an alpha-memory
-        """
-        self._existsNode.remove(existsNode)        
-        
     def linkToken(self, token):
         self._tokens[token] = token
         
@@ -143,11 +167,24 @@ class WME(MemoryItem):
     def __eq__(self, other):
         return ( isinstance(other, WME) and self.factId == other.factId)
 
-    def __neq__(self, other):
+    def __ne__(self, other):
         return not self.__eq__(other)
     
+    def __reduce__(self):
+        # wmes are used as dict keys: the fact-id is set
+        # on creation, so a wme could be hashed even before
+        # its state is restored (see myclips.rete.NetworkImage)
+        return (_newWme, (self._factId,), 
+                (None, dict([(slot, getattr(self, slot)) for slot in self.__slots__])))
+    
     #def __str__(self):
         #return "f-%-6d %s"%(self.factId, self.fact)
     
     def __repr__(self):
         return "<WME:f-%d,%s>"%(self.factId, self.fact)
+
+
+def _newWme(factId):
+    wme = WME.__new__(WME)
+    wme._factId = factId
+    return wme
@@ -44,6 +44,58 @@ def getVar(varName, variables, inPatternVariables):
 
 
 
+def getVariablesNames(aParsedType, names=None):
+    '''
+    Get the names of all variables used in a LHS fragment.
+    Fact-address variables are only collected if used
+    somewhere else in the LHS (not in the assignment)
+    
+    @param aParsedType: a pattern-ce (or a list of pattern-ce)
+    @type aParsedType: types.ParsedType|list
+    @param names: a set where names will be added
+    @type names: set
+    @rtype: set
+    '''
+    names = set() if names is None else names
+    
+    if isinstance(aParsedType, (list, tuple)):
+        for item in aParsedType:
+            getVariablesNames(item, names)
+    elif isinstance(aParsedType, (types.SingleFieldVariable, types.MultiFieldVariable)):
+        names.add(aParsedType.evaluate())
+    elif isinstance(aParsedType, types.AssignedPatternCE):
+        # skip the fact-address assignment
+        getVariablesNames(aParsedType.pattern, names)
+    elif isinstance(aParsedType, types.ParsedType) \
+            and not isinstance(aParsedType, types.BaseParsedType):
+        for field in aParsedType.__FIELDS__:
+            getVariablesNames(getattr(aParsedType, field, None), names)
+            
+    return names
+
+def getReadSlots(aPatternCE, lhsVariables=None):
+    '''
+    Get the names of slots a pattern reads from the
+    matching facts or None if every slot could be read
+    (ordered patterns and fact-address variables used 
+    in the lhs)
+    
+    @param aPatternCE: a pattern-ce
+    @type aPatternCE: types.TemplatePatternCE|types.AssignedPatternCE|types.OrderedPatternCE
+    @param lhsVariables: names of variables used in the lhs
+    @type lhsVariables: set
+    @rtype: list|None
+    '''
+    if isinstance(aPatternCE, types.AssignedPatternCE):
+        if lhsVariables is None or aPatternCE.variable.evaluate() in lhsVariables:
+            return None
+        aPatternCE = aPatternCE.pattern
+        
+    if isinstance(aPatternCE, types.TemplatePatternCE):
+        return [slot.slotName for slot in aPatternCE.templateSlots]
+    
+    return None
+
 def analyzeFunction(theFunction, patternIndex, variables, inPatternVariables=None, fakeVariables = None, realToFakeMap = None, vIndex = None, fakeNames = None):
     '''
     Analyze a FunctionCall inside a Test-CE to replace variables name with fake names
@@ -5,11 +5,12 @@ Created on 23/lug/2012
 '''
 from myclips.rete.Node import Node
 from myclips.rete.Memory import Memory
+from myclips.rete.HasLinkedChildren import HasLinkedChildren
 from myclips.rete.AlphaInput import AlphaInput
 from myclips.rete.WME import WME
 from myclips.MyClipsException import MyClipsBugException
 
-class AlphaMemory(Node, Memory, AlphaInput):
+class AlphaMemory(HasLinkedChildren, Node, Memory, AlphaInput):
     '''
     AlphaMemory: local storage for wme and feeder for beta network. 
         Stores wme matching a group of constraints (the alpha circuit
@@ -28,6 +29,45 @@ class AlphaMemory(Node, Memory, AlphaInput):
         '''
         Node.__init__(self, rightParent=parent, leftParent=None)
         Memory.__init__(self)
+        HasLinkedChildren.__init__(self)
+        
+        self._readSlots = {}
+        '''slots of the wmes read by each child pattern node
+        (None means the whole fact could be read)'''
+        
+    def linkReadSlots(self, child, slotNames):
+        """
+        Add slots read by the pattern of a child node
+        (slots are never removed, even if the pattern
+        is removed from the network)
+        @param child: the child node
+        @type child: myclips.rete.Node
+        @param slotNames: a list of slot names or None if
+            the pattern could read every slot
+        @type slotNames: list|None
+        """
+        if slotNames is None:
+            self._readSlots[child] = None
+        elif not self._readSlots.has_key(child):
+            self._readSlots[child] = set(slotNames)
+        elif self._readSlots[child] is not None:
+            self._readSlots[child].update(slotNames)
+            
+    def childrenReadingSlots(self, slotNames):
+        """
+        Get children (in activation order) with patterns
+        that could read at least one of the slots
+        @param slotNames: a set of slot names
+        @type slotNames: set
+        @rtype: list
+        """
+        children = []
+        for child in self.children:
+            # unknown children could read everything
+            readSlots = self._readSlots.get(child, None)
+            if readSlots is None or not readSlots.isdisjoint(slotNames):
+                children.append(child)
+        return children
         
         
     def rightActivation(self, wme):
@@ -52,9 +92,10 @@ class AlphaMemory(Node, Memory, AlphaInput):
         wme.linkAlphaMemory(self)
         
         # then: propagate the new wme to the
-        #     beta network
+        #     beta network (children unlinked
+        #     because their beta memory is empty are skipped)
         
-        for child in self.children:
+        for child in self.linkedChildren:
             child.rightActivation(wme)
     
     def delete(self, notifierRemoval=None, notifierUnlinking=None):
@@ -5,12 +5,13 @@ Created on 23/lug/2012
 '''
 from myclips.rete.Node import Node
 from myclips.rete.Memory import Memory
+from myclips.rete.HasLinkedChildren import HasLinkedChildren
 from myclips.rete.WME import WME
 from myclips.MyClipsException import MyClipsBugException
 from myclips.rete.BetaInput import BetaInput
 from myclips.rete.Token import Token
 
-class BetaMemory(Node, Memory, BetaInput):
+class BetaMemory(HasLinkedChildren, Node, Memory, BetaInput):
     '''
     BetaMemory: local storage for tokens.
         Combine a wme and a token that create a partial activation
@@ -28,6 +29,7 @@ class BetaMemory(Node, Memory, BetaInput):
         '''
         Node.__init__(self, rightParent=None, leftParent=leftParent)
         Memory.__init__(self)
+        HasLinkedChildren.__init__(self)
         
         
     def leftActivation(self, token, wme):
@@ -60,8 +62,9 @@ class BetaMemory(Node, Memory, BetaInput):
         
         # then: propagate the new token to
         #     all children (JoinNode/NegativeNode/etcetc...)
+        #     but join nodes with an empty alpha memory
         
-        for child in self.children:
+        for child in self.linkedChildren:
             child.leftActivation(token, None)
     
     def delete(self, notifierRemoval=None, notifierUnlinking=None):
@@ -9,63 +9,111 @@ from myclips.rete.Token import Token
 
 class ExistsNode(JoinNode, Memory):
     '''
-    Negative Join Node: check for negative conditions
-        and propagate activation only if no match
-        is possible between right items (wmes) and 
-        left items (tokens)
+    Exists Node: check for existential conditions
+        and propagate activation only if at least one match
+        is possible between right items (wmes) and
+        left items (tokens).
+        A token is stored for every left activation and
+        every matching wme is linked to it with a 
+        NegativeJoinResult: the number of results is the
+        support count of the token. The token is propagated
+        when the count goes from 0 to 1 and revoked when
+        it goes back to 0
         This node act also like a local storage
+        
+        Like JoinNode, equality variable binding tests
+        are used as keys of hash indexes in the alpha memory
+        and in the local storage
     '''
+    
+    useUnlinking = False
+    '''support counts must be updated even if the left memory is empty'''
 
 
-    def __init__(self, rightParent, leftParent):
+    def __init__(self, rightParent, leftParent, tests=None):
         '''
         Constructor
         '''
-        JoinNode.__init__(self, rightParent, leftParent, [])
+        # local storage first: JoinNode will link
+        # an hash index to it
         Memory.__init__(self)
-        self._existsCount = 0
+        JoinNode.__init__(self, rightParent, leftParent, tests)
+        
+    def _tokensMemory(self):
+        """
+        Tokens are stored in the local storage
+        """
+        return self
+        
+    def _tokenKey(self, token):
+        """
+        Tests are executed against the parent
+        token of the stored one
+        """
+        return JoinNode._tokenKey(self, token.parent)
         
     def rightActivation(self, wme):
         """
-        Check new fact activation: if something
-        is activated by the new wme, all activations
-        from this node are retracted
+        Increase the support count of all tokens
+        matching the new wme and propagate
+        tokens with the first support
         """
         
-        wme.linkExistsNode(self)
+        if self.hasIndex(self):
+            # only tokens in the same bucket could match
+            key = self._wmeKey(wme)
+            tokens = self.lookup(self, key) if key is not None else []
+            isValid = self._isValidFilter
+        else:
+            tokens = self.items
+            isValid = self.isValid
         
-        self._existsCount += 1
-
-        if self._existsCount == 1:
-            for token in self.leftParent.items:
-                token = Token(self, token, None)
-                self.addItem(token)
-                for child in self.children:
-                    child.leftActivation(token, None)
-
-    def reduceCount(self):
-        self._existsCount -= 1
-        if self._existsCount == 0:
-            Memory.delete(self)
+        for token in tokens:
+            if isValid(token.parent, wme):
+                propagate = not token.hasNegativeJoinResults()
+                # link the support between token and wme
+                NegativeJoinResult(token, wme)
+                if propagate:
+                    for child in self.children:
+                        child.leftActivation(token, None)
+                        
+    def revokeNegativeJoinResult(self, njr):
+        """
+        Remove the support of a wme to a token
+        and revoke the token if it was the last one
+        """
+        njr.token.unlinkNegativeJoinResult(njr)
+        if not njr.token.hasNegativeJoinResults():
+            njr.token.deleteChildren()
         
     def leftActivation(self, token, _):
         """
-        Left activation for Negative join node:
-            when a new token + wme come from
-            a previous JoinNode, left activation
-            try to combine the new token<token,wme> with
-            all wme in right memory and if no match is found
-            then token<token, wme> is propagated (tnx to no match)
-            Otherwise for every match, a negative join result is
-            created and linked to token and wme. no propagation
-            will ever be place until all njr aren't gone
+        Left activation for Exists node:
+            a new token is created and stored. Every wme
+            in the alpha memory matching the token is linked
+            to it as a support. The token is propagated
+            only if at least one support is found
         """
         
-        if self._existsCount > 0:
-            token = Token(self, token, None)
-            # store the token inside the memory
-            self.addItem(token)
-            
+        parentToken = token
+        token = Token(self, parentToken, None)
+        # store the token inside the memory
+        self.addItem(token)
+        
+        if self.rightParent.hasIndex(self):
+            # only wmes in the same bucket could match
+            key = self._tokenKey(token)
+            wmes = self.rightParent.lookup(self, key) if key is not None else []
+            isValid = self._isValidFilter
+        else:
+            wmes = self.rightParent.items
+            isValid = self.isValid
+        
+        for wme in wmes:
+            if isValid(parentToken, wme):
+                NegativeJoinResult(token, wme)
+        
+        if token.hasNegativeJoinResults():
             for child in self.children:
                 child.leftActivation(token, None)
                 
@@ -73,25 +121,19 @@ class ExistsNode(JoinNode, Memory):
             
     def updateChild(self, child):
         """
-        Propagate all previous match (for negative
-        match are not-match)
+        Propagate all supported tokens
         """
-        
-        if self._existsCount > 0:
-        
-            for token in self.items:
+        for token in self.items:
+            if token.hasNegativeJoinResults():
                 child.leftActivation(token, None)
     
     def delete(self, notifierRemoval=None, notifierUnlinking=None):
         """
-        Remove the negative join node from the network
+        Remove the exists node from the network
         and delete all tokens created by this node
         """
-        
-        for wme in self.rightParent.items:
-            wme.unlinkExistsNode(self)
-        
         # destroy tokens in memory
+        # (supports are removed from wmes too)
         Memory.delete(self)
             
         # then i can call parent destructor
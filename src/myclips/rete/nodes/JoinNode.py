@@ -7,10 +7,13 @@ from myclips.rete.Node import Node
 from myclips.rete.AlphaInput import AlphaInput
 from myclips.rete.BetaInput import BetaInput
 from myclips.rete.Memory import Memory
+from myclips.rete.HasLinkedChildren import HasLinkedChildren
 from myclips.rete.HasJoinTests import HasJoinTests
 from myclips.MyClipsException import MyClipsBugException
 import myclips
 from myclips.rete.Token import Token
+from myclips.rete.tests.VariableBindingTest import VariableBindingTest
+from myclips.rete.tests import compileJoinTests
 
 class JoinNode(Node, HasJoinTests, AlphaInput, BetaInput):
     '''
@@ -20,7 +23,24 @@ class JoinNode(Node, HasJoinTests, AlphaInput, BetaInput):
         (the rightParent).
         New token is created and propagated only if
         tests pass 
+        
+        Equality variable binding tests are used as keys
+        of hash indexes in both the parents memories:
+        activations just look at the matching bucket
+        and other tests are executed as a filter
+        
+        While the left memory is empty, the node is unlinked
+        from the alpha memory (right unlinking) and while
+        the alpha memory is empty, the node is unlinked from the
+        left memory (left unlinking): activations that can't
+        find any match are not delivered at all
     '''
+    
+    useHashIndexes = True
+    '''allow hash indexes creation in parent memories'''
+    
+    useUnlinking = True
+    '''allow left/right unlinking from parent memories'''
 
 
     def __init__(self, rightParent=None, leftParent=None, tests=None):
@@ -31,6 +51,126 @@ class JoinNode(Node, HasJoinTests, AlphaInput, BetaInput):
         HasJoinTests.__init__(self, tests)
         #myclips.logger.debug("JoinNode created: %s", self)
         
+        self._indexedTests = []
+        self._filterTests = self.tests
+        
+        if self.useHashIndexes:
+            self._linkIndexes()
+        
+    def _linkIndexes(self):
+        """
+        Split tests in equality tests (used as hash keys)
+        and filter tests, then create the hash indexes
+        in both parent memories
+        """
+        
+        # only non-negated binding tests between
+        # this wme and a previous one can be hashed
+        self._indexedTests = [t for t in self.tests
+                                if isinstance(t, VariableBindingTest)
+                                    and not t.reference.isNegative
+                                    and t.reference.relPatternIndex != 0]
+        
+        if len(self._indexedTests) == 0:
+            return
+        
+        self._filterTests = [t for t in self.tests if t not in self._indexedTests]
+        
+        if isinstance(self.rightParent, Memory):
+            self.rightParent.addIndex(self, self._wmeKey)
+        if self._tokensMemory() is not None:
+            self._tokensMemory().addIndex(self, self._tokenKey)
+        
+    def _unlinkIndexes(self):
+        if isinstance(self.rightParent, Memory):
+            self.rightParent.removeIndex(self)
+        if self._tokensMemory() is not None:
+            self._tokensMemory().removeIndex(self)
+            
+    def _tokensMemory(self):
+        """
+        Get the memory where tokens tested against
+        wmes are stored (the left parent)
+        
+        @rtype: Memory|None
+        """
+        return self.leftParent if isinstance(self.leftParent, Memory) else None
+        
+    def updateLinks(self):
+        """
+        Unlink the node from the alpha memory if the left memory
+        is empty, unlink the node from the left memory if the alpha
+        memory is empty, relink it otherwise.
+        The node is never unlinked from both parents: if both
+        memories are empty the node is linked to the left one,
+        so the first token will relink the node to the alpha memory.
+        Dummy join nodes (without a left memory) are never unlinked 
+        """
+        if (not self.useUnlinking
+                or not isinstance(self.leftParent, HasLinkedChildren)
+                or not isinstance(self.rightParent, HasLinkedChildren)):
+            return
+        
+        leftEmpty = self.leftParent.isEmpty()
+        
+        if leftEmpty:
+            self.rightParent.unlinkChild(self)
+            self.leftParent.relinkChild(self)
+        else:
+            self.rightParent.relinkChild(self)
+            if self.rightParent.isEmpty():
+                self.leftParent.unlinkChild(self)
+            else:
+                self.leftParent.relinkChild(self)
+        
+    def _wmeKey(self, wme):
+        """
+        Get the hash key for a wme: values
+        in the wme that equality tests compare
+        (or None if the wme can't match at all)
+        """
+        try:
+            key = tuple([_hashable(t.reference.toValue(wme)) for t in self._indexedTests])
+            hash(key)
+            return key
+        except Exception:
+            # same as a failed test
+            return None
+        
+    def _tokenKey(self, token):
+        """
+        Get the hash key for a token: values
+        in previous wmes that equality tests compare
+        (or None if the token can't match at all)
+        """
+        try:
+            key = tuple([_hashable(t.reference.reference.toValue(
+                                    token.anchestorWme((-1 * t.reference.relPatternIndex) - 1)))
+                                for t in self._indexedTests])
+            hash(key)
+            return key
+        except Exception:
+            # same as a failed test
+            return None
+        
+    def compileTests(self):
+        """
+        Compile both the full tests list and
+        the filter tests list
+        """
+        HasJoinTests.compileTests(self)
+        self._isValidFilter = compileJoinTests(self._filterTests)
+        
+    def _isValidFilter(self, token, wme):
+        """
+        Execute only tests not checked by
+        the hash index lookup
+        """
+        for test in self._filterTests:
+            if not test.isValid(token, wme):
+                return False
+        return True
+        
     def rightActivation(self, wme):
         
         leftItems = []
@@ -38,13 +178,20 @@ class JoinNode(Node, HasJoinTests, AlphaInput, BetaInput):
         # check if this is not a dummy node
         if self.isLeftRoot(): # or not isinstance(self.leftParent, Memory):
             leftItems = [Token(None, None, None)]
+            isValid = self.isValid
+        elif self.leftParent.hasIndex(self):
+            # only tokens in the same bucket could match
+            key = self._wmeKey(wme)
+            leftItems = self.leftParent.lookup(self, key) if key is not None else []
+            isValid = self._isValidFilter
         else:
             # left parent is a Memory or a subclass of Memory
             leftItems = self.leftParent.items
+            isValid = self.isValid
         
         #leftParent is a Memory or has Memory properties
         for token in leftItems:
-            if self.isValid(token, wme):
+            if isValid(token, wme):
                 # join test is valid for token + wme
                 # create new token and propagate
                 for child in self.children:
@@ -61,10 +208,20 @@ class JoinNode(Node, HasJoinTests, AlphaInput, BetaInput):
             myclips.logger.critical("Rete compiler right linked a JoinNode to a non-Memory node %s"%self.rightParent.__class__.__name__)
             raise MyClipsBugException("Invalid right parent for a JoinNode: %s"%self.rightParent.__class__.__name__)
         
-        for wme in self.rightParent.items:
-            if self.isValid(token, wme):
-                for child in self.children:
-                    child.leftActivation(token, wme)
+        if self.rightParent.hasIndex(self):
+            # only wmes in the same bucket could match
+            key = self._tokenKey(token)
+            if key is None:
+                return
+            for wme in self.rightParent.lookup(self, key):
+                if self._isValidFilter(token, wme):
+                    for child in self.children:
+                        child.leftActivation(token, wme)
+        else:
+            for wme in self.rightParent.items:
+                if self.isValid(token, wme):
+                    for child in self.children:
+                        child.leftActivation(token, wme)
         
     
     def updateChild(self, child):
@@ -95,11 +252,12 @@ class JoinNode(Node, HasJoinTests, AlphaInput, BetaInput):
         # 3)
         self._children = children_buffer
 
-#    def delete(self, notifierRemoval=None, notifierUnlinking=None):
-#        """
-#        Delete the JoinNode
-#        """
-#        Node.delete(self, notifierRemoval, notifierUnlinking)
+    def delete(self, notifierRemoval=None, notifierUnlinking=None):
+        """
+        Delete the JoinNode
+        """
+        self._unlinkIndexes()
+        Node.delete(self, notifierRemoval, notifierUnlinking)
         
     
     def __str__(self, *args, **kwargs):
@@ -113,5 +271,14 @@ class JoinNode(Node, HasJoinTests, AlphaInput, BetaInput):
                     )
         
     
+def _hashable(value):
+    """
+    Convert multifield values (lists) to tuples
+    to use them as part of an hash key
+    """
+    if isinstance(value, list):
+        return tuple([_hashable(v) for v in value])
+    return value
+    
 if __name__ == '__main__':
     print JoinNode()
\ No newline at end of file
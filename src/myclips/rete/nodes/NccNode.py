@@ -34,6 +34,10 @@ class NccNode(Node, Memory, BetaInput):
         Node.__init__(self, rightParent=None, leftParent=leftParent)
         Memory.__init__(self)
         
+        # the partner looks for the token with
+        # the same parent token and wme
+        self.addIndex(self, _ownerKey)
+        
         self._partner = NccPartnerNode(rightParent, partnerCircuitLength, self)
         
         
@@ -87,6 +91,16 @@ class NccNode(Node, Memory, BetaInput):
     def partner(self):
         return self._partner
     
+    def getOwnerToken(self, parentToken, parentWme):
+        """
+        Get the token in the memory created by
+        a parent token + wme (or None)
+        
+        @rtype: Token|None
+        """
+        owners = self.lookup(self, (parentToken, parentWme))
+        return owners[0] if len(owners) > 0 else None
+    
     
     def __str__(self, *args, **kwargs):
         return "<{0}: left={2}, right={3}, children={4}, items={5}, partner={6}>".format(
@@ -98,5 +112,11 @@ class NccNode(Node, Memory, BetaInput):
                         len(self._items),
                         str(id(self.partner)) if self.partner is not None else "None"
                     )
-        
-    
\ No newline at end of file
+
+
+def _ownerKey(token):
+    """
+    Hash key for ncc tokens: the parent token
+    and the wme that created it
+    """
+    return (token.parent, token.wme)
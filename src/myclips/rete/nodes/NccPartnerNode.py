@@ -63,32 +63,29 @@ class NccPartnerNode(Node, BetaInput):
             parentWme = parentToken.wme
             parentToken = parentToken.parent
         
-        # 2) problem 2: new i need to scan all the ncc main memory
-        #    and find a token with the same parent token and wme
-        for mToken in self.nccNode.items:
-            # optimization: puth wme comparison first because is
-            #    faster then token comparison
-            if mToken.wme == parentWme and mToken.parent == parentToken:
-                # 3a) 
-                # I found a token who match both circuits
-                # this is a new ncc result
-                # so it's time to link it
-                mToken.linkNccResult(nToken)
-                # nToken owner is set by the linkNccResult automatically 
-                
-                # i need to destroy all children of the
-                # mToken because they are revocated now
-                mToken.deleteChildren()
-                
-                # the function end on first match:
-                #    - there is no reason to keep scanning the main ncc memory
-                #        because only one match can be found
-                #    - there is no reason to stay in this method, no need to
-                #        to store the nToken in the buffer. It's has been just evaluated
-                return
+        # 2) problem 2: new i need to find the token in the ncc main
+        #    memory with the same parent token and wme (ncc node
+        #    keeps an index for it: no scan is needed)
+        mToken = self.nccNode.getOwnerToken(parentToken, parentWme)
+        if mToken is not None:
+            # 3a) 
+            # I found a token who match both circuits
+            # this is a new ncc result
+            # so it's time to link it
+            mToken.linkNccResult(nToken)
+            # nToken owner is set by the linkNccResult automatically 
+            
+            # i need to destroy all children of the
+            # mToken because they are revocated now
+            mToken.deleteChildren()
+            
+            # only one match can be found:
+            # no need to store the nToken in the buffer.
+            # It's has been just evaluated
+            return
         
         # 3b)
-        # if no match has been found in the for loop
+        # if no match has been found
         # means that: 
         #    - there is no match at all
         #    OR
@@ -14,15 +14,30 @@ class NegativeJoinNode(JoinNode, Memory):
         is possible between right items (wmes) and 
         left items (tokens)
         This node act also like a local storage
+        
+        Like JoinNode, equality variable binding tests
+        are used as keys of hash indexes in the alpha memory
+        and in the local storage
     '''
+    
+    useUnlinking = False
+    '''tokens must be propagated even if the alpha memory is empty'''
 
 
     def __init__(self, rightParent, leftParent, tests=None):
         '''
         Constructor
         '''
-        JoinNode.__init__(self, rightParent=rightParent, leftParent=leftParent, tests=tests)
+        # local storage first: JoinNode will link
+        # an hash index to it
         Memory.__init__(self)
+        JoinNode.__init__(self, rightParent=rightParent, leftParent=leftParent, tests=tests)
+        
+    def _tokensMemory(self):
+        """
+        Tokens are stored in the local storage
+        """
+        return self
         
     def rightActivation(self, wme):
         """
@@ -37,8 +52,17 @@ class NegativeJoinNode(JoinNode, Memory):
         # and a negative join result must be created to store
         # the match
         
-        for token in self.items:
-            if self.isValid(token, wme):
+        if self.hasIndex(self):
+            # only tokens in the same bucket could match
+            key = self._wmeKey(wme)
+            tokens = self.lookup(self, key) if key is not None else []
+            isValid = self._isValidFilter
+        else:
+            tokens = self.items
+            isValid = self.isValid
+        
+        for token in tokens:
+            if isValid(token, wme):
                 # found a match between token and wme
                 # checking if something has been propagated by the token
                 if not token.hasNegativeJoinResults():
@@ -51,6 +75,19 @@ class NegativeJoinNode(JoinNode, Memory):
                 # a reference to the njr is automatically
                 # insered inside token and wme
                 
+    def revokeNegativeJoinResult(self, njr):
+        """
+        Remove a negative join result (the wme is gone)
+        and propagate the token if it was the last one
+        """
+        njr.token.unlinkNegativeJoinResult(njr)
+        # after i removed a negative join result from a token
+        # i need to revaluate if the njr was the last one.
+        # if true, then token must be propagated
+        # to children 
+        if not njr.token.hasNegativeJoinResults():
+            for child in self.children:
+                child.leftActivation(njr.token, None)
         
     def leftActivation(self, token, wme):
         """
@@ -83,10 +120,19 @@ class NegativeJoinNode(JoinNode, Memory):
         # that comes from the alpha memory on the
         # right side of the node
         
+        if self.rightParent.hasIndex(self):
+            # only wmes in the same bucket could match
+            key = self._tokenKey(token)
+            wmes = self.rightParent.lookup(self, key) if key is not None else []
+            isValid = self._isValidFilter
+        else:
+            wmes = self.rightParent.items
+            isValid = self.isValid
+        
         # i can reuse wme variable because old value
         # is useless after the newToken creation
-        for wme in self.rightParent.items:
-            if self.isValid(token, wme):
+        for wme in wmes:
+            if isValid(token, wme):
                 # for each match i create a NegativeJoinResult
                 # to store the info
                 NegativeJoinResult(token, wme)
@@ -99,9 +99,15 @@ class PNode(Node, BetaInput, Memory):
                 self.leftParent == other.leftParent and
                 self.rhs == other.rhs)
         
-    def __neq__(self, other):
+    def __ne__(self, other):
         return not self.__eq__(other)
     
+    def __reduce__(self):
+        # pnodes are used as dict keys: names are set
+        # on creation, so a pnode could be hashed even before
+        # its state is restored (see myclips.rete.NetworkImage)
+        return (_newPNode, (self._ruleName, self._moduleName), self.__dict__)
+    
     def getSalience(self):
         return int(self.getProperty("salience", 0))
     
@@ -160,6 +166,42 @@ class PNode(Node, BetaInput, Memory):
         
         # profit?!
         
-    
-    
-    
\ No newline at end of file
+    def compileActions(self):
+        """
+        Replace execute with a function compiled from the
+        variables locations and the rhs actions: locations are
+        resolved to wme -> value functions (see AtomLocation.compileToValue)
+        and function calls to handlers (see Function.compileCall).
+        Variables and actions must not be changed after compilation
+        """
+        
+        bindings = [(theVar, theLocation.patternIndex, theLocation.compileToValue()) 
+                        for (theVar, theLocation) in self._variables.items()]
+        actions = [Function.compileCall(action) for action in (self._rhs or [])]
+        
+        network = self._network
+        interpretedExecute = self.execute
+        
+        def execute(theToken):
+            
+            wmes = theToken._wmes
+            try:
+                resolved = {theVar: toValue(wmes[patternIndex]) for (theVar, patternIndex, toValue) in bindings}
+            except Exception:
+                # some variables are unresolvable:
+                # resolve (and log) them one by one
+                return interpretedExecute(theToken)
+            
+            theEnv = FunctionEnv(resolved, network, network.modulesManager, network.resources)
+            
+            for action in actions:
+                action(theEnv)
+                
+        self.execute = execute
+
+
+def _newPNode(ruleName, moduleName):
+    pnode = PNode.__new__(PNode)
+    pnode._ruleName = ruleName
+    pnode._moduleName = moduleName
+    return pnode
@@ -7,13 +7,16 @@ from myclips.rete.Node import Node
 from myclips.rete.HasMemory import HasMemory
 from myclips.rete.HasTests import HasTests
 from myclips.rete.AlphaInput import AlphaInput
+from myclips.rete.HasDispatchIndex import HasDispatchIndex
 import myclips
 
-class PropertyTestNode(Node, HasMemory, HasTests, AlphaInput):
+class PropertyTestNode(HasDispatchIndex, Node, HasMemory, HasTests, AlphaInput):
     '''
     Execute a test over some properties of
     a wme
     This node is part of Alpha Network 
+    Wmes are routed to children through 
+    the dispatch index
     '''
 
 
@@ -24,8 +27,30 @@ class PropertyTestNode(Node, HasMemory, HasTests, AlphaInput):
         Node.__init__(self, rightParent=parent)
         HasMemory.__init__(self, None)
         HasTests.__init__(self, tests)
+        HasDispatchIndex.__init__(self)
         #Tester.__init__(self. tests)
         
+        # tests never change: the dispatch key is computed once.
+        self.compileDispatchKeys()
+        
+    def compileDispatchKeys(self):
+        """
+        Compute the dispatch keys of the node from tests:
+        all tests must be valid, the first dispatchable one is enough
+        """
+        self._dispatchKey = None
+        for test in (self.tests or []):
+            self._dispatchKey = test.getDispatchKeys()
+            if self._dispatchKey is not None:
+                break
+        
+    def getDispatchKeys(self):
+        """
+        Get the dispatch keys of the node (if
+        the node tests could be dispatched by the parent)
+        """
+        return self._dispatchKey
+        
     def isLeaf(self):
         return not self.hasMemory() and Node.isLeaf(self)
 
@@ -43,8 +68,8 @@ class PropertyTestNode(Node, HasMemory, HasTests, AlphaInput):
                 self.memory.rightActivation(wme)
             
             # propagate this wme to all childs
-            for child in self.children:
-                child.rightActivation(wme)
+            # that could be activated
+            self.dispatch(wme)
                 
     def updateChild(self, child):
         # to update a child i can read 
@@ -61,6 +86,8 @@ class PropertyTestNode(Node, HasMemory, HasTests, AlphaInput):
             
             self.memory = None
             self._children = [child]
+            # disable the dispatch index while children are swapped
+            self._dispatching = False
             
             # this will call the right activation for this node
             # and will forward (if possible)
@@ -70,6 +97,7 @@ class PropertyTestNode(Node, HasMemory, HasTests, AlphaInput):
             # then restore old memory and children
             self.memory = oldMemory
             self._children = oldChildren
+            self._dispatching = True
     
     
     # alias for rightActivation
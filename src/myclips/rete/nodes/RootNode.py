@@ -5,13 +5,16 @@ Created on 04/lug/2012
 '''
 from myclips.rete.Node import Node
 from myclips.rete.AlphaInput import AlphaInput
+from myclips.rete.HasDispatchIndex import HasDispatchIndex
 import myclips
 
-class RootNode(Node, AlphaInput):
+class RootNode(HasDispatchIndex, Node, AlphaInput):
     '''
     Execute a test over some properties of
     a wme
     This node is part of Alpha Network 
+    Wmes are routed to children through 
+    the dispatch index
     '''
 
 
@@ -20,15 +23,15 @@ class RootNode(Node, AlphaInput):
         Constructor
         '''
         Node.__init__(self)
+        HasDispatchIndex.__init__(self)
         self._network = network
 
     def rightActivation(self, wme):
         """
         Simply forward all wme to children
+        (only to children that could be activated)
         """
-        # propagate this wme to all childs
-        for child in self.children:
-            child.rightActivation(wme)
+        self.dispatch(wme)
                 
     def updateChild(self, child):
         """
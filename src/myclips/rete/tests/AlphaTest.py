@@ -12,6 +12,35 @@ class AlphaTest(object):
     def isValid(self, wme):
         raise NotImplementedError()
     
+    def getDispatchKey(self):
+        '''
+        Get a (discriminator, keyFunction, value) tuple
+        if the test is valid only when keyFunction(wme) == value,
+        so it could be hash-dispatched by the parent node.
+        Tests with the same discriminator must use
+        equivalent key functions
+        Returns None if the test can't be dispatched
+        
+        @rtype: tuple|None
+        '''
+        return None
+    
+    def getDispatchKeys(self):
+        '''
+        Get a (discriminator, keyFunction, values) tuple
+        if the test is valid only when keyFunction(wme) is one
+        of the values. By default, values has the only value 
+        of getDispatchKey
+        Returns None if the test can't be dispatched
+        
+        @rtype: tuple|None
+        '''
+        dispatchKey = self.getDispatchKey()
+        if dispatchKey is None:
+            return None
+        discriminator, keyFunction, value = dispatchKey
+        return (discriminator, keyFunction, (value,))
+    
 
     def __eq__(self, other):
         return (self.__class__ == other.__class__)
@@ -17,6 +17,18 @@ class BetaTest(object):
         """
         raise NotImplementedError()
     
+    def compile(self):
+        """
+        Get a function (token, wme) -> boolean equivalent
+        to isValid. Subclasses could return a specialized
+        function without exceptions handling (exceptions
+        are handled once by compileJoinTests).
+        The default is isValid itself
+        
+        @rtype: callable
+        """
+        return self.isValid
+    
     def __eq__(self, other):
         return (self.__class__ == other.__class__)
     
@@ -72,6 +72,23 @@ class ConstantValueAtIndexTest(AlphaTest):
             myclips.logger.warn("Unexpected exception caught in ConstantValueAtIndexTest: %s", repr(e))
             return False
     
+    def getDispatchKey(self):
+        if self.valueType == list:
+            return None
+        
+        index = self.index
+        valueAt = index.compileToValue()
+        
+        def wmeValueKey(wme):
+            wmeValue = valueAt(wme)
+            return (wmeValue.__class__, wmeValue.evaluate())
+        
+        return (("constant", index.slotName, index.fromBegin, index.beginIndex, 
+                    index.fromEnd, index.endIndex, index.isMultiField, 
+                    index.fullFact, index.fullSlot),
+                wmeValueKey,
+                (self.valueType, self.value.evaluate()))
+    
     def __str__(self, *args, **kwargs):
         return "%s=%s"%(str(self.index),
                                self.value)
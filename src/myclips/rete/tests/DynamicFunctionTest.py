@@ -5,7 +5,6 @@ Created on 24/lug/2012
 '''
 from myclips.rete.tests.BetaTest import BetaTest
 import myclips
-from myclips.rete.tests import getTokenAnchestor
 import myclips.parser.Types as types
 
 class DynamicFunctionTest(BetaTest):
@@ -66,10 +65,8 @@ class DynamicFunctionTest(BetaTest):
                 # this means that the wme where the variable was found first
                 # is the same where the variable was found again
                 if reference.relPatternIndex != 0:
-                    nToken = getTokenAnchestor(token, (-1 * reference.relPatternIndex) - 1)
-        
                     # get the exact wme value of the token where variable for used first
-                    valueInTokenWme = reference.reference.toValue(nToken.wme)
+                    valueInTokenWme = reference.reference.toValue(token.anchestorWme((-1 * reference.relPatternIndex) - 1))
                 else:
                     valueInTokenWme = reference.reference.toValue(wme)
                 
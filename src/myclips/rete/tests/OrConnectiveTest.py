@@ -37,6 +37,32 @@ class OrConnectiveTest(AlphaTest, BetaTest):
             myclips.logger.warn("Unexpected exception caught in OrConnectiveTest: %s", repr(e))
             return False
     
+    def getDispatchKeys(self):
+        """
+        The OR of dispatchable tests with the same
+        discriminator is valid only for one
+        of their values
+        """
+        values = []
+        discriminator = None
+        keyFunction = None
+        for sTest in self.tests:
+            if not isinstance(sTest, AlphaTest):
+                return None
+            dispatchKeys = sTest.getDispatchKeys()
+            if dispatchKeys is None:
+                return None
+            if discriminator is None:
+                discriminator, keyFunction, _ = dispatchKeys
+            elif discriminator != dispatchKeys[0]:
+                return None
+            values.extend(dispatchKeys[2])
+            
+        if discriminator is None:
+            return None
+        
+        return (discriminator, keyFunction, tuple(values))
+    
     def __str__(self, *args, **kwargs):
         return "OR(" + ",\n".join([str(x) for x in self.tests]) + ")"
         
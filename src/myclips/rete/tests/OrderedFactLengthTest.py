@@ -36,6 +36,9 @@ class OrderedFactLengthTest(AlphaTest):
             myclips.logger.warn("Unexpected exception caught in OrderedFactLengthTest: %s", repr(e))
             return False
     
+    def getDispatchKey(self):
+        return ("length", _wmeLength, self.length)
+    
     def __str__(self, *args, **kwargs):
         return "#wme=%s"%self.length
         
@@ -43,3 +46,5 @@ class OrderedFactLengthTest(AlphaTest):
         return self.__class__ == other.__class__ \
                 and self.length == other.length
                 
+def _wmeLength(wme):
+    return len(wme._fact)
@@ -26,10 +26,15 @@ class ScopeTest(AlphaTest):
         assert isinstance(wme, WME)
         return wme.fact.moduleName == self.moduleName
     
+    def getDispatchKey(self):
+        return ("scope", _wmeModuleName, self.moduleName)
+    
     def __str__(self, *args, **kwargs):
         return "Scope=%s"%self.moduleName
     
     def __eq__(self, other):
         return self.__class__ == other.__class__ \
                 and self.moduleName == other.moduleName
-                
\ No newline at end of file
+                
+def _wmeModuleName(wme):
+    return wme._fact.moduleName
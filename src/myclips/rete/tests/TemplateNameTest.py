@@ -29,10 +29,15 @@ class TemplateNameTest(AlphaTest):
         except:
             return False
     
+    def getDispatchKey(self):
+        return ("template", _wmeTemplateName, self.templateName)
+    
     def __str__(self, *args, **kwargs):
         return "Template=%s"%self.templateName
     
     def __eq__(self, other):
         return self.__class__ == other.__class__ \
                 and self.templateName == other.templateName
-                
\ No newline at end of file
+                
+def _wmeTemplateName(wme):
+    return wme._fact.templateName
@@ -6,7 +6,7 @@ Created on 24/lug/2012
 from myclips.rete.tests.BetaTest import BetaTest
 import myclips
 from myclips.rete.tests.locations import VariableReference
-from myclips.rete.tests import getTokenAnchestor
+from myclips.rete.tests import compileTokenAnchestorWme
 
 class VariableBindingTest(BetaTest):
     '''
@@ -53,10 +53,8 @@ class VariableBindingTest(BetaTest):
             # this means that the wme where the variable was found first
             # is the same where the variable was found again
             if reference.relPatternIndex != 0:
-                nToken = getTokenAnchestor(token, (-1 * reference.relPatternIndex) - 1)
-    
                 # get the exact wme value of the token where variable for used first
-                valueInTokenWme = reference.reference.toValue(nToken.wme)
+                valueInTokenWme = reference.reference.toValue(token.anchestorWme((-1 * reference.relPatternIndex) - 1))
             else:
                 valueInTokenWme = reference.reference.toValue(wme)
             
@@ -83,6 +81,33 @@ class VariableBindingTest(BetaTest):
             # anyway test failed
             return False
     
+    def compile(self):
+        """
+        Build a function (token, wme) -> boolean
+        specialized for the reference. Exceptions
+        are not handled here
+        """
+        
+        reference = self._reference
+        
+        valueInWme = reference.compileToValue()
+        valueInTokenWme = reference.reference.compileToValue()
+        isNegative = (reference.isNegative is True)
+        
+        if reference.relPatternIndex != 0:
+            tokenWme = compileTokenAnchestorWme((-1 * reference.relPatternIndex) - 1)
+            
+            if not isNegative:
+                return lambda token, wme: valueInTokenWme(tokenWme(token)) == valueInWme(wme)
+            else:
+                return lambda token, wme: not (valueInTokenWme(tokenWme(token)) == valueInWme(wme))
+        else:
+            # intra-element test
+            if not isNegative:
+                return lambda token, wme: valueInTokenWme(wme) == valueInWme(wme)
+            else:
+                return lambda token, wme: not (valueInTokenWme(wme) == valueInWme(wme))
+    
     def __str__(self, *args, **kwargs):
         return str(self._reference)
     
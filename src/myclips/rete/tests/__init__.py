@@ -1,6 +1,7 @@
 from myclips.rete.WME import WME
 from myclips.rete.Token import Token
 from myclips.rete.tests.locations import AtomLocation
+import myclips
 
 def getTokenAnchestor(token, tokenRelativeIndex):
     """
@@ -13,6 +14,58 @@ def getTokenAnchestor(token, tokenRelativeIndex):
         token = token.parent
         
     return token
+
+def compileTokenAnchestorWme(tokenRelativeIndex):
+    """
+    Build a function token -> wme that get the
+    wme of a token anchestor from the relative index
+    (like getTokenAnchestor(token, tokenRelativeIndex).wme)
+    """
+    wmeIndex = -1 - tokenRelativeIndex
+    return lambda token: token._wmes[wmeIndex]
+    
+def compileJoinTests(tests):
+    """
+    Compile a list of BetaTest in a single function
+    (token, wme) -> boolean that short-circuits on the
+    first failed test. Exceptions are handled once for
+    the whole list: a KeyError/IndexError means the wme
+    has no such index, so the tests fail
+    
+    @param tests: a list of BetaTest
+    @type tests: list
+    @rtype: callable
+    """
+    
+    if tests is None or len(tests) == 0:
+        return lambda token, wme: True
+    
+    compiled = [test.compile() for test in tests]
+    
+    if len(compiled) == 1:
+        theTest = compiled[0]
+        def isValid(token, wme):
+            try:
+                return theTest(token, wme)
+            except (KeyError, IndexError):
+                return False
+            except Exception, e:
+                myclips.logger.warning("Unexpected exception caught in %s: token=%s, wme=%s, exception=%s", tests[0], token, wme, repr(e))
+                return False
+    else:
+        def isValid(token, wme):
+            try:
+                for theTest in compiled:
+                    if not theTest(token, wme):
+                        return False
+                return True
+            except (KeyError, IndexError):
+                return False
+            except Exception, e:
+                myclips.logger.warning("Unexpected exception caught in %s: token=%s, wme=%s, exception=%s", [str(t) for t in tests], token, wme, repr(e))
+                return False
+        
+    return isValid
     
 def getWmeFragmentValue(wme, location):
     """
@@ -52,6 +52,50 @@ class AtomLocation(object):
     
         return wmeValue        
         
+    def compileToValue(self):
+        """
+        Build a function wme -> value specialized for this
+        location. It's the same as toValue, but location
+        properties are resolved once and fact's values
+        are read directly
+        
+        @rtype: callable
+        """
+        
+        if self.fullFact:
+            return lambda theWme: theWme
+        
+        slotName = self.slotName
+        
+        if self.fullSlot:
+            if slotName is not None:
+                return lambda theWme: theWme._fact._values[slotName]
+            else:
+                return lambda theWme: theWme._fact
+        
+        if self.isMultiField:
+            beginIndex = self.beginIndex
+            endIndex = self.endIndex if self.endIndex != 0 else None
+            if slotName is not None:
+                return lambda theWme: theWme._fact._values[slotName][beginIndex:endIndex]
+            else:
+                return lambda theWme: theWme._fact._values[beginIndex:endIndex]
+            
+        if self.fromBegin:
+            index = self.beginIndex
+        elif self.fromEnd:
+            index = self.endIndex - 1
+        else:
+            # no index at all: the slot value (or the fact)
+            if slotName is not None:
+                return lambda theWme: theWme._fact._values[slotName]
+            else:
+                return lambda theWme: theWme._fact
+            
+        if slotName is not None:
+            return lambda theWme: theWme._fact._values[slotName][index]
+        else:
+            return lambda theWme: theWme._fact._values[index]
 
     @property
     def patternIndex(self):
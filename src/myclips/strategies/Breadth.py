@@ -13,23 +13,26 @@ class Breadth(Strategy):
     NAME = "breadth"
     
     def newContainer(self):
-        return collections.deque()
+        # activations are indexed by token, so
+        # they can be removed without a scan
+        return collections.OrderedDict()
     
     def insert(self, perSalienceContainer, thePNode, theToken):
-        perSalienceContainer.append((thePNode, theToken))
+        perSalienceContainer[theToken] = (thePNode, theToken)
         
     def pop(self, perSalienceContainer):
-        return perSalienceContainer.popleft()
+        return perSalienceContainer.popitem(False)[1]
     
     def resort(self, perSalienceContainer, theOldStrategy):
-        return collections.deque(sorted(theOldStrategy.iterable(perSalienceContainer),key=lambda x: self._get_max_epoch(x[1])))
+        return collections.OrderedDict((theToken, (thePNode, theToken)) 
+                    for (thePNode, theToken) in sorted(theOldStrategy.iterable(perSalienceContainer), key=lambda x: self._get_max_epoch(x[1])))
             
     def remove(self, perSalienceContainer, thePNode, theToken):
-        perSalienceContainer.remove((thePNode, theToken))
+        del perSalienceContainer[theToken]
         
     def iterable(self, perSalienceContainer):
-        return perSalienceContainer
+        # from the lower to the higher priority
+        return list(reversed(perSalienceContainer.values()))
     
     def _get_max_epoch(self, token):
-        return max([x.factId for x in token.linearize(False)])
-    
\ No newline at end of file
+        return max([x for x in token.factIds if x is not None] or [-1])
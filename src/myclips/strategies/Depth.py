@@ -4,6 +4,7 @@ Created on 01/ago/2012
 @author: Francesco Capozzo
 '''
 from myclips.strategies import Strategy
+import collections
 
 class Depth(Strategy):
     '''
@@ -13,26 +14,27 @@ class Depth(Strategy):
     NAME = "depth"
     
     def newContainer(self):
-        return []
+        # activations are indexed by token, so
+        # they can be removed without a scan
+        return collections.OrderedDict()
     
     def insert(self, perSalienceContainer, thePNode, theToken):
-        perSalienceContainer.append((thePNode, theToken))
+        perSalienceContainer[theToken] = (thePNode, theToken)
         
     def pop(self, perSalienceContainer):
-        return perSalienceContainer.pop()
+        return perSalienceContainer.popitem(True)[1]
     
     def resort(self, perSalienceContainer, theOldStrategy):
-        if isinstance(perSalienceContainer, list):
-            # if old strategy use list too, in-place sort is possible
-            perSalienceContainer.sort(key=lambda x: self._get_max_epoch(x[1]), reverse=True)
-        else:
-            return [theOldStrategy.iterable(perSalienceContainer)].sort(key=lambda x: self._get_max_epoch(x[1]), reverse=True)
+        # the most recent activation must be the last one
+        # (old strategy order is kept for same recency activations)
+        return collections.OrderedDict((theToken, (thePNode, theToken)) 
+                    for (thePNode, theToken) in sorted(theOldStrategy.iterable(perSalienceContainer), key=lambda x: self._get_max_epoch(x[1])))
             
     def remove(self, perSalienceContainer, thePNode, theToken):
-        perSalienceContainer.remove((thePNode, theToken))
+        del perSalienceContainer[theToken]
         
     def iterable(self, perSalienceContainer):
-        return perSalienceContainer
+        return perSalienceContainer.values()
     
     def _get_max_epoch(self, token):
-        return max([x.factId for x in token.linearize(False)])
\ No newline at end of file
+        return max([x for x in token.factIds if x is not None] or [-1])
@@ -3,46 +3,16 @@ Created on 01/ago/2012
 
 @author: Francesco Capozzo
 '''
-from myclips.strategies import Strategy
+from myclips.strategies import SortedStrategy
 
-try:
+class Lex(SortedStrategy):
+    '''
+    Adds new activations using a LEX strategy:
+        activations are sorted by recency of the facts
+        (compared from the most recent one), then
+        by specificity of the rule 
+    '''
+    NAME = "lex"
     
-    import blist
-
-except ImportError:
-    
-    from myclips.strategies.Depth import Depth as Lex
-    import myclips
-    
-    myclips.logger.warning("BList library is required by Lex strategy. Depth will be used in place of Lex")
-    myclips.logger.warning("\tPlease install BList: easy_install blist")
-    
-else:
-
-    class Lex(Strategy):
-        '''
-        Adds new activations using a LEX strategy 
-        '''
-        NAME = "lex"
-        
-        def newContainer(self):
-            return blist.sortedlist(key=lambda x: self._sort_epoch(x[1]))
-        
-        def insert(self, perSalienceContainer, thePNode, theToken):
-            perSalienceContainer.add((thePNode, theToken))
-            
-        def pop(self, perSalienceContainer):
-            return perSalienceContainer.pop()
-        
-        def resort(self, perSalienceContainer, theOldStrategy):
-            return blist.sortedlist(iterable=theOldStrategy.iterable(perSalienceContainer),key=lambda x: self._sort_epoch(x[1]))
-                
-        def remove(self, perSalienceContainer, thePNode, theToken):
-            perSalienceContainer.remove((thePNode, theToken))
-            
-        def iterable(self, perSalienceContainer):
-            return list(perSalienceContainer)
-        
-        def _sort_epoch(self, theToken):
-            return sorted([x.factId for x in theToken.linearize(False)])
-
+    def key(self, thePNode, theToken):
+        return (self._recency(theToken), -thePNode.getProperty('specificity', 0))
@@ -3,46 +3,19 @@ Created on 01/ago/2012
 
 @author: Francesco Capozzo
 '''
-from myclips.strategies import Strategy
+from myclips.strategies import SortedStrategy
 
-try:
+class Mea(SortedStrategy):
+    '''
+    Adds new activations using a MEA strategy:
+        activations are sorted by recency of the fact
+        matching the first pattern, then like the LEX strategy 
+    '''
+    NAME = "mea"
     
-    import blist
-
-except ImportError:
-    
-    from myclips.strategies.Depth import Depth as Mea
-    import myclips
-    
-    myclips.logger.warning("BList library is required by Mea strategy. Depth will be used in place of Mea")
-    myclips.logger.warning("\tPlease install BList: easy_install blist")
+    def key(self, thePNode, theToken):
+        return (-self._first_epoch(theToken), self._recency(theToken), -thePNode.getProperty('specificity', 0))
     
-else:
-
-    class Mea(Strategy):
-        '''
-        Adds new activations using a MEA strategy 
-        '''
-        NAME = "mea"
-        
-        def newContainer(self):
-            return blist.sortedlist(key=lambda x: self._first_epoc(x[1]))
-        
-        def insert(self, perSalienceContainer, thePNode, theToken):
-            perSalienceContainer.add((thePNode, theToken))
-            
-        def pop(self, perSalienceContainer):
-            return perSalienceContainer.pop(0)
-        
-        def resort(self, perSalienceContainer, theOldStrategy):
-            return blist.sortedlist(iterable=theOldStrategy.iterable(perSalienceContainer),key=lambda x: self._first_epoc(x[1]))
-                
-        def remove(self, perSalienceContainer, thePNode, theToken):
-            perSalienceContainer.remove((thePNode, theToken))
-            
-        def iterable(self, perSalienceContainer):
-            return list(perSalienceContainer)
-        
-        def _first_epoc(self, theToken):
-            return min([x.factId for x in theToken.linearize(False)])
-
+    def _first_epoch(self, theToken):
+        firstId = theToken.factIds[0] if len(theToken.factIds) > 0 else None
+        return firstId if firstId is not None else -1
@@ -13,27 +13,62 @@ class Random(Strategy):
     NAME = "random"
     
     def newContainer(self):
-        return []
+        return RandomContainer()
     
     def insert(self, perSalienceContainer, thePNode, theToken):
-        rand_index = random.randrange(0, len(perSalienceContainer))
-        perSalienceContainer.insert(rand_index, (thePNode, theToken))
+        perSalienceContainer.append(thePNode, theToken)
         
     def pop(self, perSalienceContainer):
-        return perSalienceContainer.pop()
+        # pick a random activation
+        return perSalienceContainer.pop(random.randrange(0, len(perSalienceContainer)))
     
     def resort(self, perSalienceContainer, theOldStrategy):
-        if isinstance(perSalienceContainer, list):
-            # if old strategy use list too, in-place sort is possible
-            random.shuffle(perSalienceContainer)
-        else:
-            perSalienceContainer = [theOldStrategy.iterable(perSalienceContainer)]
-            random.shuffle(perSalienceContainer)
-            return perSalienceContainer
+        activations = list(theOldStrategy.iterable(perSalienceContainer))
+        random.shuffle(activations)
+        newContainer = self.newContainer()
+        for (thePNode, theToken) in activations:
+            newContainer.append(thePNode, theToken)
+        return newContainer
             
     def remove(self, perSalienceContainer, thePNode, theToken):
-        perSalienceContainer.remove((thePNode, theToken))
+        perSalienceContainer.pop(perSalienceContainer.indexOf(theToken))
         
     def iterable(self, perSalienceContainer):
-        return perSalienceContainer
+        return perSalienceContainer.activations()
+    
+    
+class RandomContainer(object):
+    '''
+    List of activations with a token => position index:
+    removal swaps the removed activation with the last one,
+    so both pop and remove don't need to scan or shift the list
+    '''
+    
+    def __init__(self):
+        self._activations = []
+        self._positions = {}
+        
+    def append(self, thePNode, theToken):
+        self._positions[theToken] = len(self._activations)
+        self._activations.append((thePNode, theToken))
+        
+    def indexOf(self, theToken):
+        return self._positions[theToken]
+        
+    def pop(self, index):
+        last = self._activations.pop()
+        if index < len(self._activations):
+            # move the last activation in the free position
+            removed = self._activations[index]
+            self._activations[index] = last
+            self._positions[last[1]] = index
+        else:
+            removed = last
+        del self._positions[removed[1]]
+        return removed
+    
+    def activations(self):
+        return list(self._activations)
     
+    def __len__(self):
+        return len(self._activations)
@@ -1,4 +1,5 @@
-
+import heapq
+import itertools
 
 class factory(object):
     DEFAULT_STRATEGY_NAME = "depth"
@@ -98,4 +99,114 @@ class Strategy(object):
         '''
         Setup the new container for this strategy
         '''
-        return []
\ No newline at end of file
+        return []
+
+class ActivationsHeap(object):
+    '''
+    Priority queue of activations used by sorted strategies:
+    activations are stored in a binary heap as
+    [key, pnode, token] entries (lower key = higher priority).
+    Removed activations are only marked as removed
+    (lazy deletion) and discarded when they reach the top
+    '''
+    
+    def __init__(self):
+        self._heap = []
+        self._entries = {}
+        '''token => heap entry'''
+        
+    def push(self, key, thePNode, theToken):
+        entry = [key, thePNode, theToken]
+        self._entries[theToken] = entry
+        heapq.heappush(self._heap, entry)
+        
+    def pop(self):
+        while True:
+            _, thePNode, theToken = heapq.heappop(self._heap)
+            if thePNode is not None:
+                del self._entries[theToken]
+                return (thePNode, theToken)
+    
+    def remove(self, thePNode, theToken):
+        try:
+            entry = self._entries.pop(theToken)
+        except KeyError:
+            raise ValueError("Activation not in the container")
+        # mark the entry as removed
+        entry[1] = None
+        entry[2] = None
+        # rebuild the heap if the deleted entries are too many
+        if len(self._heap) > 2 * len(self._entries) + 32:
+            self._heap = [x for x in self._heap if x[1] is not None]
+            heapq.heapify(self._heap)
+            
+    def activations(self):
+        '''
+        Get all valid activations from the lower
+        to the higher priority
+        '''
+        return [(thePNode, theToken) for (_, thePNode, theToken) in sorted(self._entries.itervalues(), reverse=True)]
+    
+    def __len__(self):
+        return len(self._entries)
+    
+
+class SortedStrategy(Strategy):
+    '''
+    Base class for strategies which sort activations 
+    using a key computed once on insertion.
+    Each activation gets an increasing counter too,
+    so activations with the same key are sorted
+    like in the Depth strategy (newer first)
+    '''
+    
+    def __init__(self):
+        self._counter = itertools.count()
+        
+    def newContainer(self):
+        return ActivationsHeap()
+    
+    def insert(self, perSalienceContainer, thePNode, theToken):
+        perSalienceContainer.push(self.key(thePNode, theToken) + (-self._counter.next(),), thePNode, theToken)
+        
+    def pop(self, perSalienceContainer):
+        return perSalienceContainer.pop()
+    
+    def resort(self, perSalienceContainer, theOldStrategy):
+        newContainer = self.newContainer()
+        # activations are reinsered from the lower to the higher
+        # priority, so the old order is kept for activations
+        # with the same key
+        for (thePNode, theToken) in theOldStrategy.iterable(perSalienceContainer):
+            self.insert(newContainer, thePNode, theToken)
+        return newContainer
+            
+    def remove(self, perSalienceContainer, thePNode, theToken):
+        perSalienceContainer.remove(thePNode, theToken)
+        
+    def iterable(self, perSalienceContainer):
+        return perSalienceContainer.activations()
+    
+    def key(self, thePNode, theToken):
+        '''
+        Get the sort key for the activation (pnode, token):
+        activations with lower keys are fired first
+        @param thePNode: the pnode
+        @type thePNode: PNode
+        @param theToken: the token
+        @type theToken: Token
+        @rtype: tuple
+        '''
+        raise NotImplementedError()
+    
+    def _recency(self, theToken):
+        '''
+        Get the LEX recency key for a token:
+        fact-ids sorted from the most recent, compared
+        one by one (most recent first). If all fact-ids are
+        the same, the activation with more facts wins
+        '''
+        # fact-ids are negated (so more recent ones are lower)
+        # and a terminator greater than any negated fact-id
+        # is appended, so longer keys are lower than their prefixes
+        return tuple(sorted([-x for x in theToken.factIds if x is not None])) + (1,)
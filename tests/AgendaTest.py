@@ -0,0 +1,116 @@
+'''
+Created on 17/ott/2026
+
+@author: Francesco Capozzo
+'''
+import unittest
+from MyClipsBaseTest import MyClipsBaseTest
+from myclips.rete.Network import Network
+from myclips.shell.Interpreter import Interpreter
+
+
+class AgendaTest(MyClipsBaseTest):
+
+    def setUp(self):
+        MyClipsBaseTest.setUp(self)
+        self.network = Network()
+        self.interpreter = Interpreter(self.network, None)
+
+        for s in ["(deffacts F (a) (b) (c))",
+                  "(defrule r1 (a) (b) =>)",
+                  "(defrule r2 (c) =>)",
+                  "(defrule r3 (a) =>)",
+                  "(defrule r4 (b) (a) =>)",
+                  "(defrule r6 (c) (test (> 3 2)) =>)"]:
+            self.interpreter.evaluate(s)
+
+    def _agendaFor(self, strategy):
+        self.interpreter.evaluate("(set-strategy %s)"%strategy)
+        return [pnode.ruleName for (_, pnode, _) in self.network.agenda.activations()]
+
+    def test_StrategyKeptOnReset(self):
+
+        self.interpreter.evaluate("(set-strategy lex)")
+        self.network.reset()
+
+        self.assertEqual(self.network.agenda.strategy, "lex")
+
+    def test_LexOrder(self):
+
+        self.network.reset()
+
+        self.assertEqual(self._agendaFor("lex"), ["r6", "r2", "r1", "r4", "r3"])
+
+    def test_MeaOrder(self):
+
+        self.network.reset()
+
+        self.assertEqual(self._agendaFor("mea"), ["r6", "r2", "r4", "r1", "r3"])
+
+    def test_ComplexityOrder(self):
+
+        self.network.reset()
+
+        self.assertEqual(self._agendaFor("complexity")[3:], ["r2", "r3"])
+
+    def test_SimplicityOrder(self):
+
+        self.network.reset()
+
+        self.assertEqual(self._agendaFor("simplicity")[:2], ["r2", "r3"])
+
+    def test_BreadthOrder(self):
+
+        self.network.reset()
+
+        self.assertEqual(self._agendaFor("breadth")[0], "r3")
+
+    def test_SortedStrategyRemove(self):
+
+        self.interpreter.evaluate("(set-strategy lex)")
+        self.network.reset()
+        self.interpreter.evaluate("(retract 3)")
+
+        self.assertEqual([pnode.ruleName for (_, pnode, _) in self.network.agenda.activations()],
+                         ["r1", "r4", "r3"])
+
+    def test_FireOrderBySalience(self):
+
+        self.interpreter.evaluate("(defrule r7 (declare (salience 10)) (a) =>)")
+        self.interpreter.evaluate("(defrule r8 (declare (salience -10)) (c) =>)")
+        self.interpreter.evaluate("(set-strategy lex)")
+        self.network.reset()
+
+        fired = []
+        while not self.network.agenda.isEmpty():
+            pnode, _ = self.network.agenda.getActivation()
+            fired.append(pnode.ruleName)
+
+        self.assertEqual(fired, ["r7", "r6", "r2", "r1", "r4", "r3", "r8"])
+
+    def test_RemoveFromAllStrategies(self):
+
+        for strategy in ["depth", "breadth", "random", "lex", "mea", "complexity", "simplicity"]:
+            self.interpreter.evaluate("(set-strategy %s)"%strategy)
+            self.network.reset()
+            self.interpreter.evaluate("(retract 1)")
+
+            self.assertEqual(sorted([pnode.ruleName for (_, pnode, _) in self.network.agenda.activations()]),
+                             ["r2", "r6"], strategy)
+
+    def test_RandomFiresAllActivations(self):
+
+        self.interpreter.evaluate("(set-strategy random)")
+        self.network.reset()
+
+        fired = []
+        while not self.network.agenda.isEmpty():
+            pnode, _ = self.network.agenda.getActivation()
+            fired.append(pnode.ruleName)
+
+        self.assertEqual(sorted(fired), ["r1", "r2", "r3", "r4", "r6"])
+
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
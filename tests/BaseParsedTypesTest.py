@@ -79,6 +79,24 @@ class BaseParsedTypeTest(unittest.TestCase):
         
         self.assertNotIsInstance(s1, types.Lexeme)
 
+    def test_SymbolsAreInterned(self):
+        
+        self.assertIs(types.Symbol("FirstSymbol"), types.Symbol("FirstSymbol"))
+        self.assertIsNot(types.Symbol("FirstSymbol"), types.String("FirstSymbol"))
+
+    def test_SmallIntegersAreInterned(self):
+        
+        self.assertIs(types.Integer("1"), types.Integer(1))
+        self.assertEqual(types.Integer(1000000), types.Integer("1000000"))
+        self.assertEqual(types.Integer("01").evaluate(), 1)
+
+    def test_CopiesOfInternedValuesAreTheSameValue(self):
+        import copy, pickle
+        
+        s1 = types.Symbol("FirstSymbol")
+        
+        self.assertIs(copy.deepcopy(s1), s1)
+        self.assertIs(pickle.loads(pickle.dumps(s1, pickle.HIGHEST_PROTOCOL)), s1)
 
         
 if __name__ == "__main__":
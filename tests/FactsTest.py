@@ -152,6 +152,27 @@ class FactsTest(MyClipsBaseTest):
 
         self.assertRaises(FactLengthNotComputableException, (lambda f:len(f)), fact)
 
+    def test_TemplateFact_HashDoesntDependOnSlotsOrder(self):
+        values1 = dict([("slot%d"%i, i) for i in range(0, 20)])
+        values2 = dict([("slot%d"%i, i) for i in reversed(range(0, 20))])
+        
+        fact1 = TemplateFact("A", values1, "MAIN")
+        fact2 = TemplateFact("A", values2, "MAIN")
+        
+        self.assertEqual(fact1, fact2)
+        self.assertEqual(hash(fact1), hash(fact2))
+
+    def test_TemplateFact_HashChangesWithSlotValue(self):
+        fact1 = TemplateFact("A", {"a":0, "b":1}, "MAIN")
+        fact2 = TemplateFact("A", {"a":0, "b":2}, "MAIN")
+        
+        self.assertNotEqual(hash(fact1), hash(fact2))
+        
+        fact2["b"] = 1
+        
+        self.assertEqual(fact1, fact2)
+        self.assertEqual(hash(fact1), hash(fact2))
+
 
 if __name__ == "__main__":
     #import sys;sys.argv = ['', 'Test.testName']
@@ -0,0 +1,68 @@
+'''
+Created on 17/ott/2026
+
+@author: Francesco Capozzo
+'''
+import unittest
+import ParserTest
+import pyparsing
+from myclips.parser.Parser import Parser
+from myclips.parser.FastParser import FastParser
+from myclips.rete.Network import Network
+
+
+class FastParserTest(ParserTest.ParserTest):
+    '''
+    Run all parser tests against the fast backend
+    '''
+
+    def setUp(self):
+        self.parser = FastParser()
+
+    def test_SameAsParser(self):
+
+        text = """
+        (defmodule A (export ?ALL))
+        (deftemplate A::T "comment" (slot a (default ?NONE)) (multislot b (type INTEGER SYMBOL)))
+        (defglobal A ?*g* = 1)
+        (deffunction f (?a $?b) (+ ?a (length$ ?b)))
+        (defrule A::R (declare (salience 10))
+            ?f <- (T (a ?a&:(> ?a ?*g*)|~2) (b $? ?b $?))
+            (not (and (A ?) (test (eq 1 1))))
+            (exists (B ~?a))
+            (or (C "c\\"d") (D 1.5e3))
+            => (retract ?f) (assert (T (a 1) (b 1 2)) (A 1)))
+        (deffacts A::F (T (a 1)) (A 1))
+        """
+
+        self.assertEqual(repr(FastParser().parse(text)), repr(Parser().parse(text)))
+
+    def test_SameErrorLocationAsParser(self):
+
+        for text in ["(defrule A (A ?a) => (printout t ?a crlf)",
+                     "(defrule A (A ?a) => (unknown ?a))",
+                     "(deftemplate T (slot a (type UNKNOWN)))",
+                     "(defrule A (test) =>)"]:
+
+            errors = []
+            for parser in [Parser(), FastParser()]:
+                try:
+                    parser.parse(text)
+                except pyparsing.ParseBaseException, e:
+                    errors.append((e.__class__, e.loc))
+
+            self.assertEqual(len(errors), 2)
+            self.assertEqual(errors[0], errors[1])
+
+    def test_NetworkBackendSelection(self):
+
+        self.assertNotIsInstance(Network().getParser(), FastParser)
+
+        network = Network()
+        network.settings.setSetting("parser.backend", "fast")
+        self.assertIsInstance(network.getParser(), FastParser)
+
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testObjectIsSymbol']
+    unittest.main()
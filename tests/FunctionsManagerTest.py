@@ -103,6 +103,28 @@ class FunctionsManagerTest(MyClipsBaseTest):
             )
         
 
+    def test_LazySystemFunctionLoadedOnLookup(self):
+        
+        from myclips.functions import LazyDefinitions
+        
+        definitions = LazyDefinitions()
+        definitions.addLazy("bench-run", "myclips.functions.myclips-profile.BenchRun", "BenchRun")
+        
+        self.assertTrue(definitions.has_key("bench-run"))
+        self.assertEqual(definitions.keys(), ["bench-run"])
+        self.assertEqual(len(definitions._lazy), 1)
+        
+        self.assertEqual(definitions["bench-run"].name, "bench-run")
+        self.assertEqual(len(definitions._lazy), 0)
+        
+    def test_FunctionsManifestCacheIsUpToDate(self):
+        
+        from myclips.functions import SystemFunctionBroker
+        
+        # regenerate it with FunctionManifestGenerator.generateCache()
+        self.assertNotEqual(SystemFunctionBroker._readManifestCache(SystemFunctionBroker.manifestClasses()), None)
+        
+
 
 if __name__ == "__main__":
     #import sys;sys.argv = ['', 'Test.testName']
@@ -19,11 +19,15 @@ from myclips.rete.nodes.NegativeJoinNode import NegativeJoinNode
 from myclips.rete.nodes.NccNode import NccNode
 from myclips.rete.nodes.NccPartnerNode import NccPartnerNode
 from myclips.EventsManager import EventsManager
+from myclips.Observer import Observer
 
 from MyClipsBaseTest import MyClipsBaseTest
 from myclips.rete.Memory import Memory
 from myclips.facts.OrderedFact import OrderedFact
 from myclips.facts.TemplateFact import TemplateFact
+from myclips.rete.NetworkImage import InvalidImageError
+from cStringIO import StringIO
+import os
 #from myclips.TemplatesManager import TemplateDefinition, SlotDefinition
 
 # disable all logging from modules
@@ -743,6 +747,630 @@ class NetworkTest(MyClipsBaseTest):
     
 
 
+    def test_AlphaDispatchOnlyMatchingBranches(self):
+        
+        for (i, name) in enumerate(["A", "B", "C"]):
+            self.network.addRule(types.DefRuleConstruct("R%d" % i, self.MM, lhs=[
+                    types.OrderedPatternCE([
+                            types.Symbol(name),
+                            types.Symbol("X"),
+                        ], self.MM)
+                ]))
+        
+        # all rules share the scope node
+        self.assertEqual(len(self.network._root.children), 1)
+        scopeNode = self.network._root.children[0]
+        self.assertEqual(len(scopeNode.children), 3)
+        
+        activated = []
+        for child in scopeNode.children:
+            child.rightActivation = (lambda theChild, theMethod: lambda wme: (activated.append(theChild), theMethod(wme)))(child, child.rightActivation)
+        
+        self.network.assertFact(fact([types.Symbol("B"), types.Symbol("X")]))
+        
+        self.assertEqual(len(activated), 1)
+        self.assertEqual(activated[0].tests[0].value, types.Symbol("B"))
+        self.assertEqual(len(activated[0].children[0].children[0].memory.items), 1)
+        
+    def test_AlphaDispatchOrAndMultiTestsBranches(self):
+        
+        for construct in self.network.getParser().parse("""
+                (defrule R1 (A x|y) =>)
+                (defrule R2 (A z&~w) =>)
+                (defrule R3 (A ~x&~y) =>)
+                """):
+            self.network.addRule(construct)
+            
+        scopeNode = self.network._root.children[0]
+        aNode = scopeNode.children[0]
+        self.assertEqual(len(aNode.children), 3)
+        
+        activated = []
+        for child in aNode.children:
+            child.rightActivation = (lambda theChild, theMethod: lambda wme: (activated.append(theChild), theMethod(wme)))(child, child.rightActivation)
+        
+        self.network.assertFact(fact([types.Symbol("A"), types.Symbol("y")]))
+        # R1 is dispatched on both x and y, R3 can't be dispatched
+        # R2 is dispatched on z only
+        self.assertEqual(len(activated), 2)
+        zNode = self.network.getPNode("R2").leftParent.rightParent.rightParent.rightParent
+        self.assertEqual(str(zNode.tests[0]), "[1]=z")
+        self.assertNotIn(zNode, activated)
+        
+        del activated[:]
+        self.network.assertFact(fact([types.Symbol("A"), types.Symbol("z")]))
+        self.assertEqual(len(activated), 2)
+        self.assertEqual(len(self.network.agenda.activations()), 3)
+        
+        self.network.removeRule("R1")
+        del activated[:]
+        self.network.assertFact(fact([types.Symbol("A"), types.Symbol("x")]))
+        self.assertEqual(len(activated), 1)
+        
+    def test_AlphaDispatchUpdatedOnNodeRemoval(self):
+        
+        for (i, name) in enumerate(["A", "B"]):
+            self.network.addRule(types.DefRuleConstruct("R%d" % i, self.MM, lhs=[
+                    types.OrderedPatternCE([
+                            types.Symbol(name),
+                            types.Symbol("X"),
+                        ], self.MM)
+                ]))
+        
+        self.network.removeRule("R0")
+        scopeNode = self.network._root.children[0]
+        self.assertEqual(len(scopeNode.children), 1)
+        
+        self.network.assertFact(fact([types.Symbol("A"), types.Symbol("X")]))
+        self.network.assertFact(fact([types.Symbol("B"), types.Symbol("X")]))
+        
+        self.assertEqual(len(scopeNode.children[0].children[0].children[0].memory.items), 1)
+        
+    def test_AssertFacts(self):
+
+        self.network.addRule(types.DefRuleConstruct("A", self.MM, lhs=[
+                types.OrderedPatternCE([
+                        types.Symbol("A"),
+                        types.Variable("x"),
+                    ], self.MM)
+            ]))
+        
+        events = []
+        self.network.eventsManager.registerObserver(EventsManager.E_FACT_ASSERTED, Observer({
+                EventsManager.E_FACT_ASSERTED: lambda wme, isNew: events.append((wme.factId, isNew, len(self.network.agenda.activations())))
+            }))
+        
+        results = self.network.assertFacts([fact([types.Symbol("A"), types.Integer(1)]),
+                                            fact([types.Symbol("A"), types.Integer(2)]),
+                                            fact([types.Symbol("A"), types.Integer(1)])])
+        
+        self.assertEqual([(wme.factId, isNew) for (wme, isNew) in results], [(1, True), (2, True), (1, False)])
+        # events are fired when all facts are propagated,
+        # but before the agenda is updated
+        self.assertEqual(events, [(1, True, 0), (2, True, 0), (1, False, 0)])
+        self.assertEqual([token.factIds for (_, _, token) in self.network.agenda.activations()], [(2,), (1,)])
+
+    def test_AssertFactsWithAlphaPool(self):
+        
+        def batchNetwork(processes):
+            network = Network()
+            network.settings.setSetting("network.alpha.processes", processes)
+            network.settings.setSetting("network.alpha.minBatch", 0)
+            for construct in network.getParser().parse("""
+                    (defrule R1 (A ?x) (B ?x) =>)
+                    (defrule R2 (A 1|2) =>)
+                    (defrule R3 (B ?x&~3) (not (A ?x)) =>)
+                    """):
+                network.addRule(construct)
+            
+            results = network.assertFacts([fact([types.Symbol(name), types.Integer(i % 5)])
+                                                for i in range(20) for name in ["A", "B"]])
+            
+            return ([(wme.factId, isNew) for (wme, isNew) in results],
+                    [(pnode.ruleName, token.factIds) for (_, pnode, token) in network.agenda.activations()])
+        
+        # same results and activations order of the sequential assert
+        self.assertEqual(batchNetwork(2), batchNetwork(1))
+        
+    def test_FactsQueriesUseIndexes(self):
+        
+        network = Network()
+        network.getParser().parse("""
+            (deftemplate item (slot kind))
+            (defmodule A (import MAIN ?ALL))
+            (deftemplate other (slot kind))
+            (defmodule B)
+            """)
+        
+        network.assertFact(fact([types.Symbol("a")], theModuleName="A"))
+        network.assertFact(fact([types.Symbol("b")], theModuleName="B"))
+        network.modulesManager.changeCurrentScope("MAIN")
+        for i in range(5):
+            network.assertFact(fact({"kind": types.Integer(i)}, "item"))
+        network.modulesManager.changeCurrentScope("A")
+        network.assertFact(fact({"kind": types.Integer(0)}, "other", "A"))
+        network.retractFact(network.getWmeFromId(4))
+        
+        factIds = lambda wmes: [wme.factId for wme in wmes]
+        
+        self.assertEqual(factIds(network.facts), [0, 1, 2, 3, 5, 6, 7, 8])
+        self.assertEqual(factIds(network.factsInRange(2, 6)), [2, 3, 5, 6])
+        self.assertEqual(factIds(network.factsInRange(2, limit=3)), [2, 3, 5])
+        self.assertEqual(factIds(network.factsForTemplate("item", 4)), [5, 6, 7])
+        self.assertEqual(factIds(network.factsForScope("MAIN")), [0, 3, 5, 6, 7])
+        # ordered facts of the module and imported templates 
+        self.assertEqual(factIds(network.factsForScope("A")), [0, 1, 3, 5, 6, 7, 8])
+        self.assertEqual(factIds(network.factsForScope("A", 4, 7, 2)), [5, 6])
+        self.assertEqual(factIds(network.factsForScope("B")), [2])
+        
+        # fact-ids restart from 0 after reset
+        network.reset()
+        network.assertFact(fact([types.Symbol("a")], theModuleName="A"))
+        self.assertEqual(factIds(network.facts), [0, 1])
+        self.assertEqual(factIds(network.factsForScope("A")), [0, 1])
+        self.assertEqual(factIds(network.factsForTemplate("item")), [])
+        
+    def test_SaveAndLoadImage(self):
+        
+        rules = """
+            (deftemplate item (slot kind) (multislot tags))
+            (defglobal ?*count* = 0)
+            (deffunction double (?x) (* ?x 2))
+            (deffacts items
+                (item (kind a) (tags x y))
+                (item (kind b) (tags y))
+                (limit 3))
+            (defrule R1 (item (kind ?k) (tags $? y)) (not (seen ?k)) =>
+                (bind ?*count* (+ ?*count* 1))
+                (assert (seen ?k))
+                (printout t R1 " " ?k " " (double ?*count*) crlf))
+            (defrule R2 (limit ?l) (seen ?k) (test (< (double 1) ?l)) (not (and (item (kind ?k)) (done ?k))) =>
+                (assert (done ?k))
+                (printout t R2 " " ?k crlf))
+            """
+        
+        def newNetwork():
+            out = StringIO()
+            network = Network(resources={"stdout": out})
+            return (network, out)
+        
+        def compiledNetwork():
+            network, out = newNetwork()
+            for construct in network.getParser().parse(rules):
+                if isinstance(construct, types.DefRuleConstruct):
+                    network.addRule(construct)
+                elif isinstance(construct, types.DefFactsConstruct):
+                    network.addDeffacts(construct)
+            return (network, out)
+        
+        def state(network, out):
+            return (out.getvalue(), sorted([str(wme) for wme in network.facts]))
+        
+        import tempfile, shutil
+
+        imageDir = tempfile.mkdtemp()
+        try:
+            imagePath = os.path.join(imageDir, "test.img")
+        
+            # constructs only
+            network, out = compiledNetwork()
+            network.saveImage(imagePath)
+            network.reset()
+            network.run()
+        
+            loaded, loadedOut = newNetwork()
+            self.assertFalse(loaded.loadImage(imagePath))
+            self.assertEqual(len(loaded.facts), 1)
+            self.assertEqual(sorted(loaded.rules.keys()), sorted(network.rules.keys()))
+            loaded.reset()
+            loaded.run()
+            self.assertEqual(state(loaded, loadedOut), state(network, out))
+        
+            # checkpoint: working memory and agenda too
+            network, out = compiledNetwork()
+            network.reset()
+            network.run(1)
+            network.saveImage(imagePath, True)
+        
+            loaded, loadedOut = newNetwork()
+            self.assertTrue(loaded.loadImage(imagePath))
+            self.assertEqual([(pnode.ruleName, token.factIds) for (_, pnode, token) in loaded.agenda.activations()],
+                             [(pnode.ruleName, token.factIds) for (_, pnode, token) in network.agenda.activations()])
+            out.truncate(0)
+            network.run()
+            loaded.run()
+            self.assertEqual(state(loaded, loadedOut), state(network, out))
+        finally:
+            shutil.rmtree(imageDir)
+        
+    def test_LoadImageRejectsInvalidFile(self):
+        
+        import tempfile, shutil
+
+        imageDir = tempfile.mkdtemp()
+        try:
+            imagePath = os.path.join(imageDir, "invalid.img")
+            with open(imagePath, "wb") as imageFile:
+                imageFile.write("(defrule R1 =>)")
+            
+            self.assertRaises(InvalidImageError, self.network.loadImage, imagePath)
+        finally:
+            shutil.rmtree(imageDir)
+        
+    def test_AssertFactsIsAtomicOnInvalidFact(self):
+        
+        prevLen = len(self.network.facts)
+        
+        self.assertRaises(Exception, self.network.assertFacts, [fact([types.Symbol("A")]),
+                                                                fact([types.Symbol("A")], theModuleName="UNKNOWN")])
+        
+        self.assertEqual(len(self.network.facts), prevLen)
+
+    def test_AssertFactsDiscardCancelledActivations(self):
+        
+        self.network.addRule(types.DefRuleConstruct("A", self.MM, lhs=[
+                types.OrderedPatternCE([
+                        types.Symbol("A"),
+                    ], self.MM),
+                types.NotPatternCE(
+                    types.OrderedPatternCE([
+                            types.Symbol("B"),
+                        ], self.MM))
+            ]))
+        
+        activated = []
+        self.network.eventsManager.registerObserver(EventsManager.E_RULE_ACTIVATED, Observer({
+                EventsManager.E_RULE_ACTIVATED: lambda *args: activated.append(args)
+            }))
+        
+        self.network.assertFacts([fact([types.Symbol("A")]),
+                                  fact([types.Symbol("B")])])
+        
+        self.assertEqual(len(activated), 0)
+        self.assertEqual(len(self.network.agenda.activations()), 0)
+        
+    def test_RetractFacts(self):
+        
+        self.network.addRule(types.DefRuleConstruct("A", self.MM, lhs=[
+                types.OrderedPatternCE([
+                        types.Symbol("A"),
+                    ], self.MM),
+                types.NotPatternCE(
+                    types.OrderedPatternCE([
+                            types.Symbol("B"),
+                        ], self.MM))
+            ]))
+        
+        results = self.network.assertFacts([fact([types.Symbol("A")]),
+                                            fact([types.Symbol("B")])])
+        
+        self.network.retractFacts([wme for (wme, _) in results])
+        
+        self.assertEqual([wme.factId for wme in self.network.facts], [0])
+        self.assertEqual(len(self.network.agenda.activations()), 0)
+        
+    def test_CompiledRhsActions(self):
+        
+        import StringIO
+        output = StringIO.StringIO()
+        network = Network(resources={"stdout": output})
+        
+        for construct in network.getParser().parse("""
+                (defrule A (A ?a $?b) (not (B ?a)) ?f <- (C)
+                    => 
+                    (bind ?c (+ ?a 1)) 
+                    (printout t ?a " " $?b " " ?c " " (fact-index ?f) crlf))
+                """):
+            if isinstance(construct, types.DefRuleConstruct):
+                network.addRule(construct)
+        
+        network.assertFact(fact([types.Symbol("A"), types.Integer(1), types.Symbol("x"), types.Symbol("y")]))
+        network.assertFact(fact([types.Symbol("C")]))
+        network.run()
+        
+        self.assertEqual(output.getvalue(), "1 ['x', 'y'] 2 2\n")
+        
+    def test_EventsFiredOnlyIfObserved(self):
+        
+        self.network.addRule(types.DefRuleConstruct("A", self.MM, lhs=[
+                types.OrderedPatternCE([
+                        types.Symbol("A"),
+                    ], self.MM)
+            ]))
+        
+        self.assertFalse(self.network.eventsManager.isObserved(EventsManager.E_RULE_ACTIVATED))
+        
+        activated = []
+        observer = Observer({
+                EventsManager.E_RULE_ACTIVATED: lambda *args: activated.append(args)
+            })
+        self.network.eventsManager.registerObserver(EventsManager.E_RULE_ACTIVATED, observer)
+        self.assertTrue(self.network.eventsManager.isObserved(EventsManager.E_RULE_ACTIVATED))
+        
+        self.network.assertFact(fact([types.Symbol("A")]))
+        self.assertEqual(len(activated), 1)
+        
+        self.network.eventsManager.unregisterObserver(EventsManager.E_RULE_ACTIVATED, observer)
+        self.assertFalse(self.network.eventsManager.isObserved(EventsManager.E_RULE_ACTIVATED))
+        
+        self.network.assertFact(fact([types.Symbol("A"), types.Symbol("B")]))
+        self.network.assertFact(fact([types.Symbol("A")]))
+        self.assertEqual(len(activated), 1)
+        
+    def _modifyNetwork(self, slotSpecific):
+        
+        import StringIO
+        output = StringIO.StringIO()
+        network = Network(resources={"stdout": output})
+        network.settings.setSetting("network.modify.slotSpecific", slotSpecific)
+        
+        for construct in network.getParser().parse("""
+                (deftemplate T (slot a) (slot b) (slot c))
+                (defrule ReadA (T (a ?a)) => (printout t "a " ?a crlf))
+                (defrule ReadB (T (b 1)) => (printout t "b 1" crlf))
+                (defrule JoinB (T (b ?b)) (not (T (c ?b))) => (printout t "join " ?b crlf))
+                (defrule Bump ?f <- (T (c ?c&:(< ?c 3))) => (modify ?f (c (+ ?c 1))))
+                """):
+            if isinstance(construct, types.DefRuleConstruct):
+                network.addRule(construct)
+        
+        return network, output
+        
+    def test_ModifyIsRetractAndAssert(self):
+        
+        network, output = self._modifyNetwork(False)
+        
+        wme, _ = network.assertFact(TemplateFact("T", {"a": types.Integer(0), "b": types.Integer(1), "c": types.Integer(1)}))
+        network.run()
+        
+        # every modify is a new fact: all rules fire again
+        self.assertEqual(output.getvalue().count("a 0\n"), 3)
+        self.assertEqual(output.getvalue().count("b 1\n"), 3)
+        self.assertEqual(output.getvalue().count("join 1\n"), 2)
+        self.assertNotEqual(wme.factId, network.facts[-1].factId)
+        self.assertEqual(network.facts[-1].fact["c"], types.Integer(3))
+        
+    def test_SlotSpecificModify(self):
+        
+        network, output = self._modifyNetwork(True)
+        
+        wme, _ = network.assertFact(TemplateFact("T", {"a": types.Integer(0), "b": types.Integer(1), "c": types.Integer(1)}))
+        network.run()
+        
+        # ReadA and ReadB don't read the c slot: their activations are kept.
+        # JoinB reads c in the not-ce only: it fires when the (not) becomes valid
+        # and its activation is kept after that
+        self.assertEqual(output.getvalue().count("a 0\n"), 1)
+        self.assertEqual(output.getvalue().count("b 1\n"), 1)
+        self.assertEqual(output.getvalue().count("join 1\n"), 1)
+        self.assertIs(network.facts[-1], wme)
+        self.assertEqual(wme.fact["c"], types.Integer(3))
+        self.assertIs(network.getWmeFromFact(wme.fact), wme)
+        
+        # the fact leaves the ReadB memory and comes back.
+        # ReadA and JoinB share the first join node (and its read slots)
+        output.truncate(0)
+        network.modifyFact(wme, {"b": types.Integer(2)})
+        network.modifyFact(wme, {"b": types.Integer(1)})
+        network.run()
+        self.assertEqual(output.getvalue(), "b 1\na 0\njoin 1\n")
+        self.assertIs(network.facts[-1], wme)
+        
+        # a duplicate fact is still a retract
+        otherWme, _ = network.assertFact(TemplateFact("T", {"a": types.Integer(1), "b": types.Integer(1), "c": types.Integer(3)}))
+        self.assertEqual(network.modifyFact(otherWme, {"a": types.Integer(0)}), (wme, False))
+        self.assertEqual(network.facts[-1], wme)
+        self.assertNotIn(otherWme, network.facts)
+        
+
+
+    def test_SlotSpecificModifyUpdatesHashIndexes(self):
+        
+        import StringIO
+        output = StringIO.StringIO()
+        network = Network(resources={"stdout": output})
+        network.settings.setSetting("network.modify.slotSpecific", True)
+        
+        for construct in network.getParser().parse("""
+                (deftemplate T (slot a))
+                (deftemplate U (slot v))
+                (defrule Pair (T (a ?x)) (U (v ?x)) => (printout t "pair " ?x crlf))
+                """):
+            if isinstance(construct, types.DefRuleConstruct):
+                network.addRule(construct)
+        
+        network.assertFact(TemplateFact("T", {"a": types.Integer(0)}))
+        wme, _ = network.assertFact(TemplateFact("U", {"v": types.Integer(1)}))
+        network.modifyFact(wme, {"v": types.Integer(2)})
+        network.assertFact(TemplateFact("T", {"a": types.Integer(2)}))
+        network.assertFact(TemplateFact("T", {"a": types.Integer(1)}))
+        network.run()
+        
+        self.assertEqual(output.getvalue(), "pair 2\n")
+        
+    def test_SlotSpecificModifyWithEqualValues(self):
+        
+        network, _ = self._modifyNetwork(True)
+        network.getParser().parse("(deftemplate F (slot x) (slot s))")
+        
+        wme, _ = network.assertFact(TemplateFact("F", {"x": types.Float(1.5), "s": types.String("s")}))
+        
+        # equal values (not the same instances): nothing changes
+        self.assertEqual(network.modifyFact(wme, {"x": types.Float(1.5), "s": types.String("s")}), (wme, True))
+        self.assertIs(network.facts[-1], wme)
+        self.assertIs(network.getWmeFromId(wme.factId), wme)
+        
+    def test_DefaultModeRefraction(self):
+        
+        import StringIO
+        output = StringIO.StringIO()
+        network = Network(resources={"stdout": output})
+        
+        for construct in network.getParser().parse("""
+                (defrule R (A) (not (B)) => (printout t "fired" crlf))
+                """):
+            network.addRule(construct)
+        
+        network.assertFact(OrderedFact([types.Symbol("A")]))
+        network.run()
+        wme, _ = network.assertFact(OrderedFact([types.Symbol("B")]))
+        network.retractFact(wme)
+        network.run()
+        
+        # the activation for the same fact-ids is refracted
+        self.assertEqual(output.getvalue(), "fired\n")
+        
+    def test_JoinNodeUnlinking(self):
+        
+        for construct in self.network.getParser().parse("""
+                (defrule R (A ?x) (B ?x) =>)
+                """):
+            self.network.addRule(construct)
+            
+        join = self.network.getPNode("R").leftParent
+        
+        self.assertIsInstance(join, JoinNode)
+        alphaMemory = join.rightParent
+        betaMemory = join.leftParent
+        
+        # both memories empty: linked to the left side only
+        self.assertFalse(alphaMemory.isLinkedChild(join))
+        self.assertTrue(betaMemory.isLinkedChild(join))
+        self.assertIn(join, alphaMemory.children)
+        
+        wmeB, _ = self.network.assertFact(OrderedFact([types.Symbol("B"), types.Integer(1)]))
+        self.assertFalse(alphaMemory.isLinkedChild(join))
+        
+        # left memory not empty anymore: relinked to the right
+        wmeA, _ = self.network.assertFact(OrderedFact([types.Symbol("A"), types.Integer(1)]))
+        self.assertTrue(alphaMemory.isLinkedChild(join))
+        self.assertTrue(betaMemory.isLinkedChild(join))
+        self.assertEqual(len(self.network.agenda.activations()), 1)
+        
+        # alpha memory empty: left unlinked
+        self.network.retractFact(wmeB)
+        self.assertTrue(alphaMemory.isLinkedChild(join))
+        self.assertFalse(betaMemory.isLinkedChild(join))
+        self.assertEqual(len(self.network.agenda.activations()), 0)
+        
+        self.network.assertFact(OrderedFact([types.Symbol("B"), types.Integer(1)]))
+        self.assertTrue(betaMemory.isLinkedChild(join))
+        self.assertEqual(len(self.network.agenda.activations()), 1)
+        
+        self.network.retractFact(wmeA)
+        self.assertFalse(alphaMemory.isLinkedChild(join))
+        self.assertEqual(len(self.network.agenda.activations()), 0)
+        
+        # linked children keep the children order
+        self.assertEqual(list(alphaMemory.linkedChildren),
+                         [child for child in alphaMemory.children if child is not join])
+
+    def _countingNetwork(self):
+        
+        import StringIO
+        output = StringIO.StringIO()
+        network = Network(resources={"stdout": output})
+        
+        for construct in network.getParser().parse("""
+                (defrule Count ?f <- (N ?x&:(< ?x 10)) => (retract ?f) (assert (N (+ ?x 1))))
+                (defrule Queued (Q ?x) => (printout t "queued " ?x crlf))
+                """):
+            network.addRule(construct)
+        
+        network.assertFact(OrderedFact([types.Symbol("N"), types.Integer(0)]))
+        return network, output
+        
+    def test_RunAsyncInSlices(self):
+        
+        network, output = self._countingNetwork()
+        
+        events = []
+        runEvents = [EventsManager.E_RUN_START, EventsManager.E_RUN_STOP, 
+                     EventsManager.E_RUN_PAUSE, EventsManager.E_RUN_RESUME]
+        observer = Observer(dict([(theEvent, lambda theEvent=theEvent: events.append(theEvent)) 
+                                    for theEvent in runEvents]))
+        for theEvent in runEvents:
+            network.eventsManager.registerObserver(theEvent, observer)
+        
+        theRun = network.runAsync(activations=3)
+        completed = []
+        theRun.addDoneCallback(lambda: completed.append(True))
+        
+        self.assertEqual(theRun.next(), 3)
+        self.assertFalse(theRun.done)
+        
+        # queued while paused: applied in the next slice
+        theRun.assertFact(OrderedFact([types.Symbol("Q"), types.Integer(1)]))
+        self.assertEqual(output.getvalue(), "")
+        
+        slices = list(theRun)
+        
+        # 10 Count, 1 Queued and the focus pop
+        self.assertEqual(slices, [3, 3, 3])
+        self.assertTrue(theRun.done)
+        self.assertTrue(theRun.wait(0))
+        self.assertEqual(completed, [True])
+        self.assertEqual(output.getvalue(), "queued 1\n")
+        self.assertEqual([wme.fact.values for wme in network.facts][-1], [types.Symbol("N"), types.Integer(10)])
+        self.assertEqual(events, [EventsManager.E_RUN_START] 
+                                    + [EventsManager.E_RUN_PAUSE, EventsManager.E_RUN_RESUME] * 4
+                                    + [EventsManager.E_RUN_STOP])
+        
+        # run is complete: facts are asserted now
+        theRun.assertFact(OrderedFact([types.Symbol("Q"), types.Integer(2)]))
+        self.assertEqual(len(network.agenda.activations()), 1)
+        
+    def test_RunAsyncStepsAndStop(self):
+        
+        network, _ = self._countingNetwork()
+        
+        self.assertEqual(list(network.runAsync(steps=5, activations=2)), [2, 2])
+        self.assertEqual([wme.fact.values for wme in network.facts][-1], [types.Symbol("N"), types.Integer(5)])
+        
+        theRun = network.runAsync(activations=1)
+        theRun.next()
+        theRun.stop()
+        self.assertEqual(list(theRun), [])
+        self.assertTrue(theRun.done)
+        self.assertEqual([wme.fact.values for wme in network.facts][-1], [types.Symbol("N"), types.Integer(6)])
+        
+        # time budget only
+        self.assertEqual(sum(network.runAsync(activations=None, budget=1000)), 0)
+        self.assertEqual([wme.fact.values for wme in network.facts][-1], [types.Symbol("N"), types.Integer(10)])
+
+    def test_RunAsyncQueuedChangesAreNotSteps(self):
+        
+        for (steps, activations) in [(2, None), (None, 2)]:
+            
+            import StringIO
+            output = StringIO.StringIO()
+            network = Network(resources={"stdout": output})
+            for construct in network.getParser().parse("""
+                    (defrule Queued (Q ?x) => (printout t "queued " ?x crlf))
+                    """):
+                network.addRule(construct)
+            
+            theRun = network.runAsync(steps=steps, activations=activations)
+            
+            # queued during the slice, while the agenda is empty
+            queued = []
+            def queue(*args):
+                if len(queued) == 0:
+                    queued.append(True)
+                    theRun.assertFact(OrderedFact([types.Symbol("Q"), types.Integer(1)]))
+            observer = Observer({EventsManager.E_FOCUS_CHANGED: queue})
+            network.eventsManager.registerObserver(EventsManager.E_FOCUS_CHANGED, observer)
+            
+            # steps: focus pop and Queued (both in the first slice)
+            if activations is not None:
+                self.assertEqual(theRun.next(), 2)
+            else:
+                self.assertEqual(list(theRun), [])
+            
+            self.assertEqual(output.getvalue(), "queued 1\n")
+            self.assertEqual(list(theRun), [])
+            self.assertTrue(theRun.done)
+
 if __name__ == "__main__":
     #import sys;sys.argv = ['', 'Test.testName']
     unittest.main()
\ No newline at end of file
@@ -1289,6 +1289,81 @@ class ParserTest(MyClipsBaseTest):
         )
         """)
 
+    def test_SplitProgram(self):
+        
+        text = """; a comment (
+        (defrule A "a ) string" (A ?a) ; comment )
+            =>) TRUE "a string" ?*global*
+        (defrule B (B) =>)"""
+        
+        self.assertEqual([text[start:end].split()[0] for (start, end) in Parser.splitProgram(text)],
+                         ['(defrule', 'TRUE', '"a', '?*global*', '(defrule'])
+        
+    def test_IterParseSameAsParse(self):
+        
+        text = """
+        (deftemplate T (slot a))
+        (defrule A (T (a ?a)) => (assert (B ?a)))
+        (deffacts F (T (a 1)))
+        """
+        
+        parsed = Parser().parse(text)
+        streamed = list(self.parser.iterParse(text))
+        
+        self.assertEqual([x.__class__ for x in streamed], [x.__class__ for x in parsed])
+        self.assertEqual(streamed[1].defruleName, "A")
+
+    def test_IterParseIsLazy(self):
+        
+        parsed = self.parser.iterParse("(defrule A (A) =>) (defrule B (B) =>) (defrule (")
+        
+        self.assertEqual(parsed.next().defruleName, "A")
+        self.assertEqual(parsed.next().defruleName, "B")
+        self.assertRaises(pyparsing.ParseBaseException, parsed.next)
+
+    def test_IterParseErrorLocationInText(self):
+        
+        text = "(defrule A (A) =>)\n(defrule B (B) => (unknown-function))"
+        
+        try:
+            list(self.parser.iterParse(text))
+        except pyparsing.ParseBaseException, e:
+            self.assertEqual(e.lineno, 2)
+        else:
+            self.fail("ParseException expected")
+            
+    def test_ParseCacheReused(self):
+        
+        import tempfile, shutil
+        from myclips.parser.ParseCache import ParseCache
+        
+        cacheDir = tempfile.mkdtemp()
+        try:
+            text = """
+            (deftemplate T (slot a))
+            (defrule A (T (a ?a)) => (assert (B ?a)))
+            """
+            cache = ParseCache(cacheDir, text)
+            list(Parser().iterParse(text, cache=cache))
+            cache.save()
+            
+            cache = ParseCache(cacheDir, text)
+            parser = Parser()
+            parser.parse("(deftemplate T (slot a))")
+            cached = cache.get("(defrule A (T (a ?a)) => (assert (B ?a)))", parser.getModulesManager())
+            
+            self.assertIsInstance(cached[0], types.DefRuleConstruct)
+            self.assertTrue(cached[0].scope is parser.getModulesManager().currentScope)
+            self.assertTrue(cached[0].lhs[0].templateDefinition is parser.getModulesManager().currentScope.templates.getDefinition("T"))
+            
+            # with a different template definition, the cache is not used
+            parser = Parser()
+            parser.parse("(deftemplate T (slot a) (slot b))")
+            self.assertIsNone(cache.get("(defrule A (T (a ?a)) => (assert (B ?a)))", parser.getModulesManager()))
+            
+        finally:
+            shutil.rmtree(cacheDir)
+
 
 if __name__ == "__main__":
     #import sys;sys.argv = ['', 'Test.testObjectIsSymbol']
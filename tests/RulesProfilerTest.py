@@ -0,0 +1,91 @@
+'''
+Created on 17/ott/2026
+
+@author: Francesco Capozzo
+'''
+import unittest
+import StringIO
+import myclips
+from myclips.shell.Interpreter import Interpreter
+from MyClipsBaseTest import MyClipsBaseTest
+
+
+class RulesProfilerTest(MyClipsBaseTest):
+
+
+    def setUp(self):
+        MyClipsBaseTest.setUp(self)
+        self.output = StringIO.StringIO()
+        self.network = myclips.Network(resources={"stdout": self.output})
+        self.interpreter = Interpreter(self.network, None)
+        
+    def evaluate(self, *strings):
+        for string in strings:
+            self.interpreter.evaluate(string)
+        
+    def profiler(self):
+        return self.network.settings.getSetting("_funcs.ProfileRules.profiler")
+
+    def test_RulesStats(self):
+        
+        self.evaluate("(profile-rules)",
+                      "(defrule R1 (A ?x) (B ?x) => (assert (C ?x)))",
+                      "(defrule R2 (C ?x) (not (D ?x)) =>)",
+                      "(assert (A 1) (A 2) (B 1) (B 2) (B 3))",
+                      "(run)")
+        
+        stats = self.profiler().rulesStats()
+        
+        self.assertEqual(stats["MAIN::R1"]["activations"], 2)
+        self.assertEqual(stats["MAIN::R1"]["fires"], 2)
+        self.assertEqual(stats["MAIN::R2"]["fires"], 2)
+        
+    def test_NodesStatsAttributedToRulesCE(self):
+        
+        self.evaluate("(defrule R1 (A ?x) (B ?x) =>)",
+                      "(defrule R2 (A ?x) (B ?x) (C) =>)",
+                      "(profile-rules)",
+                      "(assert (A 1) (A 2) (B 1) (B 2) (B 3))")
+        
+        joins = [(stats, usedBy) for (node, stats, usedBy) in self.profiler().nodesStats()
+                    if node.__class__.__name__ == "JoinNode"]
+        
+        # the join for (B ?x) is shared by both rules
+        (stats, _) = [(stats, usedBy) for (stats, usedBy) in joins 
+                        if usedBy == [("MAIN::R1", 2), ("MAIN::R2", 2)]][0]
+        
+        self.assertEqual(stats["right"], 3)
+        # (B 3) has no (A 3) to join with
+        self.assertEqual(stats["tests"], 2)
+        
+    def test_StopRestoresNodes(self):
+        
+        self.evaluate("(defrule R1 (A ?x) (B ?x) =>)",
+                      "(profile-rules)",
+                      "(assert (A 1) (B 1))",
+                      "(profile-rules FALSE)",
+                      "(assert (A 2) (B 2))",
+                      "(run)")
+        
+        stats = self.profiler().rulesStats()
+        self.assertEqual(stats["MAIN::R1"]["activations"], 1)
+        self.assertEqual(stats["MAIN::R1"]["fires"], 0)
+        
+        for (node, _, _) in self.profiler().nodesStats():
+            self.assertFalse(node.__dict__.has_key("rightActivation"))
+            self.assertFalse(node.__dict__.has_key("leftActivation"))
+        
+    def test_ProfileReport(self):
+        
+        self.evaluate("(defrule R1 (A ?x) (B ?x) =>)",
+                      "(profile-rules)",
+                      "(assert (A 1) (B 1))",
+                      "(run)",
+                      "(profile-report t)")
+        
+        self.assertTrue("MAIN::R1#2" in self.output.getvalue())
+        
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
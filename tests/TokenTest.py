@@ -0,0 +1,55 @@
+'''
+Created on 17/ott/2026
+
+@author: Francesco Capozzo
+'''
+import unittest
+from MyClipsBaseTest import MyClipsBaseTest
+from myclips.rete.Token import Token
+from myclips.rete.WME import WME
+from myclips.facts.OrderedFact import OrderedFact
+from myclips.rete.tests import getTokenAnchestor
+
+
+class TokenTest(MyClipsBaseTest):
+
+
+    def setUp(self):
+        MyClipsBaseTest.setUp(self)
+        self.wmes = [WME(i, OrderedFact([i])) for i in range(0, 3)]
+        self.root = Token(None, None, None)
+        self.t1 = Token(None, self.root, self.wmes[0])
+        self.t2 = Token(None, self.t1, None)
+        self.t3 = Token(None, self.t2, self.wmes[2])
+
+    def test_Linearize(self):
+        self.assertEqual(list(self.t3.linearize()), [self.wmes[0], None, self.wmes[2]])
+        self.assertEqual(list(self.t3.linearize(False)), [self.wmes[0], self.wmes[2]])
+        self.assertEqual(list(self.root.linearize()), [])
+
+    def test_AnchestorWme(self):
+        for i in range(0, 3):
+            self.assertEqual(self.t3.anchestorWme(i), getTokenAnchestor(self.t3, i).wme)
+
+    def test_WmesSharedWithParent(self):
+        self.assertEqual(self.t3.linearize()[:-1], self.t2.linearize())
+        
+    def test_FactIdsIdentity(self):
+        self.assertEqual(self.t3.factIds, (0, None, 2))
+        self.assertEqual(self.root.factIds, ())
+        self.assertEqual(self.t3.hashString, ",0,,2")
+        
+        other = Token(None, self.t2, self.wmes[2])
+        self.assertEqual(other, self.t3)
+        self.assertEqual(hash(other), hash(self.t3))
+        self.assertNotEqual(Token(self, self.t2, self.wmes[2]), self.t3)
+        
+    def test_DeleteUnlinkFromParent(self):
+        self.t2.delete()
+        self.assertEqual(len(self.t1._children), 0)
+        self.assertEqual(len(self.wmes[2].tokens), 0)
+
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
@@ -6,6 +6,10 @@ Created on 28/lug/2012
 import unittest
 from myclips.rete.tests.locations import VariableLocation, VariableReference
 from MyClipsBaseTest import MyClipsBaseTest
+from myclips.rete.WME import WME
+from myclips.facts.OrderedFact import OrderedFact
+from myclips.facts.TemplateFact import TemplateFact
+import myclips.parser.Types as types
 
 
 
@@ -55,7 +59,26 @@ class VariableReferenceTest(MyClipsBaseTest):
         ref2.reference = bindLoc2
         
         self.assertNotEqual(ref1, ref2)
+
+    def test_CompileToValueSameAsToValue(self):
+        
+        oWme = WME(1, OrderedFact([types.Symbol("A"), types.Integer(1), types.Integer(2), types.Integer(3)]))
+        tWme = WME(2, TemplateFact("T", {"aSlot": [types.Integer(1), types.Integer(2)],
+                                         "bSlot": types.Symbol("B")}))
+        
+        locations = [(oWme, VariableLocation("bla", 0, None, True, 1)),
+                     (oWme, VariableLocation("bla", 0, None, None, None, True, -1)),
+                     (oWme, VariableLocation("bla", 0, None, None, 1, None, -1, isMultiField=True)),
+                     (oWme, VariableLocation("bla", 0, None, None, 1, None, 0, isMultiField=True)),
+                     (oWme, VariableLocation("bla", 0, fullFact=True)),
+                     (tWme, VariableLocation("bla", 0, "aSlot", True, 0)),
+                     (tWme, VariableLocation("bla", 0, "aSlot", None, None, True, 0)),
+                     (tWme, VariableLocation("bla", 0, "bSlot", fullSlot=True)),
+                     (tWme, VariableLocation("bla", 0, "aSlot", None, 1, None, 0, isMultiField=True)),
+                     ]
         
+        for (theWme, location) in locations:
+            self.assertEqual(location.toValue(theWme), location.compileToValue()(theWme))
 
 
 if __name__ == "__main__":
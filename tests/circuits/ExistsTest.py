@@ -0,0 +1,62 @@
+'''
+Created on 17/ott/2026
+
+@author: Francesco Capozzo
+'''
+import unittest
+from circuits.BaseCircuitTest import BaseCircuitTest
+
+
+class Test(BaseCircuitTest):
+
+
+    def test_ExistsFiresOnce(self):
+
+        self.assertEqual(self.forCircuits(
+            "(defrule R (exists (B ?)) => (trigger-event test-succeeded))",
+            "(assert (B 1) (B 2) (B 3))"
+            ).succeeded(), 1)
+
+    def test_ExistsWithVariableBinding(self):
+
+        self.assertEqual(self.forCircuits(
+            "(defrule R (A ?x) (exists (B ?x ?)) => (trigger-event test-succeeded ?x))",
+            "(assert (A 1) (A 2) (A 3) (B 1 a) (B 1 b) (B 3 a) (B 4 a))"
+            ).succeeded(), 2)
+
+    def test_ExistsWithFilterTests(self):
+
+        self.assertEqual(self.forCircuits(
+            "(defrule R (A ?x ?y) (exists (B ?x ~?y)) => (trigger-event test-succeeded))",
+            "(assert (A 1 2) (A 2 2) (B 1 3) (B 2 2))"
+            ).succeeded(), 1)
+
+    def test_ExistsRevokedWithLastSupport(self):
+
+        self.assertEqual(self.forCircuits(
+            "(defrule R (A ?x) (exists (B ?x ?)) => (trigger-event test-succeeded))",
+            "(assert (A 1) (B 1 a) (B 1 b) (A 2) (B 2 a))",
+            "(retract 2)",
+            "(retract 5)",
+            ).succeeded(), 1)
+
+    def test_ExistsNotSharedWithDifferentBindings(self):
+
+        self.assertEqual(self.forCircuits(
+            "(defrule R1 (A ?x ?) (exists (B ?x)) => (trigger-event test-succeeded))",
+            "(defrule R2 (A ? ?y) (exists (B ?y)) => (trigger-event test-failed))",
+            "(assert (A 1 2) (B 1))"
+            ).both(), (1, 0))
+
+    def test_ExistsOnSharedMemoryWithOldFacts(self):
+
+        self.assertEqual(self.forCircuits(
+            "(assert (A 1) (A 2) (B 2))",
+            "(defrule R (A ?x) (exists (B ?x)) => (trigger-event test-succeeded ?x))",
+            ).succeeded(), 1)
+
+
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
@@ -38,6 +38,76 @@ class Test(BaseCircuitTest):
                     (possible V G ID2))"""
             ).hasSuccess())
 
+    def test_HashJoinOnlyMatchingValues(self):
+        
+        self.assertEqual(self.forCircuits(
+            "(defrule R (A ?x) (B ?x) => (trigger-event test-succeeded ?x))",
+            "(assert (A 1) (A 2) (B 1) (B 2) (B 3) (B 1.0))"
+            ).succeeded(), 2)
+
+    def test_HashJoinWithMultifieldBinding(self):
+        
+        self.assertEqual(self.forCircuits(
+            "(defrule R (A $?x) (B $?x) => (trigger-event test-succeeded))",
+            "(assert (A 1 2) (B 1 2) (B 1) (B 2 1))"
+            ).succeeded(), 1)
+
+    def test_HashJoinWithFilterTests(self):
+        
+        self.assertEqual(self.forCircuits(
+            "(defrule R (A ?x ?y) (B ?x ~?y) => (trigger-event test-succeeded))",
+            "(assert (A 1 2) (B 1 2) (B 1 3) (B 2 3))"
+            ).succeeded(), 1)
+
+    def test_HashJoinAfterRetract(self):
+        
+        self.assertEqual(self.forCircuits(
+            "(defrule R (A ?x) (B ?x) => (trigger-event test-succeeded))",
+            "(assert (A 1) (B 1))",
+            "(retract 1)",
+            "(assert (B 1))",
+            ).succeeded(), 0)
+
+    def test_HashJoinOnSharedMemoryWithOldFacts(self):
+        
+        self.assertEqual(self.forCircuits(
+            "(defrule R1 (A ?x) (B ?x) => )",
+            "(assert (A 1) (A 2) (B 1) (B 2))",
+            "(defrule R2 (A ?x) (B ?x) (C ?x) => (trigger-event test-succeeded))",
+            "(assert (C 2))",
+            ).succeeded(), 1)
+
+
+    def test_HashNegativeJoinOnlyMatchingValues(self):
+        
+        self.assertEqual(self.forCircuits(
+            "(defrule R (A ?x) (not (B ?x)) => (trigger-event test-succeeded ?x))",
+            "(assert (A 1) (A 2) (A 3) (B 2) (B 1.0))"
+            ).succeeded(), 2)
+
+    def test_HashNegativeJoinWithFilterTests(self):
+        
+        self.assertEqual(self.forCircuits(
+            "(defrule R (A ?x ?y) (not (B ?x ~?y)) => (trigger-event test-succeeded))",
+            "(assert (A 1 2) (A 2 2) (B 1 3) (B 2 2))"
+            ).succeeded(), 1)
+
+    def test_HashNegativeJoinAfterRetract(self):
+        
+        self.assertEqual(self.forCircuits(
+            "(defrule R (A ?x) (not (B ?x)) => (trigger-event test-succeeded))",
+            "(assert (A 1) (B 1) (B 2))",
+            "(retract 3)",
+            "(retract 2)",
+            ).succeeded(), 1)
+
+    def test_NccPartnerFindsOwnerToken(self):
+        
+        self.assertEqual(self.forCircuits(
+            "(defrule R (A ?x) (not (and (B ?x) (C ?x))) => (trigger-event test-succeeded ?x))",
+            "(assert (A 1) (A 2) (B 1) (C 1) (B 2))",
+            "(assert (A 3) (C 3) (B 3))",
+            ).succeeded(), 1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,69 @@
+'''
+Created on 17/ott/2026
+
+@author: Francesco Capozzo
+'''
+import unittest
+import os
+import tempfile
+from cStringIO import StringIO
+from MyClipsBaseTest import MyClipsBaseTest
+import myclips.parser.Types as types
+from myclips.rete.Network import Network
+from myclips.shell.Interpreter import Interpreter
+
+
+class BLoadTest(MyClipsBaseTest):
+
+    def setUp(self):
+        MyClipsBaseTest.setUp(self)
+        self.output = StringIO()
+        self.network = Network(resources={"stdout": self.output, "werror": StringIO()})
+        self.interpreter = Interpreter(self.network)
+        fd, self.path = tempfile.mkstemp(suffix=".img")
+        os.close(fd)
+
+    def tearDown(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        MyClipsBaseTest.tearDown(self)
+
+    def _evaluate(self, interpreter, *strings):
+        return [interpreter.evaluate(aString) for aString in strings][-1]
+
+    def test_LoadedConstructsCanBeUsed(self):
+        
+        self._evaluate(self.interpreter,
+                       '(deftemplate guest (slot name) (slot sex))',
+                       '(defglobal ?*output* = nil)',
+                       '(defrule greet (guest (name ?n)) => (printout ?*output* "hello " ?n crlf))')
+        self.assertEqual(self.interpreter.evaluate('(bsave "%s")'%self.path), types.Symbol("TRUE"))
+        
+        # the interpreter parser is built before the load
+        network = Network(resources={"stdout": self.output})
+        interpreter = Interpreter(network)
+        self.assertEqual(interpreter.evaluate('(+ 1 1)'), types.Integer(2))
+        
+        self.assertEqual(interpreter.evaluate('(bload "%s")'%self.path), types.Symbol("TRUE"))
+        
+        self._evaluate(interpreter,
+                       '(bind ?*output* t)',
+                       '(assert (guest (name zz) (sex m)))',
+                       '(run)')
+        
+        self.assertEqual(self.output.getvalue(), "hello zz\n")
+        self.assertEqual(interpreter.evaluate('?*output*'), types.Symbol("t"))
+        
+    def test_LoadInvalidImage(self):
+        
+        with open(self.path, "wb") as imageFile:
+            imageFile.write("not an image")
+        
+        self.assertEqual(self.interpreter.evaluate('(bload "%s")'%self.path), types.Symbol("FALSE"))
+        # the network is still usable
+        self.assertEqual(self.interpreter.evaluate('(+ 1 1)'), types.Integer(2))
+
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
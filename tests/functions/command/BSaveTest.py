@@ -0,0 +1,58 @@
+'''
+Created on 17/ott/2026
+
+@author: Francesco Capozzo
+'''
+import unittest
+import os
+import tempfile
+from cStringIO import StringIO
+from MyClipsBaseTest import MyClipsBaseTest
+import myclips.parser.Types as types
+from myclips.rete.Network import Network
+from myclips.shell.Interpreter import Interpreter
+
+
+class BSaveTest(MyClipsBaseTest):
+
+    def setUp(self):
+        MyClipsBaseTest.setUp(self)
+        self.network = Network(resources={"werror": StringIO()})
+        self.interpreter = Interpreter(self.network)
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "network.img")
+
+    def tearDown(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        os.rmdir(self.directory)
+        MyClipsBaseTest.tearDown(self)
+
+    def test_SaveConstructsOnly(self):
+        
+        self.interpreter.evaluate('(deftemplate item (slot kind))')
+        self.interpreter.evaluate('(assert (item (kind a)))')
+        
+        self.assertEqual(self.interpreter.evaluate('(bsave "%s")'%self.path), types.Symbol("TRUE"))
+        self.assertTrue(os.path.exists(self.path))
+        
+        # working memory is not saved: only the initial-fact
+        network = Network()
+        self.assertFalse(network.loadImage(self.path))
+        self.assertEqual([wme.fact.templateName for wme in network.facts], ["initial-fact"])
+        self.assertTrue(network.modulesManager.currentScope.templates.has("item"))
+        
+        # the saved network is not changed
+        self.assertEqual(len(self.network.facts), 2)
+
+    def test_SaveToInvalidPath(self):
+        
+        aPath = os.path.join(self.directory, "missing", "network.img")
+        
+        self.assertEqual(self.interpreter.evaluate('(bsave "%s")'%aPath), types.Symbol("FALSE"))
+        self.assertFalse(os.path.exists(aPath))
+
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
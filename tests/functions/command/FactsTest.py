@@ -0,0 +1,49 @@
+'''
+Created on 17/ott/2026
+
+@author: Francesco Capozzo
+'''
+import unittest
+from functions.BaseFunctionTest import BaseFunctionTest
+import myclips.parser.Types as types
+from myclips.functions.command.Facts import Facts
+from myclips.facts.OrderedFact import OrderedFact
+from cStringIO import StringIO
+
+
+class FactsTest(BaseFunctionTest):
+
+    def setUp(self):
+        BaseFunctionTest.setUp(self)
+        self._functionSetup(Facts)
+        self.theEnv.RESOURCES['wdisplay'] = StringIO()
+        for i in range(10):
+            self.theEnv.network.assertFact(OrderedFact([types.Integer(i)], "MAIN"))
+        self.theEnv.network.retractFact(self.theEnv.network.getWmeFromId(4))
+
+    def _displayed(self):
+        return [int(line.split()[0][2:]) for line in self.theEnv.RESOURCES['wdisplay'].getvalue().splitlines()
+                    if line.startswith("f-")]
+
+    def test_FactsInRange(self):
+        
+        self.forInput(types.Integer(3), types.Integer(6)).do()
+        
+        self.assertEqual(self._displayed(), [3, 5, 6])
+
+    def test_FactsInRangeWithMax(self):
+        
+        self.forInput(types.Symbol("*"), types.Integer(2), types.Integer(9), types.Integer(3)).do()
+        
+        self.assertEqual(self._displayed(), [2, 3, 5])
+
+    def test_FactsFromStart(self):
+        
+        self.forInput(types.Integer(8)).do()
+        
+        self.assertEqual(self._displayed(), [8, 9, 10])
+        
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
@@ -0,0 +1,72 @@
+'''
+Created on 17/ott/2026
+
+@author: Francesco Capozzo
+'''
+import unittest
+from MyClipsBaseTest import MyClipsBaseTest
+import myclips.parser.Types as types
+from myclips.rete.Network import Network
+from myclips.shell.Interpreter import Interpreter
+from myclips.functions import FunctionEnv
+from myclips.functions.fact.FindAllFacts import FindAllFacts
+
+
+class FactSetQueryTest(MyClipsBaseTest):
+
+    def setUp(self):
+        MyClipsBaseTest.setUp(self)
+        self.network = Network()
+        self.interpreter = Interpreter(self.network)
+        self.network.getParser().parse("""
+            (deftemplate person (slot name) (slot age))
+            (deftemplate pet (slot owner) (slot kind))
+            """)
+        self.interpreter.evaluate("""(assert (person (name a) (age 20)) 
+                                             (person (name b) (age 30)) 
+                                             (person (name c) (age 20))
+                                             (pet (owner a) (kind dog))
+                                             (pet (owner c) (kind cat)))""")
+
+    def _factIds(self, aString):
+        return [wme.factId for wme in self.interpreter.evaluate(aString)]
+
+    def test_FindAllFactsWithoutAlphaMemory(self):
+        
+        self.assertEqual(self._factIds("(find-all-facts ((?p person)) (eq (fact-slot-value ?p age) 20))"), [1, 3])
+        self.assertEqual(self._factIds("(find-all-facts ((?p person)) (and (eq 30 (fact-slot-value ?p age)) TRUE))"), [2])
+        self.assertEqual(self._factIds("(find-fact ((?p person)) (> (fact-slot-value ?p age) 25))"), [2])
+        self.assertEqual(self._factIds("(find-fact ((?p person)) (eq (fact-slot-value ?p name) z))"), [])
+        
+    def test_FindAllFactsWithAlphaMemory(self):
+        
+        self.interpreter.evaluate("(defrule r (person (age 20)) =>)")
+        theFunc = FindAllFacts()
+        theEnv = FunctionEnv({}, self.network, self.network.modulesManager, self.network.resources)
+        self.assertTrue(self.network.findAlphaMemory(theFunc._alphaTests(theEnv, "person", [("age", types.Integer(20))])) is not None)
+        self.assertTrue(self.network.findAlphaMemory(theFunc._alphaTests(theEnv, "person", [("age", types.Integer(30))])) is None)
+        
+        self.assertEqual(self._factIds("(find-all-facts ((?p person)) (eq (fact-slot-value ?p age) 20))"), [1, 3])
+        # results must not change if the alpha memory is used
+        self.interpreter.evaluate("(assert (person (name d) (age 20)))")
+        self.assertEqual(self._factIds("(find-all-facts ((?p person)) (eq (fact-slot-value ?p age) 20))"), [1, 3, 6])
+
+    def test_FactSetsPermutations(self):
+        
+        self.assertEqual(self._factIds("""(find-all-facts ((?p person) (?q pet)) 
+                                                (eq (fact-slot-value ?p name) (fact-slot-value ?q owner)))"""), [1, 4, 3, 5])
+        self.assertEqual(self._factIds("(find-all-facts ((?x person pet)) TRUE)"), [1, 2, 3, 4, 5])
+        self.assertEqual(self.interpreter.evaluate("(any-factp ((?p person) (?q pet)) (eq (fact-slot-value ?q kind) fish))"), 
+                         types.Symbol("FALSE"))
+
+    def test_DoForFacts(self):
+        
+        self.assertEqual(self.interpreter.evaluate("(do-for-fact ((?p person)) (eq (fact-slot-value ?p age) 20) (fact-slot-value ?p name))"),
+                         types.Symbol("a"))
+        self.interpreter.evaluate("(do-for-all-facts ((?p person)) (eq (fact-slot-value ?p age) 20) (retract ?p))")
+        self.assertEqual([wme.factId for wme in self.network.facts], [0, 2, 4, 5])
+
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()